@@ -0,0 +1,149 @@
+"""Batch position analysis: reads positions, searches them in a process pool, writes JSON Lines.
+
+Each input line holds one position, either compact ("<32 squares> <W|B>", see
+GameBoard.ToCompact) or PDN FEN ('[FEN "W:W21,22:B1,2"]' or 'W:W21,22:B1,2').
+Blank lines and lines starting with '#' are skipped.
+
+    python AnalyseBatch.py suite.txt --depth 8 --time 2 --workers 8 > results.jsonl
+    cat suite.txt | python AnalyseBatch.py - --order completed
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from GameBoard import GameBoard
+from OtherStuff import convert_move_to_notation
+from SearchToolBox import SearchToolBox
+
+# Each pool worker reuses one engine (and its move buffers) for all of its positions
+WorkerToolbox = None
+
+
+def ParsePosition(Text):
+    """Returns (Board, Player) for a compact or PDN position line."""
+    Board = GameBoard()
+    if ':' in Text:
+        Player = Board.LoadPdn(Text)
+    else:
+        Fields = Text.split()
+        if len(Fields) != 2 or Fields[1].upper() not in ('W', 'B'):
+            raise ValueError(f"Expected '<32 squares> <W|B>', got {Text!r}")
+        Player = Fields[1].upper()
+        Board.LoadCompact(Fields[0], Player)
+    return Board, Player
+
+
+def AnalysePosition(Index, Text, MaxDepth, TimeBudget, UseLateMoveReductions):
+    """Deepens on one position until MaxDepth or TimeBudget; returns its result record."""
+    global WorkerToolbox
+    Result = {"index": Index, "position": Text}
+    try:
+        Board, Player = ParsePosition(Text)
+    except ValueError as Error:
+        Result["error"] = str(Error)
+        return Result
+
+    if WorkerToolbox is None:
+        WorkerToolbox = SearchToolBox()
+    Toolbox = WorkerToolbox
+    Toolbox.NewGame()  # Positions are independent; keep results reproducible
+    Toolbox.History = Board.History
+    Toolbox.UseLateMoveReductions = UseLateMoveReductions
+    Toolbox.TimeLimit = TimeBudget
+    Toolbox.StartTime = time.time()
+
+    BestMove, BestValue, Depth = None, None, 0
+    for SearchDepth in range(1, MaxDepth + 1):
+        Move, Value, Completed = Toolbox.SearchBestMove(Board.BoardState, Player, SearchDepth)
+        if not Completed:
+            break
+        BestMove, BestValue, Depth = Move, Value, SearchDepth
+        if Move is None:
+            break  # No legal moves; deeper searches will not change that
+
+    Result.update({
+        "side": Player,
+        "best_move": convert_move_to_notation(BestMove) if BestMove else None,
+        "score": BestValue if BestMove else None,
+        "depth": Depth,
+        "nodes": Toolbox.StatesExpanded,
+        "time": round(time.time() - Toolbox.StartTime, 4),
+    })
+    return Result
+
+
+def ReadPositions(Stream):
+    """Yields (Index, Text) for every position line of Stream."""
+    Index = 0
+    for Line in Stream:
+        Text = Line.strip()
+        if Text and not Text.startswith('#'):
+            yield Index, Text
+            Index += 1
+
+
+def AnalyseStream(Positions, Arguments, Output):
+    """Keeps a bounded number of positions in flight and writes each result as soon as it may be."""
+    InFlight = {}
+    Finished = {}
+    NextToWrite = 0
+    MaxInFlight = 4 * (Arguments.workers or os.cpu_count() or 1)
+
+    def Write(Result):
+        Output.write(json.dumps(Result) + "\n")
+        Output.flush()
+
+    with ProcessPoolExecutor(max_workers=Arguments.workers) as Pool:
+        Pending = iter(Positions)
+        Exhausted = False
+        while InFlight or not Exhausted:
+            while not Exhausted and len(InFlight) < MaxInFlight:
+                Item = next(Pending, None)
+                if Item is None:
+                    Exhausted = True
+                    break
+                Index, Text = Item
+                Future = Pool.submit(AnalysePosition, Index, Text, Arguments.depth, Arguments.time,
+                                     not Arguments.no_lmr)
+                InFlight[Future] = Index
+            if not InFlight:
+                break
+
+            Done, _ = wait(InFlight, return_when=FIRST_COMPLETED)
+            for Future in Done:
+                del InFlight[Future]
+                Result = Future.result()
+                if Arguments.order == "completed":
+                    Write(Result)
+                else:
+                    Finished[Result["index"]] = Result
+            while NextToWrite in Finished:
+                Write(Finished.pop(NextToWrite))
+                NextToWrite += 1
+
+
+def Main():
+    """Parses the command line and analyses every input position."""
+    Parser = argparse.ArgumentParser(description="Analyse checkers positions in parallel")
+    Parser.add_argument("input", nargs="?", default="-", help="position file, or '-' for stdin")
+    Parser.add_argument("--depth", type=int, default=8, help="maximum search depth in plies")
+    Parser.add_argument("--time", type=float, default=4.0, help="time budget per position in seconds")
+    Parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    Parser.add_argument("--order", choices=("input", "completed"), default="input",
+                        help="write results in input order or as they complete")
+    Parser.add_argument("--no-lmr", action="store_true", help="disable late move reductions")
+    Arguments = Parser.parse_args()
+
+    Stream = sys.stdin if Arguments.input == "-" else open(Arguments.input)
+    try:
+        AnalyseStream(ReadPositions(Stream), Arguments, sys.stdout)
+    finally:
+        if Stream is not sys.stdin:
+            Stream.close()
+
+
+if __name__ == "__main__":
+    Main()
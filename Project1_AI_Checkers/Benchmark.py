@@ -0,0 +1,188 @@
+"""Search benchmark: runs each engine configuration over a fixed suite of positions.
+
+    python Benchmark.py --depth 7 --positions 20
+    python Benchmark.py --neural --weights weights.npz
+    python Benchmark.py --neural --match 4 --positions 6
+    python Benchmark.py --profile deterministic --flamegraph search.folded
+"""
+import argparse
+import os
+import random
+import time
+
+from GameBoard import GameBoard
+from SearchProfiler import SearchProfiler
+from SearchToolBox import SearchToolBox
+
+
+def BuildSuite(Count, Seed):
+    """Returns Count (BoardState, Player) positions reached by seeded random play from the start."""
+    Generator = random.Random(Seed)
+    Toolbox = SearchToolBox()
+    Suite = []
+    while len(Suite) < Count:
+        BoardState, Player = GameBoard().BoardState, 'W'
+        for _ in range(Generator.randrange(4, 30)):
+            Moves = Toolbox.GetAllMoves(BoardState, Player)
+            if not Moves:
+                break
+            BoardState = Toolbox.MakeMove(BoardState, Generator.choice(Moves))
+            Player = 'B' if Player == 'W' else 'W'
+        if Toolbox.GetAllMoves(BoardState, Player):
+            Suite.append((BoardState, Player))
+    return Suite
+
+
+def PlainAlphaBeta():
+    """Alpha-Beta with tables and ordering but no reductions."""
+    Toolbox = SearchToolBox()
+    Toolbox.UseLateMoveReductions = False
+    return Toolbox
+
+
+def LateMoveReductions():
+    """Alpha-Beta with late move reductions at their default settings."""
+    return SearchToolBox()
+
+
+def NeuralSearch(Evaluator):
+    """Returns a factory for Alpha-Beta + LMR scored by a NeuralEvaluator with batched leaves."""
+    def Factory():
+        return SearchToolBox(Evaluator=Evaluator)
+    return Factory
+
+
+Configurations = [
+    ("Alpha-Beta", PlainAlphaBeta),
+    ("Alpha-Beta + LMR", LateMoveReductions),
+]
+
+
+def RunConfiguration(Factory, Suite, Depth, Profiler=None, ProfileMode=None):
+    """Searches every position with a fresh engine per position; returns summed statistics.
+
+    With a Profiler, every search is recorded in ProfileMode."""
+    Totals = {"Nodes": 0, "Pruned": 0, "Reductions": 0, "ReSearches": 0, "Time": 0.0}
+    BestMoves = []
+    for BoardState, Player in Suite:
+        Toolbox = Factory()
+        Toolbox.TimeLimit = float('inf')  # Benchmarks measure fixed-depth work
+        if Profiler is not None:
+            Profiler.Enable(Toolbox, ProfileMode)
+        Toolbox.StartTime = time.time()
+        BestMove, _, _ = Toolbox.SearchBestMove(BoardState, Player, Depth)
+        if Profiler is not None:
+            Profiler.Disable()
+        Totals["Time"] += time.time() - Toolbox.StartTime
+        Totals["Nodes"] += Toolbox.StatesExpanded
+        Totals["Pruned"] += Toolbox.PrunedBranches
+        Totals["Reductions"] += Toolbox.Reductions
+        Totals["ReSearches"] += Toolbox.ReSearches
+        BestMoves.append(BestMove)
+    return Totals, BestMoves
+
+
+def PlayGame(Engines, BoardState, Player, Depth, MaxPlies):
+    """Plays one game from a position, Engines mapping 'W' and 'B' to toolboxes searching at Depth.
+
+    Returns the winner ('W' or 'B'), or None for a draw by repetition, by the move-count rule
+    or by reaching MaxPlies."""
+    Board = GameBoard()
+    Board.BoardState = [Row[:] for Row in BoardState]
+    Board.ResetHistory(Player)
+    for Toolbox in Engines.values():
+        Toolbox.NewGame()
+        Toolbox.TimeLimit = float('inf')  # Both sides search to the same depth
+        Toolbox.History = Board.History
+    for _ in range(MaxPlies):
+        if not Board.HasValidMoves(Player):
+            return 'B' if Player == 'W' else 'W'
+        if Board.IsDraw():
+            return None
+        Toolbox = Engines[Player]
+        Toolbox.NewSearch()
+        Move, _, _ = Toolbox.SearchBestMove(Board.BoardState, Player, Depth)
+        if Board.MovePiece(*Move) != "JumpContinued":
+            Player = 'B' if Player == 'W' else 'W'
+    return None
+
+
+def PlayMatch(Factory, OpponentFactory, Openings, Depth, MaxPlies=200):
+    """Plays each opening twice, once with each colour, at equal depth; returns Factory's (Wins, Draws, Losses)."""
+    Wins = Draws = Losses = 0
+    for BoardState, Player in Openings:
+        for Colour in ('W', 'B'):
+            Opponent = 'B' if Colour == 'W' else 'W'
+            Winner = PlayGame({Colour: Factory(), Opponent: OpponentFactory()}, BoardState, Player, Depth, MaxPlies)
+            if Winner is None:
+                Draws += 1
+            elif Winner == Colour:
+                Wins += 1
+            else:
+                Losses += 1
+    return Wins, Draws, Losses
+
+
+def Main():
+    """Runs the suite for every configuration and prints a comparison table."""
+    Parser = argparse.ArgumentParser(description="Checkers search benchmark")
+    Parser.add_argument("--depth", type=int, default=6, help="search depth in plies")
+    Parser.add_argument("--positions", type=int, default=12, help="number of positions in the suite")
+    Parser.add_argument("--seed", type=int, default=1, help="seed for the position suite")
+    Parser.add_argument("--neural", action="store_true", help="also run the NumPy neural evaluator")
+    Parser.add_argument("--weights", help="neural evaluator weights (.npz); implies --neural")
+    Parser.add_argument("--match", type=int, metavar="DEPTH",
+                        help="also play the neural engine against material from every suite position, "
+                             "both colours, at this depth")
+    Parser.add_argument("--profile", choices=("deterministic", "sampling"),
+                        help="profile every configuration and print where the time goes")
+    Parser.add_argument("--flamegraph", help="write the profiled stacks in collapsed form to this file")
+    Arguments = Parser.parse_args()
+
+    Runs = list(Configurations)
+    if Arguments.match is not None and not (Arguments.neural or Arguments.weights):
+        Parser.error("--match needs --neural or --weights")
+    if Arguments.neural or Arguments.weights:
+        from NeuralEvaluator import NeuralEvaluator  # NumPy is only needed for this configuration
+        if Arguments.weights:
+            Evaluator = NeuralEvaluator.Load(Arguments.weights)
+        else:
+            Evaluator = NeuralEvaluator.MaterialWeights()
+        Runs.append(("Alpha-Beta + LMR + NN", NeuralSearch(Evaluator)))
+
+    Suite = BuildSuite(Arguments.positions, Arguments.seed)
+    print(f"\n{len(Suite)} positions, depth {Arguments.depth}")
+    print("+----------------------+----------------+-----------------+------------+------------+-----------------+----------+")
+    print("| Configuration        | States Expanded| Pruned Branches | Reductions | Re-searches| Time Taken (s)  | Same Move|")
+    print("+----------------------+----------------+-----------------+------------+------------+-----------------+----------+")
+    ReferenceMoves = None
+    Profiles = []
+    for Name, Factory in Runs:
+        Profiler = SearchProfiler() if Arguments.profile or Arguments.flamegraph else None
+        Totals, BestMoves = RunConfiguration(Factory, Suite, Arguments.depth, Profiler,
+                                             Arguments.profile or "deterministic")
+        Profiles.append((Name, Profiler))
+        if ReferenceMoves is None:
+            ReferenceMoves = BestMoves
+        SameMoves = sum(Move == Reference for Move, Reference in zip(BestMoves, ReferenceMoves))
+        print(f"| {Name:<21}| {Totals['Nodes']:<15}| {Totals['Pruned']:<16}| {Totals['Reductions']:<11}| "
+              f"{Totals['ReSearches']:<11}| {Totals['Time']:<16.4f}| {SameMoves:>3}/{len(Suite):<5}|")
+    print("+----------------------+----------------+-----------------+------------+------------+-----------------+----------+\n")
+
+    for Name, Profiler in Profiles:
+        if Profiler is None:
+            continue
+        print(f"{Name}:")
+        print(Profiler.Report() + "\n")
+        if Arguments.flamegraph:
+            Root, Extension = os.path.splitext(Arguments.flamegraph)
+            Profiler.DumpCollapsed(f"{Root}-{Name.replace(' ', '').replace('+', '-')}{Extension}")
+
+    if Arguments.match is not None:
+        Wins, Draws, Losses = PlayMatch(Runs[-1][1], LateMoveReductions, Suite, Arguments.match)
+        print(f"{Runs[-1][0]} vs {Configurations[-1][0]}, depth {Arguments.match}, "
+              f"{2 * len(Suite)} games: {Wins} W / {Draws} D / {Losses} L")
+
+
+if __name__ == "__main__":
+    Main()
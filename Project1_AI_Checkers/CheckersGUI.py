@@ -78,4 +78,8 @@ class CheckersGUI:
     def Refresh(self):
         """Clears and redraws the board to reflect changes."""
         self.Turtle.clear()
-        self.DrawBoard()
\ No newline at end of file
+        self.DrawBoard()
+
+    def MainLoop(self):
+        """Hands control to the window's event loop until it is closed."""
+        turtle.done()
\ No newline at end of file
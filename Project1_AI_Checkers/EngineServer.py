@@ -0,0 +1,359 @@
+"""Text protocol front-end that hosts many checkers games in one process.
+
+Commands are read one per line from stdin or from TCP clients on a local socket.
+Every game command names the session it applies to:
+
+    isready                                   -> readyok
+    newgame <id>
+    position <id> startpos [moves <m1> <m2> ...]
+    position <id> compact <32 squares> <W|B> [moves <m1> ...]
+    go <id> [depth <plies>] [movetime <seconds>] [multipv <lines>] [ponder]
+    ponderhit <id>
+    stop <id>
+    close <id>
+    quit
+
+Moves are written as two PDN square numbers in the notation of OtherStuff.convert_move_to_notation,
+e.g. "11-15" or "11x18". Searches run in a process pool and report back as
+
+    info <id> depth <d> [multipv <k>] score <s> nodes <n> time <t> pv <move> ...
+    bestmove <id> <move|none>
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from GameBoard import GameBoard
+from OtherStuff import convert_move_to_notation, convert_notation_to_move
+from SearchToolBox import SearchToolBox
+
+DefaultMoveTime = 4  # Seconds per search when the client gives no movetime
+MaxSearches = 256  # Searches that may run at once, one deadline slot each
+
+# Each pool worker keeps one engine so its tables carry over between jobs
+WorkerToolbox = None
+# Per-slot search deadlines (time.time() values) shared with the pool workers
+WorkerDeadlines = None
+
+
+def InitWorker(Deadlines):
+    """Receives the shared deadline slots when a pool worker starts."""
+    global WorkerDeadlines
+    WorkerDeadlines = Deadlines
+
+
+def SearchJob(BoardState, Player, Depth, Slot, Lines, History):
+    """Runs one fixed-depth search inside a pool worker.
+
+    The search stops once time.time() passes its deadline slot, which the server moves to
+    stop a search (0) or to time it after a ponderhit. History is the game's PositionHistory,
+    so repeating an earlier position scores as a draw.
+    Returns (Lines, Completed, Nodes) where Lines holds (Move, Score, Variation) best first."""
+    global WorkerToolbox
+    if WorkerToolbox is None:
+        WorkerToolbox = SearchToolBox()
+    Toolbox = WorkerToolbox
+    Toolbox.NewSearch()
+    Toolbox.History = History
+    Toolbox.TimeLimit = float('inf')  # The server manages its own deadlines
+    Toolbox.StopSignal = lambda: time.time() > WorkerDeadlines[Slot]
+    Toolbox.StartTime = time.time()
+    if Lines > 1:
+        Analysis = list(Toolbox.Analyse(BoardState, Player, Depth, Lines, MinDepth=Depth))
+        Completed = bool(Analysis)
+        Ranked = [(Line.Move, Line.Score, Line.Variation) for Line in Analysis[-1]] if Analysis else []
+        return Ranked, Completed, Toolbox.StatesExpanded
+    BestMove, BestValue, Completed = Toolbox.SearchBestMove(BoardState, Player, Depth)
+    Ranked = [(BestMove, BestValue, [BestMove])] if BestMove is not None else []
+    return Ranked, Completed, Toolbox.StatesExpanded
+
+
+class GameSession:
+    """One independent game hosted by the server."""
+
+    def __init__(self, SessionId):
+        self.SessionId = SessionId
+        self.Board = GameBoard()
+        self.Player = 'W'  # Side to move; the human side moves first in GameLoop
+        self.SearchTask = None
+        self.Search = None  # SearchState of the running search
+        self.Pondering = False
+        self.PonderHit = asyncio.Event()
+        self.Writer = None
+
+    def ApplyMove(self, Move):
+        """Plays a move for the side to move and passes the turn."""
+        X1, Y1, X2, Y2 = Move
+        if not self.Board.BoardState[X1][Y1].startswith(self.Player) or not self.Board.MovePiece(X1, Y1, X2, Y2):
+            raise ValueError(f"Illegal move for {self.Player}: {convert_move_to_notation(Move)}")
+        self.Player = 'B' if self.Player == 'W' else 'W'
+
+
+class SearchState:
+    """What one running search shares between its task, the protocol handlers and its completion."""
+
+    def __init__(self, Slot, MoveTime):
+        self.Slot = Slot
+        self.MoveTime = MoveTime
+        self.BestMove = None
+        self.Job = None  # concurrent.futures.Future of the depth being searched
+
+
+class EngineServer:
+    """Dispatches protocol commands to game sessions and searches to a worker pool."""
+
+    def __init__(self, Workers=None):
+        self.Deadlines = multiprocessing.RawArray('d', MaxSearches)
+        self.FreeSlots = list(range(MaxSearches))
+        self.Pool = ProcessPoolExecutor(max_workers=Workers, initializer=InitWorker, initargs=(self.Deadlines,))
+        self.Sessions = {}
+
+    def Close(self):
+        """Cancels running searches and shuts the worker pool down."""
+        for SessionId in list(self.Sessions):
+            self.CancelSearch(SessionId)
+        self.Pool.shutdown(wait=False, cancel_futures=True)
+
+    async def HandleLine(self, Line, Writer):
+        """Executes one command line; returns False when the client asked to quit."""
+        Tokens = Line.split()
+        if not Tokens:
+            return True
+        Command, Arguments = Tokens[0].lower(), Tokens[1:]
+        if Command == "quit":
+            return False
+        if Command == "isready":
+            Writer("readyok")
+            return True
+
+        Handlers = {
+            "newgame": self.NewGame,
+            "position": self.Position,
+            "go": self.Go,
+            "ponderhit": self.PonderHit,
+            "stop": self.Stop,
+            "close": self.CloseSession,
+        }
+        if Command not in Handlers:
+            Writer(f"error unknown command {Command}")
+        elif not Arguments:
+            Writer(f"error {Command} needs a session id")
+        else:
+            try:
+                Handlers[Command](Arguments[0], Arguments[1:], Writer)
+            except (ValueError, KeyError) as Error:
+                Writer(f"error {Error}")
+        return True
+
+    def GetSession(self, SessionId, Writer):
+        """Returns the named session, creating it on first use."""
+        Session = self.Sessions.get(SessionId)
+        if Session is None:
+            Session = self.Sessions[SessionId] = GameSession(SessionId)
+        Session.Writer = Writer
+        return Session
+
+    def NewGame(self, SessionId, Arguments, Writer):
+        """Starts a fresh game in the session."""
+        self.CancelSearch(SessionId)
+        self.Sessions[SessionId] = GameSession(SessionId)
+        self.Sessions[SessionId].Writer = Writer
+
+    def Position(self, SessionId, Arguments, Writer):
+        """Sets up the session position, optionally followed by a list of moves."""
+        if not Arguments:
+            raise ValueError("position needs startpos or compact")
+        Session = self.GetSession(SessionId, Writer)
+        if Session.SearchTask is not None:
+            raise ValueError(f"session {SessionId} is searching")
+
+        Board, Player = GameBoard(), 'W'
+        if Arguments[0] == "startpos":
+            Rest = Arguments[1:]
+        elif Arguments[0] == "compact" and len(Arguments) >= 3:
+            Player = Arguments[2].upper()
+            if Player not in ('W', 'B'):
+                raise ValueError(f"Invalid side to move: {Arguments[2]!r}")
+            Board.LoadCompact(Arguments[1], Player)
+            Rest = Arguments[3:]
+        else:
+            raise ValueError("position needs startpos or compact <board> <side>")
+
+        Session.Board, Session.Player = Board, Player
+        if Rest:
+            if Rest[0] != "moves":
+                raise ValueError(f"Unexpected token {Rest[0]!r}")
+            for Text in Rest[1:]:
+                Session.ApplyMove(convert_notation_to_move(Text))
+
+    def Go(self, SessionId, Arguments, Writer):
+        """Starts an iterative-deepening search of the session position."""
+        Session = self.GetSession(SessionId, Writer)
+        if Session.SearchTask is not None:
+            raise ValueError(f"session {SessionId} is already searching")
+
+        MaxDepth, MoveTime, Lines, Ponder = SearchToolBox().DepthLimit, DefaultMoveTime, 1, False
+        Index = 0
+        while Index < len(Arguments):
+            Option = Arguments[Index].lower()
+            if Option == "ponder":
+                Ponder = True
+                Index += 1
+            elif Option in ("depth", "movetime", "multipv") and Index + 1 < len(Arguments):
+                if Option == "depth":
+                    MaxDepth = int(Arguments[Index + 1])
+                elif Option == "multipv":
+                    Lines = max(int(Arguments[Index + 1]), 1)
+                else:
+                    MoveTime = float(Arguments[Index + 1])
+                Index += 2
+            else:
+                raise ValueError(f"Unexpected go option {Arguments[Index]!r}")
+
+        if not self.FreeSlots:
+            raise ValueError("too many searches running")
+        Search = SearchState(self.FreeSlots.pop(), MoveTime)
+        # A ponder search is only bounded by depth until the ponderhit arrives
+        self.Deadlines[Search.Slot] = float('inf') if Ponder else time.time() + MoveTime
+        Session.Search = Search
+        Session.Pondering = Ponder
+        Session.PonderHit.clear()
+        Session.SearchTask = asyncio.get_running_loop().create_task(
+            self.RunSearch(Session, Search, MaxDepth, Lines))
+        # Cleanup and the bestmove report run however the task ends, even if it is cancelled before it starts
+        Session.SearchTask.add_done_callback(lambda Task: self.FinishSearch(Session, Search, Task))
+
+    def PonderHit(self, SessionId, Arguments, Writer):
+        """Turns a ponder search into a normal one that reports its best move, timed from now."""
+        Session = self.Sessions[SessionId]
+        if Session.Pondering and Session.Search is not None:
+            self.Deadlines[Session.Search.Slot] = time.time() + Session.Search.MoveTime
+        Session.Pondering = False
+        Session.PonderHit.set()
+
+    def Stop(self, SessionId, Arguments, Writer):
+        """Stops the session search and reports the best move found so far."""
+        self.CancelSearch(SessionId)
+
+    def CloseSession(self, SessionId, Arguments, Writer):
+        """Discards the session."""
+        self.CancelSearch(SessionId)
+        self.Sessions.pop(SessionId, None)
+
+    def CancelSearch(self, SessionId):
+        """Stops the running search of a session, if any, in the event loop and in the worker."""
+        Session = self.Sessions.get(SessionId)
+        if Session is not None and Session.SearchTask is not None:
+            self.Deadlines[Session.Search.Slot] = 0.0
+            Session.SearchTask.cancel()
+            # The session is free at once; the task's done callback still reports its best move
+            Session.SearchTask = None
+            Session.Search = None
+            Session.Pondering = False
+
+    def FinishSearch(self, Session, Search, Task):
+        """Done callback of a search task: frees the session and reports the best move found."""
+        if Session.SearchTask is Task:
+            Session.SearchTask = None
+            Session.Search = None
+            Session.Pondering = False
+        self.Deadlines[Search.Slot] = 0.0  # A job still running in the pool stops at its next node
+        if Search.Job is None or Search.Job.done() or Search.Job.cancel():
+            self.FreeSlots.append(Search.Slot)
+        else:
+            # Keep the slot until the worker has seen the stop, so a new search cannot reset it
+            Loop = asyncio.get_running_loop()
+            Search.Job.add_done_callback(lambda _: Loop.call_soon_threadsafe(self.FreeSlots.append, Search.Slot))
+        Session.Writer(f"bestmove {Session.SessionId} {convert_move_to_notation(Search.BestMove)}")
+
+    async def RunSearch(self, Session, Search, MaxDepth, Lines):
+        """Deepens one ply at a time in the pool until the depth or the deadline slot runs out.
+
+        Cancelling the task (stop) reports what the completed iterations found, through FinishSearch."""
+        StartTime = time.time()
+        BoardState = [Row[:] for Row in Session.Board.BoardState]
+        History = Session.Board.History.Copy()
+        for Depth in range(1, MaxDepth + 1):
+            if time.time() >= self.Deadlines[Search.Slot]:
+                break
+            Search.Job = self.Pool.submit(SearchJob, BoardState, Session.Player, Depth, Search.Slot, Lines, History)
+            Ranked, Completed, Nodes = await asyncio.wrap_future(Search.Job)
+            if Ranked and (Search.BestMove is None or Completed):
+                Search.BestMove = Ranked[0][0]
+            if not Completed:
+                break
+            Elapsed = time.time() - StartTime
+            for Rank, (Move, Value, Variation) in enumerate(Ranked, start=1):
+                MultiPv = f" multipv {Rank}" if Lines > 1 else ""
+                Session.Writer(f"info {Session.SessionId} depth {Depth}{MultiPv} score {Value} nodes {Nodes} "
+                               f"time {Elapsed:.3f} pv {' '.join(convert_move_to_notation(Step) for Step in Variation)}")
+        if Session.Pondering:
+            await Session.PonderHit.wait()
+
+    async def ServeStream(self, Reader, Writer):
+        """Reads commands from a stream until EOF or quit."""
+        while True:
+            Line = await Reader.readline()
+            if not Line:
+                break
+            if not await self.HandleLine(Line.decode().strip(), Writer):
+                break
+
+    async def ServeClient(self, Reader, StreamWriter):
+        """Serves one TCP client connection."""
+        def Writer(Text):
+            if not StreamWriter.is_closing():
+                StreamWriter.write((Text + "\n").encode())
+
+        try:
+            await self.ServeStream(Reader, Writer)
+        finally:
+            StreamWriter.close()
+
+    async def ServeStdio(self):
+        """Serves commands from stdin, answering on stdout."""
+        def Writer(Text):
+            sys.stdout.write(Text + "\n")
+            sys.stdout.flush()
+
+        Loop = asyncio.get_running_loop()
+        Reader = asyncio.StreamReader()
+        await Loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(Reader), sys.stdin)
+        await self.ServeStream(Reader, Writer)
+
+
+async def RunServer(Port, Workers, UseStdio):
+    """Runs the engine server until stdin closes or, in socket-only mode, forever."""
+    Server = EngineServer(Workers)
+    try:
+        Listener = None
+        if Port is not None:
+            Listener = await asyncio.start_server(Server.ServeClient, "127.0.0.1", Port)
+        if UseStdio:
+            await Server.ServeStdio()
+        elif Listener is not None:
+            async with Listener:
+                await Listener.serve_forever()
+        if Listener is not None:
+            Listener.close()
+    finally:
+        Server.Close()
+
+
+def Main():
+    """Parses the command line and starts the server."""
+    Parser = argparse.ArgumentParser(description="Checkers engine server")
+    Parser.add_argument("--port", type=int, help="also listen on this local TCP port")
+    Parser.add_argument("--workers", type=int, help="number of search processes (default: CPU count)")
+    Parser.add_argument("--no-stdio", action="store_true", help="serve the socket only")
+    Arguments = Parser.parse_args()
+    if Arguments.no_stdio and Arguments.port is None:
+        Parser.error("--no-stdio needs --port")
+    asyncio.run(RunServer(Arguments.port, Arguments.workers, not Arguments.no_stdio))
+
+
+if __name__ == "__main__":
+    Main()
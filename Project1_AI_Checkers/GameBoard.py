@@ -1,7 +1,16 @@
+from OtherStuff import pdn_squares
+from PositionHistory import PositionHistory
+from RulesKernel import HasLegalMoves, LegalMoves, MoveTuples
+from Zobrist import HashBoard
+
 class GameBoard:
-    def __init__(self):
-        """Initialize the Checkers board with an 8x8 grid."""
+    def __init__(self, DrawMoveLimit=40):
+        """Initialize the Checkers board with an 8x8 grid.
+
+        DrawMoveLimit is the number of moves per side without a capture or a man move that draws the game."""
         self.BoardState = self.CreateBoard()
+        self.History = PositionHistory(DrawMoveLimit)
+        self.ResetHistory('W')
     
     def CreateBoard(self):
         """Creates an 8x8 board and places pieces in the correct starting positions."""
@@ -21,6 +30,63 @@ class GameBoard:
         
         return Board
 
+    def ResetHistory(self, Player):
+        """Starts the position history over from the current board with Player to move."""
+        self.History.Clear()
+        self.History.Push(HashBoard(self.BoardState, Player), True)
+
+    def ToCompact(self):
+        """Encodes the board as 32 characters, one per dark square read row by row from the top."""
+        Symbols = {' ': '.', 'W': 'w', 'WK': 'W', 'B': 'b', 'BK': 'B'}
+        return "".join(Symbols[self.BoardState[Row][Col]]
+                       for Row in range(8) for Col in range(8) if (Row + Col) % 2 == 1)
+
+    def LoadCompact(self, Text, Player='W'):
+        """Replaces the board with the position encoded by ToCompact, with Player to move."""
+        Pieces = {'.': ' ', 'w': 'W', 'W': 'WK', 'b': 'B', 'B': 'BK'}
+        if len(Text) != 32 or any(Symbol not in Pieces for Symbol in Text):
+            raise ValueError(f"Invalid compact position: {Text!r}")
+
+        Board = [[' ' for _ in range(8)] for _ in range(8)]
+        DarkSquares = [(Row, Col) for Row in range(8) for Col in range(8) if (Row + Col) % 2 == 1]
+        for (Row, Col), Symbol in zip(DarkSquares, Text):
+            Board[Row][Col] = Pieces[Symbol]
+        self.BoardState = Board
+        self.ResetHistory(Player)
+
+    def LoadPdn(self, Text):
+        """Replaces the board with a PDN FEN position and returns the side to move ('W' or 'B').
+
+        Accepts '[FEN "W:W21,22,K30:B1,2"]' or the bare 'W:W21,22,K30:B1,2' form, with ranges
+        such as 'B1-12'. Squares use the standard numbering of OtherStuff.pdn_squares, so
+        Black's men start on 1-12."""
+        Text = Text.strip()
+        if Text.startswith('['):
+            Text = Text[Text.index('"') + 1:Text.rindex('"')]
+        Fields = Text.rstrip('.').split(':')
+        if len(Fields) != 3 or Fields[0].upper() not in ('W', 'B'):
+            raise ValueError(f"Invalid PDN position: {Text!r}")
+
+        Board = [[' ' for _ in range(8)] for _ in range(8)]
+        for Field in Fields[1:]:
+            Color = Field[:1].upper()
+            if Color not in ('W', 'B'):
+                raise ValueError(f"Invalid PDN piece list: {Field!r}")
+            for Square in filter(None, Field[1:].split(',')):
+                IsKing = Square[0].upper() == 'K'
+                Bounds = (Square[1:] if IsKing else Square).split('-')
+                if len(Bounds) > 2 or not all(Bound.isdigit() for Bound in Bounds):
+                    raise ValueError(f"Invalid PDN square: {Square!r}")
+                First, Last = int(Bounds[0]), int(Bounds[-1])
+                if not 1 <= First <= Last <= 32:
+                    raise ValueError(f"Invalid PDN square: {Square!r}")
+                for Number in range(First, Last + 1):
+                    Row, Col = pdn_squares[Number - 1]
+                    Board[Row][Col] = Color + 'K' if IsKing else Color
+        self.BoardState = Board
+        self.ResetHistory(Fields[0].upper())
+        return Fields[0].upper()
+
     def DisplayBoard(self):
         """Displays the board in a readable format."""
         print("  A B C D E F G H")
@@ -36,38 +102,18 @@ class GameBoard:
         if Piece == ' ':
             return []  # No piece to move
 
-        # Determine movement directions
-        if Piece == 'W':
-            Directions = [(1, -1), (1, 1)]  # White moves downward
-        elif Piece == 'B':
-            Directions = [(-1, -1), (-1, 1)]  # Black moves upward
-        elif Piece in ('WK', 'BK'):  
-            Directions = [(1, -1), (1, 1), (-1, -1), (-1, 1)]  # Kings move in all four directions
-    
-        ValidMoves = []
-        JumpMoves = []
-
-        # Check regular moves
-        for DX, DY in Directions:
-            NX, NY = X + DX, Y + DY
-            if 0 <= NX < 8 and 0 <= NY < 8 and self.BoardState[NX][NY] == ' ':
-                ValidMoves.append((NX, NY))
-
-        # Check for jumps (captures)
-        for DX, DY in Directions:
-            NX, NY = X + DX, Y + DY
-            JX, JY = X + 2 * DX, Y + 2 * DY
-            if 0 <= JX < 8 and 0 <= JY < 8 and 0 <= NX < 8 and 0 <= NY < 8:
-                if self.BoardState[NX][NY] not in (' ', Piece) and self.BoardState[JX][JY] == ' ':
-                    JumpMoves.append((JX, JY))
-
-        # If a jump is available, the player MUST take it
-        return JumpMoves if JumpMoves else ValidMoves
+        # If a jump is available anywhere, the player MUST take one
+        Moves, _ = LegalMoves(self.BoardState, Piece[0])
+        Square = X * 8 + Y
+        return [MoveTuples[Move][2:] for Move in Moves if Move >> 6 == Square]
 
     def MovePiece(self, StartX, StartY, TargetX, TargetY):
         """Moves a piece from (StartX, StartY) to (TargetX, TargetY) if the move is valid, including captures."""
         ValidMoves = self.GetValidMoves(StartX, StartY)
         if (TargetX, TargetY) in ValidMoves:
+            Player = self.BoardState[StartX][StartY][0]
+            Opponent = 'B' if Player == 'W' else 'W'
+            Irreversible = abs(TargetX - StartX) == 2 or self.BoardState[StartX][StartY] in ('W', 'B')
             self.BoardState[TargetX][TargetY] = self.BoardState[StartX][StartY]
             self.BoardState[StartX][StartY] = ' '
             
@@ -80,6 +126,7 @@ class GameBoard:
                 if self.BoardState[TargetX][TargetY] in ('WK', 'BK'):
                     AdditionalJumps = self.GetValidMoves(TargetX, TargetY)
                     if any(abs(JX - TargetX) == 2 for JX, JY in AdditionalJumps):
+                        self.History.Push(HashBoard(self.BoardState, Player), Irreversible)
                         return "JumpContinued"
 
             # Check for king promotion
@@ -88,17 +135,18 @@ class GameBoard:
             elif TargetX == 7 and self.BoardState[TargetX][TargetY] == 'W':
                 self.BoardState[TargetX][TargetY] = 'WK'  # White piece becomes king
 
+            self.History.Push(HashBoard(self.BoardState, Opponent), Irreversible)
             return True
         return False
 
     def HasValidMoves(self, Player):
         """Check if the given player has any valid moves left."""
-        for X in range(8):
-            for Y in range(8):
-                if self.BoardState[X][Y] in (Player, Player + 'K') and self.GetValidMoves(X, Y):
-                    return True
-        return False
+        return HasLegalMoves(self.BoardState, Player)
 
     def IsGameOver(self):
         """Check if the game is over (one player has no valid moves left)."""
         return not (self.HasValidMoves('W') and self.HasValidMoves('B'))
+
+    def IsDraw(self):
+        """Check if the game is drawn by threefold repetition or the move-count rule."""
+        return self.History.IsDraw()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Small dense-network evaluator for SearchToolBox, run on the CPU with NumPy.
+
+The network reads the 32 dark squares of a board (Black men +1, Black kings +2, White
+men -1, White kings -2, read row by row from the top like GameBoard.ToCompact) through
+ReLU hidden layers to one output, scored like SearchToolBox.Heuristic: positive is good
+for Black. Weights live in a .npz file holding W0, b0, W1, b1, ... for each layer.
+
+Search collects the positions below each frontier node and evaluates them together, so a
+whole batch costs one matrix multiply per layer instead of one Python call per leaf:
+
+    Evaluator = NeuralEvaluator.Load("weights.npz")
+    Toolbox = SearchToolBox(Evaluator=Evaluator)
+"""
+import numpy as np
+
+# Input value per piece; empty squares stay 0
+PieceValues = {'B': 1.0, 'BK': 2.0, 'W': -1.0, 'WK': -2.0}
+DarkSquares = [(Row, Col) for Row in range(8) for Col in range(8) if (Row + Col) % 2 == 1]
+
+
+class NeuralEvaluator:
+    def __init__(self, Weights, Biases):
+        """Builds the network from per-layer weight matrices (inputs x outputs) and bias vectors."""
+        if len(Weights) != len(Biases) or not Weights:
+            raise ValueError("Need one bias vector per weight matrix")
+        if Weights[0].shape[0] != len(DarkSquares) or Weights[-1].shape[1] != 1:
+            raise ValueError(f"Network must map {len(DarkSquares)} inputs to 1 output")
+        self.Weights = [np.asarray(W, dtype=np.float32) for W in Weights]
+        self.Biases = [np.asarray(B, dtype=np.float32) for B in Biases]
+        self.Evaluations = 0  # Positions scored so far
+        self.Batches = 0  # Forward passes run so far
+
+    @classmethod
+    def Load(cls, Path):
+        """Reads W0, b0, W1, b1, ... from a .npz file."""
+        with np.load(Path) as Data:
+            Layers = sum(1 for Name in Data.files if Name.startswith('W'))
+            return cls([Data[f'W{Index}'] for Index in range(Layers)],
+                       [Data[f'b{Index}'] for Index in range(Layers)])
+
+    def Save(self, Path):
+        """Writes the weights in the format Load reads."""
+        Arrays = {}
+        for Index, (W, B) in enumerate(zip(self.Weights, self.Biases)):
+            Arrays[f'W{Index}'], Arrays[f'b{Index}'] = W, B
+        np.savez(Path, **Arrays)
+
+    @classmethod
+    def MaterialWeights(cls, Hidden=16, Seed=None):
+        """Returns a network that computes the king-weighted material count.
+
+        Two hidden units carry the material of each side; the others start at zero, or with
+        small random weights if Seed is given, ready to be trained further."""
+        W0 = np.zeros((len(DarkSquares), Hidden), dtype=np.float32)
+        W1 = np.zeros((Hidden, 1), dtype=np.float32)
+        if Seed is not None:
+            Generator = np.random.default_rng(Seed)
+            W0[:, 2:] = Generator.normal(0, 0.01, (len(DarkSquares), Hidden - 2))
+        W0[:, 0], W0[:, 1] = 1.0, -1.0  # ReLU(x) - ReLU(-x) == x
+        W1[0, 0], W1[1, 0] = 1.0, -1.0
+        return cls([W0, W1], [np.zeros(Hidden, dtype=np.float32), np.zeros(1, dtype=np.float32)])
+
+    def Encode(self, Boards):
+        """Returns the (len(Boards), 32) input matrix for a list of board states."""
+        Inputs = np.zeros((len(Boards), len(DarkSquares)), dtype=np.float32)
+        for Index, BoardState in enumerate(Boards):
+            Row = Inputs[Index]
+            for Square, (X, Y) in enumerate(DarkSquares):
+                Piece = BoardState[X][Y]
+                if Piece != ' ':
+                    Row[Square] = PieceValues[Piece]
+        return Inputs
+
+    def EvaluateBatch(self, Boards):
+        """Scores a list of board states with one forward pass; returns a list of floats."""
+        Values = self.Encode(Boards)
+        Last = len(self.Weights) - 1
+        for Index, (W, B) in enumerate(zip(self.Weights, self.Biases)):
+            Values = Values @ W + B
+            if Index < Last:
+                np.maximum(Values, 0, out=Values)  # ReLU on hidden layers
+        self.Evaluations += len(Boards)
+        self.Batches += 1
+        return Values[:, 0].tolist()
+
+    def Evaluate(self, BoardState):
+        """Scores a single board state."""
+        return self.EvaluateBatch([BoardState])[0]
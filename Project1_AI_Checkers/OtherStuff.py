@@ -1,4 +1,6 @@
 # OtherStuff.py
+from RulesKernel import EncodeMove, LegalMoves
+
 def convert_to_indices(move):
     """
     Converts a move in the format 'A3' to board indices (row, col).
@@ -18,6 +20,33 @@ def convert_to_notation(row, col):
     """
     return f"{chr(col + ord('A'))}{row + 1}"
 
+# Standard PDN square numbers: 1-32 run over the dark squares from Black's home row (row 7)
+# toward White's (row 0), each row from Black's right, so Black's men start on 1-12 and White's on 21-32
+pdn_squares = [(row, col) for row in range(7, -1, -1) for col in range(7, -1, -1) if (row + col) % 2 == 1]
+pdn_square_numbers = {square: number for number, square in enumerate(pdn_squares, 1)}
+
+def convert_move_to_notation(move):
+    """
+    Converts a move (x1, y1, x2, y2) to PDN notation such as '11-15', or '11x18' for a capture.
+    :param move: The move as a tuple of board indices, or None.
+    :return: The move text, or 'none' if there is no move.
+    """
+    if move is None:
+        return "none"
+    separator = 'x' if abs(move[2] - move[0]) == 2 else '-'
+    return f"{pdn_square_numbers[move[0], move[1]]}{separator}{pdn_square_numbers[move[2], move[3]]}"
+
+def convert_notation_to_move(text):
+    """
+    Converts PDN move notation such as '11-15' or '11x18' to a move (x1, y1, x2, y2).
+    :param text: The move text, two square numbers joined by '-' or 'x'.
+    :return: The move as a tuple of board indices.
+    """
+    squares = text.lower().replace('x', '-').split('-')
+    if len(squares) != 2 or not all(square.isdigit() and 1 <= int(square) <= 32 for square in squares):
+        raise ValueError(f"Invalid move: {text!r}")
+    return pdn_squares[int(squares[0]) - 1] + pdn_squares[int(squares[1]) - 1]
+
 def is_valid_move(board, x1, y1, x2, y2):
     """
     Checks if a move is valid for a piece at (x1, y1).
@@ -30,28 +59,8 @@ def is_valid_move(board, x1, y1, x2, y2):
     if piece == ' ':
         return False  # No piece to move
 
-    # Directions for white and black pieces
-    if piece == 'W':
-        directions = [(1, -1), (1, 1)]  # White moves downward
-    else:
-        directions = [(-1, -1), (-1, 1)]  # Black moves upward
-
-    # Check regular moves
-    for dx, dy in directions:
-        nx, ny = x1 + dx, y1 + dy
-        if (nx, ny) == (x2, y2) and 0 <= nx < 8 and 0 <= ny < 8:
-            if board[nx][ny] == ' ':
-                return True  # Valid normal move
-
-    # Check for captures (jumps)
-    for dx, dy in directions:
-        nx, ny = x1 + dx, y1 + dy
-        jx, jy = x1 + 2 * dx, y1 + 2 * dy
-        if (jx, jy) == (x2, y2) and 0 <= jx < 8 and 0 <= jy < 8 and 0 <= nx < 8 and 0 <= ny < 8:
-            if board[nx][ny] not in (' ', piece) and board[jx][jy] == ' ':
-                return True  # Valid jump
-
-    return False  # Move is invalid
+    moves, _ = LegalMoves(board, piece[0])
+    return EncodeMove((x1, y1, x2, y2)) in moves
 
 def print_board_state(board):
     """
@@ -1,4 +1,5 @@
 from SearchToolBox import SearchToolBox
+from Zobrist import HashBoard
 import time
 
 def GetHumanMove(GUI):
@@ -15,13 +16,20 @@ def GetHumanMove(GUI):
     GUI.Clicks.clear()
     return StartingMoveLocationX, StartingMoveLocationY, TargetingMoveLocationX, TargetingMoveLocationY
 
+def ComparisonToolbox(Board):
+    """Builds a toolbox with empty tables, so each compared algorithm is measured from the same start."""
+    Toolbox = SearchToolBox()
+    Toolbox.History = Board.History
+    return Toolbox
+
 def GameLoop(Board, GUI):
     """Interactive game loop integrating GUI and automatic bot moves with detailed analytics."""
-    SearchToolbox = SearchToolBox()
+    SearchToolbox = SearchToolBox()  # Plays the bot's moves, keeping its tables from turn to turn
+    SearchToolbox.History = Board.History  # The search scores repeats of earlier positions as draws
     IsHumanTurn = True
     SearchDepth = 3
 
-    while not Board.IsGameOver():
+    while not Board.IsGameOver() and not Board.IsDraw():
         GUI.Refresh()
 
         if IsHumanTurn:
@@ -41,80 +49,75 @@ def GameLoop(Board, GUI):
 
         else:
             print("Bot's turn!")
-            SearchToolbox = SearchToolBox()
-            SearchDepth = 3
 
             # Minimax
+            Comparison = ComparisonToolbox(Board)
             BestMoveMinimax = None
             BestValueMinimax = -float('inf')
-            SearchToolbox.StartTime = time.time()
-            for Move in SearchToolbox.GetAllMoves(Board.BoardState, 'B'):
-                NewBoard = SearchToolbox.MakeMove(Board.BoardState, Move)
-                MoveValue = SearchToolbox.Minimax(NewBoard, SearchDepth, False)
+            Comparison.StartTime = time.time()
+            for Move in Comparison.GetAllMoves(Board.BoardState, 'B'):
+                NewBoard = Comparison.MakeMove(Board.BoardState, Move)
+                MoveValue = Comparison.Minimax(NewBoard, SearchDepth, False)
                 if MoveValue is None:
                     continue
                 if MoveValue > BestValueMinimax:
                     BestValueMinimax = MoveValue
                     BestMoveMinimax = Move
-            MinimaxTime = time.time() - SearchToolbox.StartTime
-            StatesExpandedMinimax = SearchToolbox.StatesExpanded
-            SearchToolbox.StatesExpanded = 0
+            MinimaxTime = time.time() - Comparison.StartTime
+            StatesExpandedMinimax = Comparison.StatesExpanded
 
             # Alpha-Beta
+            Comparison = ComparisonToolbox(Board)
             BestMoveAB = None
             BestValueAB = -float('inf')
             Alpha, Beta = -float('inf'), float('inf')
-            SearchToolbox.StartTime = time.time()
-            for Move in SearchToolbox.GetAllMoves(Board.BoardState, 'B'):
-                NewBoard = SearchToolbox.MakeMove(Board.BoardState, Move)
-                MoveValue = SearchToolbox.AlphaBeta(NewBoard, SearchDepth, Alpha, Beta, False)
+            Comparison.StartTime = time.time()
+            for Move in Comparison.GetAllMoves(Board.BoardState, 'B'):
+                NewBoard = Comparison.MakeMove(Board.BoardState, Move)
+                MoveValue = Comparison.AlphaBeta(NewBoard, SearchDepth, Alpha, Beta, False)
                 if MoveValue is None:
                     continue
                 if MoveValue > BestValueAB:
                     BestValueAB = MoveValue
                     BestMoveAB = Move
                 Alpha = max(Alpha, BestValueAB)
-            AlphaBetaTime = time.time() - SearchToolbox.StartTime
-            StatesExpandedAB = SearchToolbox.StatesExpanded
-            PrunedBranchesAB = SearchToolbox.PrunedBranches
-            SearchToolbox.StatesExpanded = 0
-            SearchToolbox.PrunedBranches = 0
+            AlphaBetaTime = time.time() - Comparison.StartTime
+            StatesExpandedAB = Comparison.StatesExpanded
+            PrunedBranchesAB = Comparison.PrunedBranches
 
             # Alpha-Beta Ordered
+            Comparison = ComparisonToolbox(Board)
             BestMoveABOrdered = None
             BestValueABOrdered = -float('inf')
             Alpha, Beta = -float('inf'), float('inf')
-            SearchToolbox.StartTime = time.time()
-            Moves = SearchToolbox.GetAllMoves(Board.BoardState, 'B')
-
-            # Separate capturing moves from regular moves
-            CapturingMoves = [Move for Move in Moves if abs(Move[0] - Move[2]) == 2]  # Capturing moves have a distance of 2
-            NonCapturingMoves = [Move for Move in Moves if Move not in CapturingMoves]
+            Comparison.StartTime = time.time()
 
-            # Prioritize captures if available
-            OrderedMoves = CapturingMoves if CapturingMoves else NonCapturingMoves
+            # Captures are compulsory, so the legal moves are the captures if any are available
+            OrderedMoves = Comparison.GetAllMoves(Board.BoardState, 'B')
 
             # Use heuristic ordering for better decision-making
-            OrderedMoves = sorted(OrderedMoves, key=lambda M: SearchToolbox.Heuristic(SearchToolbox.MakeMove(Board.BoardState, M)), reverse=True)
+            OrderedMoves.sort(key=lambda M: Comparison.Heuristic(Comparison.MakeMove(Board.BoardState, M)), reverse=True)
 
+            RootKey = HashBoard(Board.BoardState, 'B')
             for Move in OrderedMoves:
-                NewBoard = SearchToolbox.MakeMove(Board.BoardState, Move)
-                MoveValue = SearchToolbox.AlphaBeta(NewBoard, SearchDepth, Alpha, Beta, False)
+                MoveValue = Comparison.SearchChild(Board.BoardState, RootKey, Move, SearchDepth + 1, Alpha, Beta, True, 0)
                 if MoveValue is None:
                     continue
                 if MoveValue > BestValueABOrdered:
                     BestValueABOrdered = MoveValue
                     BestMoveABOrdered = Move
                 Alpha = max(Alpha, BestValueABOrdered)
-            ABOrderedTime = time.time() - SearchToolbox.StartTime
-            StatesExpandedABOrdered = SearchToolbox.StatesExpanded
-            PrunedBranchesABOrdered = SearchToolbox.PrunedBranches
-            SearchToolbox.StatesExpanded = 0
-            SearchToolbox.PrunedBranches = 0
-
-            if BestMoveABOrdered:
-                Board.MovePiece(*BestMoveABOrdered)
-                print(f"Bot moved (Alpha-Beta Ordered) from {(BestMoveABOrdered[0], BestMoveABOrdered[1])} to {(BestMoveABOrdered[2], BestMoveABOrdered[3])}")
+            ABOrderedTime = time.time() - Comparison.StartTime
+            StatesExpandedABOrdered = Comparison.StatesExpanded
+            PrunedBranchesABOrdered = Comparison.PrunedBranches
+
+            # The move played comes from the same ordered search on the long-lived tables
+            SearchToolbox.NewSearch()
+            BestMove, _, _ = SearchToolbox.SearchBestMove(Board.BoardState, 'B', SearchDepth + 1)
+            BestMove = BestMove or BestMoveABOrdered
+            if BestMove:
+                Board.MovePiece(*BestMove)
+                print(f"Bot moved (Alpha-Beta Ordered) from {(BestMove[0], BestMove[1])} to {(BestMove[2], BestMove[3])}")
                 GUI.Refresh()
 
             # Display analytics clearly
@@ -132,7 +135,9 @@ def GameLoop(Board, GUI):
 
     GUI.Refresh()
     print("Game Over!")
-    if Board.HasValidMoves('W'):
+    if Board.IsDraw():
+        print("Draw!")
+    elif Board.HasValidMoves('W'):
         print("You win!")
     else:
         print("Bot wins!")
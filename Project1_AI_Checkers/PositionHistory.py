@@ -0,0 +1,51 @@
+class PositionHistory:
+    """Stack of the position hashes played so far, with O(1) repetition and move-count draw checks."""
+
+    def __init__(self, DrawMoveLimit=40):
+        """DrawMoveLimit is the number of moves per side without a capture or a man move that draws the game."""
+        self.DrawPlyLimit = 2 * DrawMoveLimit
+        self.Keys = []  # Hash of every position, oldest first
+        self.Counts = {}  # Hash -> how many times it is on the stack
+        self.QuietPlies = []  # Plies since the last capture or man move, per stack entry
+
+    def Push(self, Key, Irreversible):
+        """Records the position reached by a move; Irreversible is True for captures and man moves."""
+        self.Keys.append(Key)
+        self.Counts[Key] = self.Counts.get(Key, 0) + 1
+        self.QuietPlies.append(0 if Irreversible or not self.QuietPlies else self.QuietPlies[-1] + 1)
+
+    def Pop(self):
+        """Takes back the most recent position."""
+        Key = self.Keys.pop()
+        self.QuietPlies.pop()
+        if self.Counts[Key] == 1:
+            del self.Counts[Key]
+        else:
+            self.Counts[Key] -= 1
+
+    def Clear(self):
+        """Forgets every position."""
+        self.Keys.clear()
+        self.Counts.clear()
+        self.QuietPlies.clear()
+
+    def Copy(self):
+        """Returns an independent copy, e.g. to hand to a search in another process."""
+        Other = PositionHistory()
+        Other.DrawPlyLimit = self.DrawPlyLimit
+        Other.Keys = self.Keys[:]
+        Other.Counts = dict(self.Counts)
+        Other.QuietPlies = self.QuietPlies[:]
+        return Other
+
+    def Occurrences(self, Key):
+        """Returns how many times the position is on the stack."""
+        return self.Counts.get(Key, 0)
+
+    def IsMoveLimitReached(self):
+        """Checks the move-count rule for the latest position."""
+        return bool(self.QuietPlies) and self.QuietPlies[-1] >= self.DrawPlyLimit
+
+    def IsDraw(self):
+        """Checks if the latest position is drawn by threefold repetition or the move-count rule."""
+        return bool(self.Keys) and (self.Counts[self.Keys[-1]] >= 3 or self.IsMoveLimitReached())
@@ -0,0 +1,124 @@
+"""The single implementation of the checkers move rules.
+
+GameBoard, SearchToolBox and OtherStuff all ask this module for legal moves. Captures
+are compulsory: when the side to move has any jump, only jumps are legal. Legal move
+lists are kept in a small LRU cache keyed by the position's Zobrist hash, so a position
+that has been seen before is never scanned again.
+"""
+from collections import OrderedDict
+
+from Zobrist import HashBoard
+
+MaxMovesPerPly = 64  # Upper bound on the moves of one position (12 kings x 4 directions)
+
+
+def EncodeMove(Move):
+    """Packs an (X1, Y1, X2, Y2) move into one integer: (X1 * 8 + Y1) << 6 | (X2 * 8 + Y2)."""
+    X1, Y1, X2, Y2 = Move
+    return (X1 * 8 + Y1) << 6 | (X2 * 8 + Y2)
+
+
+def DecodeMove(Move):
+    """Unpacks an integer move into its (X1, Y1, X2, Y2) tuple."""
+    return MoveTuples[Move]
+
+
+# Tuple form of every encoded move, so decoding never allocates
+MoveTuples = [(From >> 3, From & 7, To >> 3, To & 7) for From in range(64) for To in range(64)]
+
+
+def BuildStepTable():
+    """Precomputes, per piece and square, (NX, NY, JX, JY, QuietMove, JumpMove) for every direction."""
+    PieceDirections = {
+        'W': [(1, -1), (1, 1)],  # White moves downward
+        'B': [(-1, -1), (-1, 1)],  # Black moves upward
+        'WK': [(1, -1), (1, 1), (-1, -1), (-1, 1)],  # Kings move in all four directions
+        'BK': [(1, -1), (1, 1), (-1, -1), (-1, 1)],
+    }
+    Table = {}
+    for Piece, Directions in PieceDirections.items():
+        Table[Piece] = [[[] for _ in range(8)] for _ in range(8)]
+        for X in range(8):
+            for Y in range(8):
+                for DX, DY in Directions:
+                    NX, NY, JX, JY = X + DX, Y + DY, X + 2 * DX, Y + 2 * DY
+                    if not (0 <= NX < 8 and 0 <= NY < 8):
+                        continue
+                    JumpMove = EncodeMove((X, Y, JX, JY)) if 0 <= JX < 8 and 0 <= JY < 8 else None
+                    Table[Piece][X][Y].append((NX, NY, JX, JY, EncodeMove((X, Y, NX, NY)), JumpMove))
+    return Table
+
+
+StepTable = BuildStepTable()
+
+# Scratch space for GenerateLegalMoves; the results are copied out into a tuple
+_Captures = [0] * MaxMovesPerPly
+_Quiets = [0] * MaxMovesPerPly
+
+
+def GenerateLegalMoves(BoardState, Player):
+    """Scans the board and returns (Moves, AreCaptures) for Player, moves integer-encoded."""
+    Captures, Quiets = _Captures, _Quiets
+    CaptureCount = QuietCount = 0
+    for X in range(8):
+        Row = BoardState[X]
+        for Y in range(8):
+            Piece = Row[Y]
+            if Piece == ' ' or Piece[0] != Player:
+                continue  # Skip empty squares and opponent's pieces
+            for NX, NY, JX, JY, QuietMove, JumpMove in StepTable[Piece][X][Y]:
+                Target = BoardState[NX][NY]
+                if Target == ' ':
+                    Quiets[QuietCount] = QuietMove
+                    QuietCount += 1
+                elif JumpMove is not None and Target[0] != Player and BoardState[JX][JY] == ' ':
+                    Captures[CaptureCount] = JumpMove
+                    CaptureCount += 1
+    if CaptureCount:
+        return tuple(Captures[:CaptureCount]), True  # If a jump is available, the player MUST take it
+    return tuple(Quiets[:QuietCount]), False
+
+
+class LegalMoveCache:
+    """Least-recently-used cache of legal move lists keyed by Zobrist hash."""
+
+    def __init__(self, MaxEntries=16384):
+        self.Entries = OrderedDict()
+        self.MaxEntries = MaxEntries
+        self.Hits = 0
+        self.Misses = 0
+
+    def Get(self, BoardState, Player, Key=None):
+        """Returns (Moves, AreCaptures) for Player; Key may be passed if the caller already hashed the board."""
+        if Key is None:
+            Key = HashBoard(BoardState, Player)
+        Entry = self.Entries.get(Key)
+        if Entry is not None:
+            self.Entries.move_to_end(Key)
+            self.Hits += 1
+            return Entry
+        self.Misses += 1
+        Entry = self.Entries[Key] = GenerateLegalMoves(BoardState, Player)
+        if len(self.Entries) > self.MaxEntries:
+            self.Entries.popitem(last=False)
+        return Entry
+
+    def Clear(self):
+        """Empties the cache and its counters."""
+        self.Entries.clear()
+        self.Hits = 0
+        self.Misses = 0
+
+
+# Shared by every caller in the process
+MoveCache = LegalMoveCache()
+
+
+def LegalMoves(BoardState, Player, Key=None):
+    """Returns (Moves, AreCaptures): Player's legal integer-encoded moves and whether they are jumps."""
+    return MoveCache.Get(BoardState, Player, Key)
+
+
+def HasLegalMoves(BoardState, Player):
+    """Checks if Player has any legal move."""
+    return bool(MoveCache.Get(BoardState, Player)[0])
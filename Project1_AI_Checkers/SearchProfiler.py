@@ -0,0 +1,153 @@
+"""Opt-in profiling for SearchToolBox, switched on and off at runtime.
+
+Enable shadows the toolbox's search methods with timing wrappers stored on the instance
+(and, in deterministic mode, the rules/hash functions SearchToolBox calls). Disable removes
+them again, so a toolbox that is not being profiled runs its plain methods at no cost.
+
+    Profiler = SearchProfiler()
+    Profiler.Enable(Toolbox)               # or Enable(Toolbox, "sampling", Interval=0.001)
+    Toolbox.SearchBestMove(BoardState, 'B', 6)
+    Profiler.Disable()
+    print(Profiler.Report())
+    Profiler.DumpCollapsed("search.folded")  # flamegraph.pl search.folded > search.svg
+
+Deterministic mode counts every call and measures cumulative and self time. Sampling mode
+records the searching thread's stack every Interval seconds from a background thread; it
+disturbs the search less but only estimates times and has no call counts.
+"""
+import sys
+import threading
+import time
+
+import SearchToolBox as SearchModule
+
+# Methods shadowed on the toolbox instance
+ProfiledMethods = ('SearchBestMove', 'AlphaBeta', 'SearchChild', 'ReducedSearch', 'EvaluateFrontier',
+                   'Minimax', 'GetAllMoves', 'MakeMove', 'IsGameOver', 'Heuristic', 'Evaluate', 'PrincipalVariation')
+# Module-level functions SearchToolBox imports from RulesKernel and Zobrist
+ProfiledFunctions = ('LegalMoves', 'HasLegalMoves', 'HashBoard', 'HashAfterMove')
+# Modules whose frames sampling mode records; the caller's own frames are left out
+EngineModules = ('SearchToolBox', 'RulesKernel', 'Zobrist', 'PositionHistory', 'NeuralEvaluator')
+
+
+class SearchProfiler:
+    def __init__(self):
+        """Creates an idle profiler; results add up over every Enable/Disable round until Reset."""
+        self.Toolbox = None
+        self.Mode = None  # 'deterministic' or 'sampling' while enabled
+        self.Interval = 0.001
+        self.Reset()
+
+    def Reset(self):
+        """Forgets everything recorded so far."""
+        self.Calls = {}  # Function -> number of calls (deterministic mode only)
+        self.Cumulative = {}  # Function -> seconds with the function anywhere on the stack
+        self.Own = {}  # Function -> seconds with the function on top of the stack
+        self.Stacks = {}  # Tuple of function names, outermost first -> seconds spent there
+
+    def Enable(self, Toolbox, Mode="deterministic", Interval=0.001):
+        """Starts recording Toolbox; Interval is the sampling period in seconds for sampling mode."""
+        if self.Mode is not None:
+            raise RuntimeError("Profiler is already enabled")
+        if Mode not in ("deterministic", "sampling"):
+            raise ValueError(f"Unknown profiling mode: {Mode!r}")
+        self.Toolbox, self.Mode, self.Interval = Toolbox, Mode, Interval
+        if Mode == "deterministic":
+            self.OriginalFunctions = {Name: getattr(SearchModule, Name) for Name in ProfiledFunctions}
+            self.ActiveStack, self.ChildTimes, self.Depths = [], [], {}
+            for Name in ProfiledMethods:
+                setattr(self.Toolbox, Name, self.Wrap(Name, getattr(self.Toolbox, Name)))
+            for Name, Function in self.OriginalFunctions.items():
+                setattr(SearchModule, Name, self.Wrap(Name, Function))
+        else:
+            self.TargetThread = threading.get_ident()
+            self.EngineFiles = {sys.modules[Name].__file__ for Name in EngineModules if Name in sys.modules}
+            self.StopSampling = threading.Event()
+            self.Sampler = threading.Thread(target=self.Sample, daemon=True)
+            self.Sampler.start()
+
+    def Disable(self):
+        """Stops recording and restores the plain methods; the results stay available."""
+        if self.Mode == "deterministic":
+            for Name in ProfiledMethods:
+                delattr(self.Toolbox, Name)  # The class methods show through again
+            for Name, Function in self.OriginalFunctions.items():
+                setattr(SearchModule, Name, Function)
+            self.Toolbox = None
+        elif self.Mode == "sampling":
+            self.StopSampling.set()
+            self.Sampler.join()
+        self.Mode = None
+
+    def Wrap(self, Name, Function):
+        """Returns Function wrapped to count calls and charge its time to Name and the current stack."""
+        Clock = time.perf_counter
+        ActiveStack, ChildTimes, Depths = self.ActiveStack, self.ChildTimes, self.Depths
+        Calls, Cumulative, Own, Stacks = self.Calls, self.Cumulative, self.Own, self.Stacks
+
+        def Profiled(*Arguments, **Keywords):
+            ActiveStack.append(Name)
+            ChildTimes.append(0.0)
+            Depths[Name] = Depths.get(Name, 0) + 1
+            Start = Clock()
+            try:
+                return Function(*Arguments, **Keywords)
+            finally:
+                Elapsed = Clock() - Start
+                SelfTime = Elapsed - ChildTimes.pop()
+                if ChildTimes:
+                    ChildTimes[-1] += Elapsed
+                Stack = tuple(ActiveStack)
+                ActiveStack.pop()
+                Depths[Name] -= 1
+                Calls[Name] = Calls.get(Name, 0) + 1
+                if Depths[Name] == 0:  # Recursive calls are already inside the outermost one's time
+                    Cumulative[Name] = Cumulative.get(Name, 0.0) + Elapsed
+                Own[Name] = Own.get(Name, 0.0) + SelfTime
+                Stacks[Stack] = Stacks.get(Stack, 0.0) + SelfTime
+        return Profiled
+
+    def Sample(self):
+        """Sampler thread: records the engine frames of the target thread every Interval seconds.
+
+        Each sample is charged the time since the previous one, since the interpreter may wake
+        the sampler later than asked."""
+        Previous = time.perf_counter()
+        while not self.StopSampling.wait(self.Interval):
+            Now = time.perf_counter()
+            Elapsed, Previous = Now - Previous, Now
+            Frame = sys._current_frames().get(self.TargetThread)
+            Names = []
+            while Frame is not None:
+                if Frame.f_code.co_filename in self.EngineFiles:
+                    Names.append(Frame.f_code.co_name)
+                Frame = Frame.f_back
+            if not Names:
+                continue  # The thread is outside the engine
+            Stack = tuple(reversed(Names))
+            self.Stacks[Stack] = self.Stacks.get(Stack, 0.0) + Elapsed
+            self.Own[Stack[-1]] = self.Own.get(Stack[-1], 0.0) + Elapsed
+            for Name in set(Stack):
+                self.Cumulative[Name] = self.Cumulative.get(Name, 0.0) + Elapsed
+
+    def Report(self, Limit=20):
+        """Returns a table of the functions with the most cumulative time."""
+        Lines = [
+            "+----------------------+------------+-----------------+-----------------+",
+            "| Function             | Calls      | Cumulative (s)  | Self (s)        |",
+            "+----------------------+------------+-----------------+-----------------+",
+        ]
+        Ranked = sorted(self.Cumulative, key=self.Cumulative.get, reverse=True)[:Limit]
+        for Name in Ranked:
+            Calls = self.Calls.get(Name, 'N/A')
+            Lines.append(f"| {Name:<21}| {Calls:<11}| {self.Cumulative[Name]:<16.4f}| {self.Own.get(Name, 0.0):<16.4f}|")
+        Lines.append(Lines[0])
+        return "\n".join(Lines)
+
+    def DumpCollapsed(self, Path):
+        """Writes the stacks in collapsed form ('A;B;C microseconds' per line) for flamegraph tools."""
+        with open(Path, "w") as File:
+            for Stack, Seconds in sorted(self.Stacks.items()):
+                Microseconds = round(Seconds * 1e6)
+                if Microseconds:
+                    File.write(f"{';'.join(Stack)} {Microseconds}\n")
@@ -1,14 +1,84 @@
 import time
+from collections import namedtuple
+from PositionHistory import PositionHistory
+from RulesKernel import HasLegalMoves, LegalMoves, MaxMovesPerPly, MoveTuples
+from Zobrist import HashAfterMove, HashBoard
+
+# Bound types stored in the transposition table
+ExactBound, LowerBound, UpperBound = 0, 1, 2
+
+# One ranked root move in an analysis: its score and principal variation as (X1, Y1, X2, Y2) moves
+AnalysisLine = namedtuple('AnalysisLine', ['Depth', 'Move', 'Score', 'Variation'])
 
 class SearchToolBox:
-    def __init__(self, TimeLimit=4, DepthLimit=5):
-        """Initializes the search toolbox with constraints on search time and depth."""
+    def __init__(self, TimeLimit=4, DepthLimit=5, Evaluator=None):
+        """Initializes the search toolbox with constraints on search time and depth.
+
+        Evaluator, e.g. a NeuralEvaluator, replaces Heuristic in AlphaBeta; it must offer
+        Evaluate(BoardState) and EvaluateBatch(Boards)."""
         self.StatesExpanded = 0  # Tracks the number of expanded states in search
         self.PrunedBranches = 0  # Tracks the number of pruned branches in Alpha-Beta pruning
         self.TimeLimit = min(max(TimeLimit, 1), 4)  # Time limit between 1 and 4 seconds
         self.DepthLimit = min(max(DepthLimit, 3), 5)  # Depth limit between 3 and 5 plies
         self.StartTime = None  # Stores start time of the search
         self.BranchingFactor = 0  # Average branching factor in search
+        self.TableHits = 0  # Tracks the number of nodes answered by the transposition table
+        self.Reductions = 0  # Tracks the number of late moves searched at reduced depth
+        self.ReSearches = 0  # Tracks the number of reduced moves re-searched at full depth
+
+        # Late move reductions: quiet moves late in the ordering are first tried shallower. A move whose
+        # strength only shows beyond the reduced depth can be missed, so the value may differ from plain
+        # alpha-beta; with ReductionPlies = 0 the null-window try and re-search give exactly its value.
+        self.UseLateMoveReductions = True
+        self.ReductionMinDepth = 3  # Only reduce when at least this many plies remain
+        self.ReductionMoveIndex = 3  # The first moves at each node are never reduced
+        self.ReductionPlies = 1  # How many plies shallower a reduced move is searched
+
+        # Long-lived tables, kept across turns and cleared only by NewGame
+        self.TranspositionTable = {}  # Zobrist key -> (Depth, Value, Bound, BestMove, Generation)
+        self.HistoryTable = {}  # Quiet move -> cutoff score, used for move ordering
+        self.Generation = 0  # Incremented by NewSearch to age old table entries
+        self.MaxTableEntries = 500000  # Stale entries are purged once the table grows past this
+
+        # Reusable move buffers, one per ply, reordered in place by AlphaBeta
+        self.MoveBuffers = []
+
+        # Positions of the game so far plus the current search path; repeating one scores as a draw.
+        # Callers share their GameBoard's History here so the search sees the moves already played.
+        self.History = PositionHistory()
+        self.DrawScore = 0
+
+        # Optional learned evaluation; the leaves under each depth-1 node are scored in one batch
+        self.Evaluator = Evaluator
+
+        # Optional callable polled at every AlphaBeta node; a true result aborts the search like the time limit
+        self.StopSignal = None
+
+    def NewSearch(self):
+        """Prepares for the next turn: resets the counters and ages the search tables without clearing them."""
+        self.StatesExpanded = 0
+        self.PrunedBranches = 0
+        self.TableHits = 0
+        self.Reductions = 0
+        self.ReSearches = 0
+        self.StartTime = None
+        self.Generation += 1
+
+        # Halve history scores so ordering follows the current part of the game
+        self.HistoryTable = {Move: Score // 2 for Move, Score in self.HistoryTable.items() if Score > 1}
+
+        # Once the table is large, drop entries not written during the last two searches
+        if len(self.TranspositionTable) > self.MaxTableEntries:
+            self.TranspositionTable = {Key: Entry for Key, Entry in self.TranspositionTable.items()
+                                       if Entry[4] >= self.Generation - 1}
+
+    def NewGame(self):
+        """Forgets everything learned in the previous game."""
+        self.TranspositionTable.clear()
+        self.HistoryTable.clear()
+        self.History = PositionHistory()  # Replaced, not cleared: it may be a GameBoard's history
+        self.Generation = 0
+        self.NewSearch()
 
     def Minimax(self, BoardState, Depth, MaximizingPlayer):
         """Implements the Minimax algorithm to find the best move."""
@@ -43,46 +113,282 @@ class SearchToolBox:
                 MinEvaluation = min(MinEvaluation, Evaluation)
             return MinEvaluation
 
-    def AlphaBeta(self, BoardState, Depth, Alpha, Beta, MaximizingPlayer):
-        """Implements Alpha-Beta pruning to optimize the Minimax algorithm."""
+    def AlphaBeta(self, BoardState, Depth, Alpha, Beta, MaximizingPlayer, Ply=0, Key=None):
+        """Implements Alpha-Beta pruning to optimize the Minimax algorithm.
+
+        Ply is the distance from the first AlphaBeta call and selects this node's move buffer.
+        Key is the position's Zobrist hash when the caller already has it."""
         if self.StartTime is None:
             self.StartTime = time.time()
         if time.time() - self.StartTime > self.TimeLimit:
             return None  # Stop searching if time limit is exceeded
+        if self.StopSignal is not None and self.StopSignal():
+            return None  # Stopped from outside
 
         self.StatesExpanded += 1  # Count expanded states
-        if Depth == 0 or self.IsGameOver(BoardState):
-            return self.Heuristic(BoardState)  # Evaluate board if depth is 0 or game is over
+        if Depth == 0:
+            return self.Evaluate(BoardState)  # Evaluate board if depth is 0
 
-        MovesList = self.GetAllMoves(BoardState, 'B' if MaximizingPlayer else 'W')
-        self.BranchingFactor = len(MovesList)
+        # Reuse earlier work on this position, from this search or a previous turn
+        Player = 'B' if MaximizingPlayer else 'W'
+        if Key is None:
+            Key = HashBoard(BoardState, Player)
+        Entry = self.TranspositionTable.get(Key)
+        TableMove = None
+        if Entry is not None:
+            EntryDepth, EntryValue, Bound, TableMove, _ = Entry
+            if EntryDepth >= Depth and (Bound == ExactBound or
+                                        (Bound == LowerBound and EntryValue >= Beta) or
+                                        (Bound == UpperBound and EntryValue <= Alpha)):
+                self.TableHits += 1
+                return EntryValue
+        OriginalAlpha, OriginalBeta = Alpha, Beta
 
-        if MaximizingPlayer:
-            MaxEvaluation = -float('inf')
-            for Move in MovesList:
-                NewBoardState = self.MakeMove(BoardState, Move)
-                Evaluation = self.AlphaBeta(NewBoardState, Depth - 1, Alpha, Beta, False)
-                if Evaluation is None:
-                    return None
-                MaxEvaluation = max(MaxEvaluation, Evaluation)
+        LegalMoveList, AreCaptures = LegalMoves(BoardState, Player, Key)
+        MoveCount = len(LegalMoveList)
+        if MoveCount == 0:
+            return self.Evaluate(BoardState)  # Evaluate board if the game is over
+        self.BranchingFactor = MoveCount
+        if Depth == 1 and self.Evaluator is not None:
+            return self.EvaluateFrontier(BoardState, Key, LegalMoveList, MaximizingPlayer)
+
+        # Copy into this ply's buffer so it can be reordered in place; the stored best move goes first
+        while len(self.MoveBuffers) <= Ply:
+            self.MoveBuffers.append([0] * MaxMovesPerPly)
+        Moves = self.MoveBuffers[Ply]
+        Moves[:MoveCount] = LegalMoveList
+        FirstPicked = 1 if TableMove is not None and self.MoveToFront(Moves, MoveCount, TableMove) else 0
+
+        BestMove = None
+        BestEvaluation = -float('inf') if MaximizingPlayer else float('inf')
+        for Index in range(MoveCount):
+            if AreCaptures or Index < FirstPicked:
+                Move = Moves[Index]
+            else:
+                Move = self.PickQuietMove(Moves, Index, MoveCount)
+
+            Reduce = (self.UseLateMoveReductions and not AreCaptures and Index >= self.ReductionMoveIndex
+                      and Depth >= self.ReductionMinDepth and BestMove is not None)
+            Evaluation = self.SearchChild(BoardState, Key, MoveTuples[Move], Depth, Alpha, Beta,
+                                          MaximizingPlayer, Ply, Reduce)
+            if Evaluation is None:
+                return None
+            if MaximizingPlayer:
+                if Evaluation > BestEvaluation:
+                    BestEvaluation, BestMove = Evaluation, Move
                 Alpha = max(Alpha, Evaluation)
-                if Beta <= Alpha:
-                    self.PrunedBranches += 1  # Count pruned branches
-                    break  # Prune unnecessary search branches
-            return MaxEvaluation
-        else:
-            MinEvaluation = float('inf')
-            for Move in MovesList:
-                NewBoardState = self.MakeMove(BoardState, Move)
-                Evaluation = self.AlphaBeta(NewBoardState, Depth - 1, Alpha, Beta, True)
-                if Evaluation is None:
-                    return None
-                MinEvaluation = min(MinEvaluation, Evaluation)
+            else:
+                if Evaluation < BestEvaluation:
+                    BestEvaluation, BestMove = Evaluation, Move
                 Beta = min(Beta, Evaluation)
-                if Beta <= Alpha:
-                    self.PrunedBranches += 1  # Count pruned branches
-                    break  # Prune unnecessary search branches
-            return MinEvaluation
+            if Beta <= Alpha:
+                self.PrunedBranches += 1  # Count pruned branches
+                if not AreCaptures:
+                    self.RecordCutoff(Move, Depth)
+                break  # Prune unnecessary search branches
+
+        self.StoreEntry(Key, Depth, BestEvaluation, OriginalAlpha, OriginalBeta, BestMove)
+        return BestEvaluation
+
+    def SearchChild(self, BoardState, Key, Move, Depth, Alpha, Beta, MaximizingPlayer, Ply, Reduce=False):
+        """Searches the position after Move, a tuple played by the side to move in BoardState (hashed as Key).
+
+        A position already in the game or on the search path, or one reached after too many
+        moves without progress, is a draw and is not searched."""
+        ChildKey = HashAfterMove(Key, BoardState, Move)
+        if self.History.Occurrences(ChildKey):
+            return self.DrawScore
+        X1, Y1, X2, _ = Move
+        self.History.Push(ChildKey, abs(X2 - X1) == 2 or BoardState[X1][Y1] in ('W', 'B'))
+        if self.History.IsMoveLimitReached():
+            Evaluation = self.DrawScore
+        else:
+            NewBoardState = self.MakeMove(BoardState, Move)
+            if Reduce:
+                Evaluation = self.ReducedSearch(NewBoardState, ChildKey, Depth, Alpha, Beta, MaximizingPlayer, Ply)
+            else:
+                Evaluation = self.AlphaBeta(NewBoardState, Depth - 1, Alpha, Beta, not MaximizingPlayer, Ply + 1,
+                                            ChildKey)
+        self.History.Pop()
+        return Evaluation
+
+    def EvaluateFrontier(self, BoardState, Key, Moves, MaximizingPlayer):
+        """Scores every child of a depth-1 node with one Evaluator batch and returns the best score.
+
+        Nothing is pruned here: once the leaves are batched, scoring all of them costs about
+        as much as scoring the few alpha-beta would have visited."""
+        History = self.History
+        Children, ChildMoves, Scored = [], [], []
+        for Move in Moves:
+            MoveTuple = MoveTuples[Move]
+            ChildKey = HashAfterMove(Key, BoardState, MoveTuple)
+            if History.Occurrences(ChildKey):
+                Scored.append((self.DrawScore, Move))
+                continue
+            X1, Y1, X2, _ = MoveTuple
+            History.Push(ChildKey, abs(X2 - X1) == 2 or BoardState[X1][Y1] in ('W', 'B'))
+            Drawn = History.IsMoveLimitReached()
+            History.Pop()
+            if Drawn:
+                Scored.append((self.DrawScore, Move))
+            else:
+                Children.append(self.MakeMove(BoardState, MoveTuple))
+                ChildMoves.append(Move)
+        self.StatesExpanded += len(Moves)
+        if Children:
+            Scored.extend(zip(self.Evaluator.EvaluateBatch(Children), ChildMoves))
+
+        Choose = max if MaximizingPlayer else min
+        BestEvaluation, BestMove = Choose(Scored, key=lambda Item: Item[0])
+        self.StoreEntry(Key, 1, BestEvaluation, -float('inf'), float('inf'), BestMove)
+        return BestEvaluation
+
+    def ReducedSearch(self, NewBoardState, Key, Depth, Alpha, Beta, MaximizingPlayer, Ply):
+        """Searches a late quiet move shallower with a null window, and again at full depth if it beats the best move."""
+        self.Reductions += 1
+        ReducedDepth = max(Depth - 1 - self.ReductionPlies, 0)
+        if MaximizingPlayer:
+            Evaluation = self.AlphaBeta(NewBoardState, ReducedDepth, Alpha, Alpha + 1, False, Ply + 1, Key)
+            Improves = Evaluation is not None and Evaluation > Alpha
+        else:
+            Evaluation = self.AlphaBeta(NewBoardState, ReducedDepth, Beta - 1, Beta, True, Ply + 1, Key)
+            Improves = Evaluation is not None and Evaluation < Beta
+        if not Improves:
+            return Evaluation  # Fails low (or ran out of time): the move is no better than what we have
+        self.ReSearches += 1
+        return self.AlphaBeta(NewBoardState, Depth - 1, Alpha, Beta, not MaximizingPlayer, Ply + 1, Key)
+
+    def MoveToFront(self, Buffer, Count, Move):
+        """Swaps Move to the front of the first Count entries of Buffer; returns whether it was found."""
+        for Index in range(Count):
+            if Buffer[Index] == Move:
+                Buffer[0], Buffer[Index] = Buffer[Index], Buffer[0]
+                return True
+        return False
+
+    def PickQuietMove(self, Quiets, Index, Count):
+        """Swaps the remaining quiet move with the best history score into Index and returns it."""
+        History = self.HistoryTable
+        if History:
+            Best, BestScore = Index, History.get(Quiets[Index], 0)
+            for Other in range(Index + 1, Count):
+                Score = History.get(Quiets[Other], 0)
+                if Score > BestScore:
+                    Best, BestScore = Other, Score
+            Quiets[Index], Quiets[Best] = Quiets[Best], Quiets[Index]
+        return Quiets[Index]
+
+    def StoreEntry(self, Key, Depth, Value, Alpha, Beta, BestMove):
+        """Stores a search result, classified against the window it was searched with."""
+        if Value <= Alpha:
+            Bound = UpperBound
+        elif Value >= Beta:
+            Bound = LowerBound
+        else:
+            Bound = ExactBound
+        Entry = self.TranspositionTable.get(Key)
+        # Prefer deeper results, but always replace entries left over from earlier turns
+        if Entry is None or Entry[4] != self.Generation or Depth >= Entry[0]:
+            self.TranspositionTable[Key] = (Depth, Value, Bound, BestMove, self.Generation)
+
+    def RecordCutoff(self, Move, Depth):
+        """Rewards a quiet move that caused a beta cutoff so it is tried earlier next time."""
+        self.HistoryTable[Move] = self.HistoryTable.get(Move, 0) + Depth * Depth
+
+    def SearchBestMove(self, BoardState, Player, Depth=None):
+        """Runs an ordered Alpha-Beta search from the root for Player.
+
+        Depth counts plies including the root move. Returns (BestMove, BestValue, Completed),
+        where Completed is False if the time limit cut the search short."""
+        if Depth is None:
+            Depth = self.DepthLimit
+        if self.StartTime is None:
+            self.StartTime = time.time()
+        Maximizing = Player == 'B'
+
+        # Heuristic ordering as in GameLoop; captures are compulsory
+        OrderedMoves = self.GetAllMoves(BoardState, Player)
+        OrderedMoves.sort(key=lambda M: self.Heuristic(self.MakeMove(BoardState, M)), reverse=Maximizing)
+
+        BestMove = None
+        BestValue = -float('inf') if Maximizing else float('inf')
+        Alpha, Beta = -float('inf'), float('inf')
+        RootKey = HashBoard(BoardState, Player)
+        for Move in OrderedMoves:
+            MoveValue = self.SearchChild(BoardState, RootKey, Move, Depth, Alpha, Beta, Maximizing, 0)
+            if MoveValue is None:
+                return BestMove, BestValue, False
+            if Maximizing and MoveValue > BestValue:
+                BestValue, BestMove = MoveValue, Move
+                Alpha = max(Alpha, BestValue)
+            elif not Maximizing and MoveValue < BestValue:
+                BestValue, BestMove = MoveValue, Move
+                Beta = min(Beta, BestValue)
+        return BestMove, BestValue, True
+
+    def Analyse(self, BoardState, Player, MaxDepth=None, Lines=3, MinDepth=1):
+        """Yields, for each completed depth, the best Lines root moves as a list of AnalysisLine.
+
+        Each depth reuses the previous depth's ranking for root move ordering and the tables for
+        everything below; once Lines moves are ranked, the rest are searched with a window that
+        only asks whether they beat the weakest of them. Only a strictly better move displaces a
+        ranked one, so ties keep the previous depth's order."""
+        if MaxDepth is None:
+            MaxDepth = self.DepthLimit
+        if self.StartTime is None:
+            self.StartTime = time.time()
+        Maximizing = Player == 'B'
+        RootMoves = self.GetAllMoves(BoardState, Player)
+        RootKey = HashBoard(BoardState, Player)
+
+        for Depth in range(MinDepth, MaxDepth + 1):
+            Scored = []  # (Score, Move) of the moves currently in the top Lines, best first
+            for Move in RootMoves:
+                Alpha, Beta = -float('inf'), float('inf')
+                Edge = None
+                if len(Scored) >= Lines:
+                    Edge = Scored[-1][0]
+                    if Maximizing:
+                        Alpha = Edge
+                    else:
+                        Beta = Edge
+                MoveValue = self.SearchChild(BoardState, RootKey, Move, Depth, Alpha, Beta, Maximizing, 0)
+                if MoveValue is None:
+                    return  # Out of time: the current depth is incomplete
+                if Edge is None or (MoveValue > Edge if Maximizing else MoveValue < Edge):
+                    # The sort is stable and moves arrive in the previous ranking, so earlier moves win ties
+                    Scored.append((MoveValue, Move))
+                    Scored.sort(key=lambda Item: Item[0], reverse=Maximizing)
+                    del Scored[Lines:]
+
+            # Best lines first at the next depth; the remaining moves keep their previous order
+            Ranked = [Move for _, Move in Scored]
+            RootMoves = Ranked + [Move for Move in RootMoves if Move not in Ranked]
+            yield [AnalysisLine(Depth, Move, Score, self.PrincipalVariation(BoardState, Player, Move, Depth))
+                   for Score, Move in Scored]
+
+    def PrincipalVariation(self, BoardState, Player, Move, Depth):
+        """Follows stored best moves from the position after Move, for at most Depth plies in total."""
+        Variation = [Move]
+        BoardState = self.MakeMove(BoardState, Move)
+        Player = 'B' if Player == 'W' else 'W'
+        Seen = set()
+        while len(Variation) < Depth:
+            Key = HashBoard(BoardState, Player)
+            Entry = self.TranspositionTable.get(Key)
+            if Key in Seen or Entry is None or Entry[3] is None:
+                break
+            Seen.add(Key)
+            Variation.append(MoveTuples[Entry[3]])
+            BoardState = self.MakeMove(BoardState, MoveTuples[Entry[3]])
+            Player = 'B' if Player == 'W' else 'W'
+        return Variation
+
+    def Evaluate(self, BoardState):
+        """Scores a leaf with the Evaluator if one is set, else with Heuristic."""
+        if self.Evaluator is None:
+            return self.Heuristic(BoardState)
+        return self.Evaluator.Evaluate(BoardState)
 
     def Heuristic(self, BoardState):
         """Evaluates the board by counting the difference between black and white pieces."""
@@ -91,28 +397,8 @@ class SearchToolBox:
         return BlackPieces - WhitePieces
 
     def GetAllMoves(self, BoardState, Player):
-        """Returns all valid moves for the given player, including capturing moves."""
-        MovesList = []
-        for X in range(8):
-            for Y in range(8):
-                Piece = BoardState[X][Y]
-                if Piece == ' ' or (Player == 'W' and Piece not in ('W', 'WK')) or (Player == 'B' and Piece not in ('B', 'BK')):
-                    continue  # Skip empty squares and opponent's pieces
-
-                Directions = [(1, -1), (1, 1)] if Piece == 'W' else [(-1, -1), (-1, 1)]
-                if Piece in ('WK', 'BK'):
-                    Directions += [(-1, -1), (-1, 1), (1, -1), (1, 1)]  # Kings move in all directions
-
-                for DX, DY in Directions:
-                    NX, NY = X + DX, Y + DY
-                    if 0 <= NX < 8 and 0 <= NY < 8 and BoardState[NX][NY] == ' ':
-                        MovesList.append((X, Y, NX, NY))
-
-                    JX, JY = X + 2 * DX, Y + 2 * DY
-                    if 0 <= JX < 8 and 0 <= JY < 8 and 0 <= NX < 8 and 0 <= NY < 8:
-                        if BoardState[NX][NY] not in (' ', Piece) and BoardState[JX][JY] == ' ':
-                            MovesList.append((X, Y, JX, JY))  # Include jumps
-        return MovesList
+        """Returns all legal moves for the given player; if any capture exists, only the captures."""
+        return [MoveTuples[Move] for Move in LegalMoves(BoardState, Player)[0]]
 
     def MakeMove(self, BoardState, Move):
         """Executes a move and returns the new board state."""
@@ -129,7 +415,5 @@ class SearchToolBox:
         return NewBoardState
 
     def IsGameOver(self, BoardState):
-        """Determines if the game is over (one side has no pieces left)."""
-        WhitePieces = sum(row.count('W') for row in BoardState)
-        BlackPieces = sum(row.count('B') for row in BoardState)
-        return WhitePieces == 0 or BlackPieces == 0
+        """Determines if the game is over (one side has no legal moves left)."""
+        return not (HasLegalMoves(BoardState, 'W') and HasLegalMoves(BoardState, 'B'))
@@ -0,0 +1,33 @@
+import random
+
+# One random 64-bit key per (piece, square) plus one for the side to move.
+# A fixed seed keeps hashes identical across processes and runs.
+_Random = random.Random(20250217)
+PieceKeys = {Piece: [[_Random.getrandbits(64) for _ in range(8)] for _ in range(8)]
+             for Piece in ('W', 'WK', 'B', 'BK')}
+BlackToMoveKey = _Random.getrandbits(64)
+
+
+def HashBoard(BoardState, Player):
+    """Returns the Zobrist hash of a board with Player ('W' or 'B') to move."""
+    Key = BlackToMoveKey if Player == 'B' else 0
+    for X in range(8):
+        Row = BoardState[X]
+        for Y in range(8):
+            Piece = Row[Y]
+            if Piece != ' ':
+                Key ^= PieceKeys[Piece][X][Y]
+    return Key
+
+
+def HashAfterMove(Key, BoardState, Move):
+    """Returns the hash after Move is played on BoardState the way SearchToolBox.MakeMove plays it.
+
+    Key is the hash of BoardState; only the squares the move touches are updated."""
+    X1, Y1, X2, Y2 = Move
+    MoverKeys = PieceKeys[BoardState[X1][Y1]]
+    Key ^= MoverKeys[X1][Y1] ^ MoverKeys[X2][Y2] ^ BlackToMoveKey
+    if abs(X2 - X1) == 2:
+        CapturedX, CapturedY = (X1 + X2) // 2, (Y1 + Y2) // 2
+        Key ^= PieceKeys[BoardState[CapturedX][CapturedY]][CapturedX][CapturedY]
+    return Key
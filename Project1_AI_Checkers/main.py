@@ -1,14 +1,17 @@
 from PlayingTheGame import GameLoop
-from CheckersGUI import CheckersGUI
 from GameBoard import GameBoard
-import turtle
+
+def OpenWindow(Board):
+    """Creates the game window; turtle (and Tk) are only imported once a window is requested."""
+    from CheckersGUI import CheckersGUI
+    return CheckersGUI(Board)
 
 def Main():
     """Initializes and starts the checkers game."""
     Board = GameBoard()
-    GUI = CheckersGUI(Board)
+    GUI = OpenWindow(Board)
     GameLoop(Board, GUI)
-    turtle.done()
+    GUI.MainLoop()
 
 if __name__ == "__main__":
     Main()
\ No newline at end of file
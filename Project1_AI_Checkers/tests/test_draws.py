@@ -0,0 +1,48 @@
+import PlayingTheGame
+from GameBoard import GameBoard
+from SearchToolBox import SearchToolBox
+from Zobrist import HashBoard
+
+
+def KingsOnly():
+    """White king in the top right corner, Black king in the bottom left one; kings do not count in Heuristic."""
+    Board = GameBoard()
+    Board.BoardState = [[' ' for _ in range(8)] for _ in range(8)]
+    Board.BoardState[0][7], Board.BoardState[7][0] = 'WK', 'BK'
+    Board.ResetHistory('W')
+    return Board
+
+
+class SilentGUI:
+    def __init__(self):
+        self.Clicks = []
+
+    def Refresh(self):
+        pass
+
+
+def test_threefold_repetition_ends_the_game_loop(monkeypatch, capsys):
+    # The human shuffles the king out of its corner and back; every bot move scores 0, so the bot does the same
+    HumanMoves = iter([(0, 7, 1, 6), (1, 6, 0, 7)] * 3)
+    monkeypatch.setattr(PlayingTheGame, "GetHumanMove", lambda GUI: next(HumanMoves))
+    Board = KingsOnly()
+    PlayingTheGame.GameLoop(Board, SilentGUI())
+    assert Board.IsDraw()
+    assert Board.History.Occurrences(HashBoard(Board.BoardState, 'W')) == 3
+    assert "Draw!" in capsys.readouterr().out
+
+
+def test_search_scores_a_repeating_line_as_a_draw():
+    Board = KingsOnly()
+    Board.ResetHistory('B')
+    # Both kings have one move each; the position after them was already played
+    Repeated = [Row[:] for Row in Board.BoardState]
+    Repeated[0][7], Repeated[1][6], Repeated[7][0], Repeated[6][1] = ' ', 'WK', ' ', 'BK'
+    Board.History.Push(HashBoard(Repeated, 'B'), False)
+
+    Toolbox = SearchToolBox()
+    Toolbox.TimeLimit = float('inf')
+    Toolbox.History = Board.History
+    Toolbox.DrawScore = 3  # Distinct from every heuristic score here
+    assert Toolbox.SearchBestMove(Board.BoardState, 'B', 4) == ((7, 0, 6, 1), 3, True)
+    assert len(Board.History.Keys) == 2  # The search leaves the game history as it found it
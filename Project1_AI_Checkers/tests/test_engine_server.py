@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from EngineServer import EngineServer
+
+
+async def Serve(Server, Text, Output, Until):
+    """Feeds Text in one burst, then waits until Until(Output) holds."""
+    Reader = asyncio.StreamReader()
+    Reader.feed_data(Text.encode())
+    Reader.feed_eof()
+    await Server.ServeStream(Reader, Output.append)
+    Deadline = time.time() + 30
+    while not Until(Output) and time.time() < Deadline:
+        await asyncio.sleep(0.01)
+
+
+def BestMoves(Output):
+    return [Line for Line in Output if Line.startswith("bestmove")]
+
+
+def test_stop_before_the_search_starts_still_reports_and_frees_the_session():
+    async def Run():
+        Server = EngineServer(Workers=1)
+        try:
+            Output = []
+            await Serve(Server, "go g4 depth 2\nstop g4\n", Output, lambda Lines: BestMoves(Lines))
+            assert len(BestMoves(Output)) == 1
+            assert Server.Sessions["g4"].SearchTask is None
+
+            Output.clear()
+            await Serve(Server, "go g4 depth 2\n", Output, lambda Lines: BestMoves(Lines))
+            assert not [Line for Line in Output if Line.startswith("error")]
+            assert len(BestMoves(Output)) == 1
+        finally:
+            Server.Close()
+
+    asyncio.run(Run())
+
+
+def test_stop_reaches_the_worker():
+    async def Run():
+        Server = EngineServer(Workers=1)
+        try:
+            Output = []
+            await Serve(Server, "go g1 depth 40 movetime 60\n", Output, lambda Lines: any("depth 1" in Line for Line in Lines))
+            Started = time.time()
+            await Serve(Server, "stop g1\ngo g2 depth 1\n", Output, lambda Lines: len(BestMoves(Lines)) == 2)
+            # g2 shares the single worker, so it only finishes once the stopped g1 job has returned
+            assert len(BestMoves(Output)) == 2
+            assert time.time() - Started < 10
+        finally:
+            Server.Close()
+
+    asyncio.run(Run())
@@ -0,0 +1,46 @@
+import pytest
+
+from Benchmark import BuildSuite, LateMoveReductions, PlayMatch
+from NeuralEvaluator import NeuralEvaluator
+from RulesKernel import LegalMoves
+from SearchToolBox import SearchToolBox
+from Zobrist import HashBoard
+
+
+class PerLeafEvaluator:
+    """Wraps a network so every leaf is scored with its own Evaluate call."""
+
+    def __init__(self, Network):
+        self.Network = Network
+
+    def Evaluate(self, BoardState):
+        return self.Network.Evaluate(BoardState)
+
+    def EvaluateBatch(self, Boards):
+        return [self.Network.Evaluate(BoardState) for BoardState in Boards]
+
+
+def test_batched_frontier_equals_per_leaf_evaluation():
+    Network = NeuralEvaluator.MaterialWeights(Seed=3)
+    for BoardState, Player in BuildSuite(10, Seed=5):
+        Toolbox = SearchToolBox(Evaluator=Network)
+        Key = HashBoard(BoardState, Player)
+        Moves = LegalMoves(BoardState, Player, Key)[0]
+        Maximizing = Player == 'B'
+        Leaves = [Network.Evaluate(Toolbox.MakeMove(BoardState, Move))
+                  for Move in Toolbox.GetAllMoves(BoardState, Player)]
+        Expected = max(Leaves) if Maximizing else min(Leaves)
+        assert Toolbox.EvaluateFrontier(BoardState, Key, Moves, Maximizing) == pytest.approx(Expected, abs=1e-5)
+
+        Batched, PerLeaf = SearchToolBox(Evaluator=Network), SearchToolBox(Evaluator=PerLeafEvaluator(Network))
+        for Engine in (Batched, PerLeaf):
+            Engine.TimeLimit = float('inf')
+            Engine.UseLateMoveReductions = False
+        assert Batched.SearchBestMove(BoardState, Player, 3)[1] == \
+            pytest.approx(PerLeaf.SearchBestMove(BoardState, Player, 3)[1], abs=1e-5)
+
+
+def test_match_plays_every_opening_with_both_colours():
+    Wins, Draws, Losses = PlayMatch(LateMoveReductions, LateMoveReductions, BuildSuite(2, Seed=1), 2, MaxPlies=40)
+    assert Wins + Draws + Losses == 4
+    assert Wins == Losses  # Identical engines replay the same game with the colours swapped
@@ -0,0 +1,40 @@
+import pytest
+
+from GameBoard import GameBoard
+from OtherStuff import convert_move_to_notation, convert_notation_to_move
+
+StandardOpening = '[FEN "B:W21,22,23,24,25,26,27,28,29,30,31,32:B1,2,3,4,5,6,7,8,9,10,11,12"]'
+
+
+def test_standard_opening_loads_as_initial_board():
+    Board = GameBoard()
+    assert Board.LoadPdn(StandardOpening) == 'B'
+    assert Board.BoardState == GameBoard().BoardState
+
+
+def test_ranges_match_listed_squares():
+    Listed, Ranged = GameBoard(), GameBoard()
+    Listed.LoadPdn(StandardOpening)
+    Ranged.LoadPdn("B:W21-32:B1-12")
+    assert Ranged.BoardState == Listed.BoardState
+
+
+def test_kings_and_invalid_squares():
+    Board = GameBoard()
+    Board.LoadPdn("W:WK1:B32")
+    Kings = [(Row, Col) for Row in range(8) for Col in range(8) if Board.BoardState[Row][Col] == 'WK']
+    assert Kings == [(7, 6)]  # Square 1 is on Black's home row
+    for Text in ("W:W33:B1", "W:W12-9:B1", "W:W1-2-3:B4"):
+        with pytest.raises(ValueError):
+            Board.LoadPdn(Text)
+
+
+def test_move_notation_round_trip():
+    Board = GameBoard()
+    Moves = {convert_move_to_notation((X1, Y1, X2, Y2))
+             for X1 in range(8) for Y1 in range(8) if Board.BoardState[X1][Y1] == 'B'
+             for X2, Y2 in Board.GetValidMoves(X1, Y1)}
+    assert Moves == {"9-13", "9-14", "10-14", "10-15", "11-15", "11-16", "12-16"}
+    for Text in Moves:
+        assert convert_move_to_notation(convert_notation_to_move(Text)) == Text
+    assert convert_move_to_notation(convert_notation_to_move("15x22")) == "15x22"
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from GameBoard import GameBoard
+from RulesKernel import EncodeMove, GenerateLegalMoves, LegalMoves, MoveCache, MoveTuples
+from SearchToolBox import SearchToolBox
+
+
+def RandomBoard(Random):
+    """Returns a board with random men and kings on the dark squares; men never stand on their crowning row."""
+    Board = [[' ' for _ in range(8)] for _ in range(8)]
+    for Row in range(8):
+        for Col in range(8):
+            if (Row + Col) % 2 == 1 and Random.random() < 0.35:
+                Piece = Random.choice(('W', 'B', 'WK', 'BK'))
+                if (Piece, Row) not in (('W', 7), ('B', 0)):
+                    Board[Row][Col] = Piece
+    return Board
+
+
+def ReferenceMoves(BoardState, Player):
+    """Plain tuple move generator: every piece and direction tried in turn, captures compulsory."""
+    Quiets, Captures = [], []
+    for X in range(8):
+        for Y in range(8):
+            Piece = BoardState[X][Y]
+            if Piece == ' ' or Piece[0] != Player:
+                continue
+            if Piece in ('WK', 'BK'):
+                Directions = [(1, -1), (1, 1), (-1, -1), (-1, 1)]
+            else:
+                Directions = [(1, -1), (1, 1)] if Piece == 'W' else [(-1, -1), (-1, 1)]
+            for DX, DY in Directions:
+                NX, NY, JX, JY = X + DX, Y + DY, X + 2 * DX, Y + 2 * DY
+                if not (0 <= NX < 8 and 0 <= NY < 8):
+                    continue
+                if BoardState[NX][NY] == ' ':
+                    Quiets.append((X, Y, NX, NY))
+                elif BoardState[NX][NY][0] != Player and 0 <= JX < 8 and 0 <= JY < 8 and BoardState[JX][JY] == ' ':
+                    Captures.append((X, Y, JX, JY))
+    return Captures or Quiets
+
+
+def ReferenceMinimax(Toolbox, BoardState, Depth, Maximizing):
+    """Full-width minimax over ReferenceMoves with the toolbox's leaf evaluation."""
+    Moves = ReferenceMoves(BoardState, 'B' if Maximizing else 'W')
+    if Depth == 0 or not Moves:
+        return Toolbox.Evaluate(BoardState)
+    Values = [ReferenceMinimax(Toolbox, Toolbox.MakeMove(BoardState, Move), Depth - 1, not Maximizing)
+              for Move in Moves]
+    return max(Values) if Maximizing else min(Values)
+
+
+def test_encoded_moves_match_the_tuple_generator():
+    Random = random.Random(28)
+    for _ in range(300):
+        Board = RandomBoard(Random)
+        for Player in ('W', 'B'):
+            Moves, AreCaptures = LegalMoves(Board, Player)
+            Expected = ReferenceMoves(Board, Player)
+            assert sorted(MoveTuples[Move] for Move in Moves) == sorted(Expected)
+            assert all(EncodeMove(MoveTuples[Move]) == Move for Move in Moves)
+            assert AreCaptures == any(abs(X2 - X1) == 2 for X1, _, X2, _ in Expected)
+
+
+def test_per_ply_buffers_do_not_leak_between_nodes():
+    Random = random.Random(29)
+    Toolbox = SearchToolBox()
+    Toolbox.TimeLimit = float('inf')
+    Toolbox.UseLateMoveReductions = False  # Reductions may change the value; only the buffers are under test
+    for _ in range(40):
+        Board = RandomBoard(Random)
+        Toolbox.NewGame()
+        for Maximizing in (True, False):
+            # The same toolbox and buffers serve every search, so a leak would show up as a wrong value
+            Value = Toolbox.AlphaBeta(Board, 3, -float('inf'), float('inf'), Maximizing)
+            assert Value == ReferenceMinimax(Toolbox, Board, 3, Maximizing)
+            Player = 'B' if Maximizing else 'W'
+            assert sorted(MoveTuples[Move] for Move in LegalMoves(Board, Player)[0]) == \
+                sorted(ReferenceMoves(Board, Player))
+
+
+def BoardWith(Pieces):
+    """Returns a GameBoard holding only Pieces, a {(Row, Col): Piece} mapping."""
+    Board = GameBoard()
+    Board.BoardState = [[Pieces.get((Row, Col), ' ') for Col in range(8)] for Row in range(8)]
+    return Board
+
+
+def test_captures_are_forced():
+    Board = BoardWith({(2, 1): 'W', (3, 2): 'B', (2, 5): 'W'})
+    Moves, AreCaptures = LegalMoves(Board.BoardState, 'W')
+    assert AreCaptures
+    assert [MoveTuples[Move] for Move in Moves] == [(2, 1, 4, 3)]
+    assert Board.GetValidMoves(2, 5) == []
+    assert not Board.MovePiece(2, 5, 3, 4)
+    assert Board.MovePiece(2, 1, 4, 3) is True
+    assert Board.BoardState[3][2] == ' '
+
+
+def test_a_king_keeps_jumping():
+    Board = BoardWith({(2, 1): 'WK', (3, 2): 'B', (5, 4): 'B', (0, 7): 'B'})
+    assert Board.MovePiece(2, 1, 4, 3) == "JumpContinued"
+    assert Board.GetValidMoves(4, 3) == [(6, 5)]
+    assert Board.MovePiece(4, 3, 6, 5) is True
+    assert Board.BoardState[6][5] == 'WK'
+    assert sum(Row.count('B') for Row in Board.BoardState) == 1
+
+
+def test_men_are_crowned_on_the_far_row():
+    Board = BoardWith({(6, 1): 'W', (1, 2): 'B'})
+    assert Board.MovePiece(6, 1, 7, 0) is True
+    assert Board.MovePiece(1, 2, 0, 1) is True
+    assert (Board.BoardState[7][0], Board.BoardState[0][1]) == ('WK', 'BK')
+    assert sorted(MoveTuples[Move] for Move in LegalMoves(Board.BoardState, 'W')[0]) == [(7, 0, 6, 1)]
+
+
+def test_cached_moves_equal_a_fresh_scan_and_cannot_be_changed():
+    Random = random.Random(33)
+    for _ in range(50):
+        Board = RandomBoard(Random)
+        First = LegalMoves(Board, 'B')
+        Hits = MoveCache.Hits
+        Cached = LegalMoves(Board, 'B')
+        assert MoveCache.Hits == Hits + 1
+        assert Cached is First
+        assert Cached == GenerateLegalMoves(Board, 'B')
+        assert isinstance(Cached, tuple) and isinstance(Cached[0], tuple)
+        with pytest.raises(TypeError):
+            Cached[0][:0] = (0,)
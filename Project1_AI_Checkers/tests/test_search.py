@@ -0,0 +1,138 @@
+import random
+
+from GameBoard import GameBoard
+from SearchToolBox import ExactBound, SearchToolBox
+from Zobrist import HashBoard
+
+
+def RandomPositions(Count, Plies=16, Seed=7):
+    """Returns (BoardState, Player) pairs reached by random play from the opening."""
+    Random = random.Random(Seed)
+    Toolbox = SearchToolBox()
+    Positions = []
+    while len(Positions) < Count:
+        BoardState, Player = GameBoard().BoardState, 'W'
+        for _ in range(Random.randrange(Plies)):
+            Moves = Toolbox.GetAllMoves(BoardState, Player)
+            if not Moves:
+                break
+            BoardState = Toolbox.MakeMove(BoardState, Random.choice(Moves))
+            Player = 'B' if Player == 'W' else 'W'
+        if Toolbox.GetAllMoves(BoardState, Player):
+            Positions.append((BoardState, Player))
+    return Positions
+
+
+def UnlimitedToolbox(**Options):
+    """A toolbox whose searches are never cut short by the clock."""
+    Toolbox = SearchToolBox(**Options)
+    Toolbox.TimeLimit = float('inf')
+    return Toolbox
+
+
+def test_warm_table_gives_the_same_result_as_a_fresh_toolbox():
+    for BoardState, Player in RandomPositions(12):
+        Fresh = UnlimitedToolbox()
+        Fresh.UseLateMoveReductions = False  # Reductions follow the history table, which a warm toolbox has filled
+        Expected = Fresh.SearchBestMove(BoardState, Player, 5)[:2]
+        for WarmDepth in (4, 5):
+            Warm = UnlimitedToolbox()
+            Warm.UseLateMoveReductions = False
+            Warm.SearchBestMove(BoardState, Player, WarmDepth)
+            Warm.NewSearch()
+            assert Warm.TranspositionTable
+            assert Warm.SearchBestMove(BoardState, Player, 5)[:2] == Expected
+            if WarmDepth == 5:
+                assert Warm.TableHits > 0
+
+
+def test_aged_entries_are_replaced():
+    Toolbox = UnlimitedToolbox()
+    Toolbox.StoreEntry(1, 5, 3, -float('inf'), float('inf'), None)
+    Toolbox.StoreEntry(1, 2, 4, -float('inf'), float('inf'), None)
+    assert Toolbox.TranspositionTable[1][:3] == (5, 3, ExactBound)  # Same search: the deeper entry stays
+
+    Toolbox.NewSearch()
+    Toolbox.StoreEntry(1, 2, 4, -float('inf'), float('inf'), None)
+    assert Toolbox.TranspositionTable[1] == (2, 4, ExactBound, None, Toolbox.Generation)
+
+
+def test_stale_entries_are_purged_once_the_table_is_full():
+    Toolbox = UnlimitedToolbox()
+    Toolbox.MaxTableEntries = 1
+    Toolbox.StoreEntry(1, 1, 0, -float('inf'), float('inf'), None)
+    Toolbox.NewSearch()
+    Toolbox.StoreEntry(2, 1, 0, -float('inf'), float('inf'), None)
+    Toolbox.NewSearch()  # Entry 1 was written two searches ago, entry 2 during the last one
+    assert set(Toolbox.TranspositionTable) == {2}
+
+
+def test_late_move_reductions_keep_the_value_on_fixed_positions():
+    Reductions = 0
+    for BoardState, Player in RandomPositions(12):
+        Plain = UnlimitedToolbox()
+        Plain.UseLateMoveReductions = False
+        Reduced = UnlimitedToolbox()
+        assert Reduced.SearchBestMove(BoardState, Player, 5)[1] == Plain.SearchBestMove(BoardState, Player, 5)[1]
+        Reductions += Reduced.Reductions
+    assert Reductions > 0
+
+
+def test_unreduced_null_window_searches_are_exact():
+    ReSearches = 0
+    for BoardState, Player in RandomPositions(20, Plies=24, Seed=3):
+        Plain = UnlimitedToolbox()
+        Plain.UseLateMoveReductions = False
+        Reduced = UnlimitedToolbox()
+        Reduced.ReductionPlies = 0
+        assert Reduced.SearchBestMove(BoardState, Player, 5)[:2] == Plain.SearchBestMove(BoardState, Player, 5)[:2]
+        ReSearches += Reduced.ReSearches
+    assert ReSearches > 0
+
+
+def test_fail_high_triggers_a_re_search():
+    Toolbox = UnlimitedToolbox()
+    Toolbox.ReductionMinDepth = 99  # Only the call below reduces, not the searches inside it
+    BoardState = Toolbox.MakeMove(GameBoard().BoardState, (2, 1, 3, 0))  # White has moved; Black to move
+    Key = HashBoard(BoardState, 'B')
+    Plain = UnlimitedToolbox()
+    Plain.UseLateMoveReductions = False
+    Expected = Plain.AlphaBeta(BoardState, 3, -100, 100, True)
+
+    # White's move only has to stay below Beta to beat the best move so far: the reduced try fails high
+    assert Toolbox.ReducedSearch(BoardState, Key, 4, -100, 100, False, 0) == Expected
+    assert (Toolbox.Reductions, Toolbox.ReSearches) == (1, 1)
+
+    # Nothing stays below Beta = -100, so the reduced try fails low and stands
+    Toolbox.NewGame()
+    Toolbox.ReducedSearch(BoardState, Key, 4, -200, -100, False, 0)
+    assert (Toolbox.Reductions, Toolbox.ReSearches) == (1, 0)
+
+
+def test_analysis_lists_at_most_lines_moves_with_the_best_scores():
+    for BoardState, Player in RandomPositions(8, Plies=24, Seed=3):
+        Toolbox = UnlimitedToolbox()
+        Toolbox.UseLateMoveReductions = False
+        for Lines in Toolbox.Analyse(BoardState, Player, MaxDepth=4, Lines=2):
+            Depth = Lines[0].Depth
+            assert len(Lines) <= 2
+            # Each move scored on its own with the full window, on fresh tables
+            Single = UnlimitedToolbox()
+            Single.UseLateMoveReductions = False
+            Key = HashBoard(BoardState, Player)
+            Scores = sorted((Single.SearchChild(BoardState, Key, Move, Depth, -float('inf'), float('inf'),
+                                                Player == 'B', 0)
+                             for Move in Single.GetAllMoves(BoardState, Player)), reverse=Player == 'B')
+            assert [Line.Score for Line in Lines] == Scores[:2]
+
+
+def test_analysis_ties_keep_the_previous_ranking():
+    BoardState = GameBoard().BoardState
+    Toolbox = UnlimitedToolbox()
+    RootMoves = Toolbox.GetAllMoves(BoardState, 'W')
+    Ranking = None
+    for Lines in Toolbox.Analyse(BoardState, 'W', MaxDepth=3, Lines=3):
+        Moves = [Line.Move for Line in Lines]
+        assert all(Line.Score == 0 for Line in Lines)  # Nothing can be won this early
+        assert Moves == (RootMoves[:3] if Ranking is None else Ranking)
+        Ranking = Moves
@@ -20,6 +20,9 @@ setup(
         "scipy>=1.12.0",
         "openpyxl>=3.1.2"
     ],
+    extras_require={
+        "trade": ["pyarrow>=14.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "cubesat-analyzer=cubesat_budget_analyzer.__main__:main",
@@ -288,6 +288,13 @@ class MainWindow(QMainWindow):
                 "link_budget": self.link_budget_tab.get_data(),
                 "data_budget": self.data_budget_tab.get_data()
             }
+            invalid = [f"{title}: {section['error']}"
+                       for title, section in (("Link budget", data["link_budget"]), ("Data budget", data["data_budget"]))
+                       if "error" in section]
+            if invalid:
+                QMessageBox.warning(self, "Invalid Inputs",
+                                    "Fix these inputs before exporting a report:\n" + "\n".join(invalid))
+                return
             
             if format == "pdf":
                 filename, _ = QFileDialog.getSaveFileName(
@@ -0,0 +1,125 @@
+"""Embedded matplotlib plots that update by blitting."""
+
+import numpy as np
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+def decimate_minmax(x, y, buckets):
+    """Keep the minimum and maximum of y in each of buckets equal slices, in their original order.
+
+    A line drawn through the result is indistinguishable from the full series at a width of
+    buckets pixels, so millions of points shrink to 2 * buckets before drawing."""
+    n = len(y)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, y
+    size = n // buckets
+    trimmed = size * buckets
+    blocks = y[:trimmed].reshape(buckets, size)
+    starts = np.arange(buckets) * size
+    index = np.sort(np.column_stack((starts + np.nanargmin(blocks, axis=1),
+                                     starts + np.nanargmax(blocks, axis=1))), axis=1).ravel()
+    if trimmed < n:
+        tail = y[trimmed:]
+        index = np.concatenate((index, np.sort([trimmed + np.nanargmin(tail), trimmed + np.nanargmax(tail)])))
+    return x[index], y[index]
+
+class BlitPlot(FigureCanvasQTAgg):
+    """A single-axes plot whose lines are redrawn by blitting over a cached background.
+
+    Lines are animated artists: set_series only restores the cached background, redraws the
+    lines and blits. The whole figure is redrawn only when the axes limits have to change,
+    which happens when data leave the current limits or shrink to a small part of them."""
+
+    BACKGROUND = "#1e1e1e"
+    FOREGROUND = "#a0a0a0"
+    PADDING = 0.05  # Fraction of the data span added around it when the limits change
+    SHRINK_BELOW = 0.5  # Refit when the data span falls below this fraction of the axes span
+
+    def __init__(self, title, xlabel, ylabel, parent=None, logy=False, xlim=None, ylim=None):
+        self.figure = Figure(figsize=(5, 3), tight_layout=True, facecolor=self.BACKGROUND)
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.axes = self.figure.add_subplot(111, facecolor=self.BACKGROUND)
+        self.axes.set_title(title, color=self.FOREGROUND, fontsize=10)
+        self.axes.set_xlabel(xlabel, color=self.FOREGROUND)
+        self.axes.set_ylabel(ylabel, color=self.FOREGROUND)
+        self.axes.tick_params(colors=self.FOREGROUND)
+        self.axes.grid(True, color="#3d3d3d")
+        for spine in self.axes.spines.values():
+            spine.set_color("#3d3d3d")
+        if logy:
+            self.axes.set_yscale("log")
+        self.fixed_xlim = xlim
+        self.fixed_ylim = ylim
+        if xlim:
+            self.axes.set_xlim(*xlim)
+        if ylim:
+            self.axes.set_ylim(*ylim)
+        self.lines = {}
+        self.series = {}  # Full-resolution data, decimated again when the widget is resized
+        self.background = None
+        self.mpl_connect("draw_event", self.on_draw)
+
+    def add_line(self, name, **style):
+        """Add an empty animated line."""
+        line, = self.axes.plot([], [], animated=True, **style)
+        self.lines[name] = line
+        return line
+
+    def set_series(self, name, x, y):
+        """Replace the data of a line and update the plot."""
+        self.series[name] = (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        self.apply_series(name)
+        self.refresh()
+
+    def apply_series(self, name):
+        """Give a line its data, decimated to the canvas width."""
+        x, y = self.series[name]
+        buckets = max(int(self.width() * self.devicePixelRatioF()), 1)
+        self.lines[name].set_data(*decimate_minmax(x, y, buckets))
+
+    def refresh(self):
+        """Blit the lines, or redraw everything if the limits must change."""
+        if self.update_limits() or self.background is None:
+            self.draw()  # on_draw caches the new background and draws the lines
+            return
+        self.restore_region(self.background)
+        for line in self.lines.values():
+            self.axes.draw_artist(line)
+        self.blit(self.figure.bbox)
+
+    def update_limits(self):
+        """Fit the free axes to the data when needed; return whether the limits changed."""
+        changed = False
+        for axis, fixed, current, setter in (
+                (0, self.fixed_xlim, self.axes.get_xlim(), self.axes.set_xlim),
+                (1, self.fixed_ylim, self.axes.get_ylim(), self.axes.set_ylim)):
+            if fixed:
+                continue
+            values = [data[axis] for data in self.series.values() if len(data[axis])]
+            values = [v[np.isfinite(v)] for v in values]
+            values = [v for v in values if v.size]
+            if not values:
+                continue
+            low = min(float(v.min()) for v in values)
+            high = max(float(v.max()) for v in values)
+            span = high - low
+            outside = low < current[0] or high > current[1]
+            small = 0 < span < self.SHRINK_BELOW * (current[1] - current[0])
+            if outside or small:
+                pad = self.PADDING * span if span else 1.0
+                setter(low - pad, high + pad)
+                changed = True
+        return changed
+
+    def on_draw(self, event):
+        """Cache the background of a full redraw and draw the animated lines over it."""
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        for line in self.lines.values():
+            self.axes.draw_artist(line)
+
+    def resizeEvent(self, event):
+        """Re-decimate to the new width; the resize redraws the figure."""
+        super().resizeEvent(event)
+        for name in self.series:
+            self.apply_series(name)
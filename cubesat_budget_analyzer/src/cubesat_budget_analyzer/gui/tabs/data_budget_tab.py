@@ -4,7 +4,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                            QDoubleSpinBox, QMessageBox, QFileDialog,
                            QGroupBox, QPushButton, QLabel)
 from PyQt6.QtCore import Qt
-import math
+from ..plots import BlitPlot
+from ..workers import LiveCalculator
+from models.data_budget import DataBudgetCalculator, DataBudgetParams
+from models.storage_sim import simulate_data_budget
+import numpy as np
 
 class ParameterGroup(QGroupBox):
     """Custom group box for parameters."""
@@ -31,14 +35,17 @@ class DataBudgetTab(QWidget):
     """Tab for Data Budget Analysis calculations."""
     
     # Constants
-    BYTES_PER_MB = 1024 * 1024
-    SECONDS_PER_MINUTE = 60
-    SECONDS_PER_DAY = 86400
+    SIMULATION_DAYS = 14  # Length of the storage fill plot, simulated at one-second steps
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.init_ui()
+        self.defaults = self.settings()
+        self.live = LiveCalculator(self.collect_inputs, self.compute, self)
+        self.live.result_ready.connect(self.show_results)
+        self.live.error.connect(self.show_error)
+        self.connect_live_inputs()
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -55,6 +62,7 @@ class DataBudgetTab(QWidget):
         top_section.addWidget(params_widget, stretch=2)
         top_section.addWidget(results_group, stretch=1)
         main_layout.addLayout(top_section)
+        main_layout.addWidget(self.create_plots_section())
         
         # Buttons section
         main_layout.addStretch()
@@ -119,12 +127,22 @@ class DataBudgetTab(QWidget):
         self.results_widget = QWidget()
         self.results_layout = QFormLayout(self.results_widget)
         self.results_layout.setSpacing(15)
+        self.result_labels = []  # Labels and value widgets currently shown, reused while the labels stay the same
+        self.result_values = []
         results_layout.addWidget(self.results_widget)
         results_layout.addStretch()
         results_group.setLayout(results_layout)
         
         return results_group
     
+    def create_plots_section(self):
+        """Create the storage fill plot."""
+        self.storage_plot = BlitPlot("Storage Fill vs Time", "Time (days)", "Stored Data (GB)",
+                                     xlim=(0, self.SIMULATION_DAYS))
+        self.storage_plot.add_line("capacity", color="#f44336", linewidth=1)
+        self.storage_plot.add_line("fill", color="#4CAF50")
+        return self.storage_plot
+    
     def create_buttons_section(self):
         """Create the buttons section."""
         buttons_widget = QWidget()
@@ -205,40 +223,113 @@ class DataBudgetTab(QWidget):
         """)
         return spin_box
     
+    def connect_live_inputs(self):
+        """Recalculate in the background whenever an input changes."""
+        for spin_box in self.findChildren(QDoubleSpinBox):
+            spin_box.valueChanged.connect(self.live.request)
+    
     def calculate_data_budget(self):
-        """Calculate the data budget using actual input parameters."""
-        # Calculate daily data generation
-        daily_data_gen = self.payload_rate.value() * self.SECONDS_PER_DAY  # MB per day
-        
-        # Calculate daily data transmission capacity
-        transmission_time = (self.pass_duration.value() * self.SECONDS_PER_MINUTE * 
-                           self.passes_per_day.value())  # seconds per day
-        daily_transmission = self.downlink_rate.value() * transmission_time  # MB per day
-        
-        # Calculate storage requirements and margins
-        storage_capacity_mb = self.storage_capacity.value() * 1024  # Convert GB to MB
-        storage_margin = storage_capacity_mb - daily_data_gen
-        transmission_margin = daily_transmission - daily_data_gen
-        
-        # Display results
-        self.display_results([
-            ("Daily Data Generation", f"{daily_data_gen:.1f} MB/day"),
-            ("Daily Transmission Capacity", f"{daily_transmission:.1f} MB/day"),
-            ("Storage Utilization", f"{(daily_data_gen/storage_capacity_mb)*100:.1f}%"),
-            ("Storage Margin", f"{storage_margin:.1f} MB"),
-            ("Transmission Margin", f"{transmission_margin:.1f} MB/day")
-        ])
+        """Calculate the data budget now and warn about any shortfall."""
+        self.live.run_now(explicit=True)
+    
+    def collect_inputs(self):
+        """Read the input widgets into model parameters (GUI thread)."""
+        return DataBudgetParams(
+            data_rate_mbps=self.payload_rate.value(),
+            storage_capacity_gb=self.storage_capacity.value(),
+            downlink_rate_mbps=self.downlink_rate.value(),
+            pass_duration_min=self.pass_duration.value(),
+            passes_per_day=self.passes_per_day.value()
+        )
+    
+    @classmethod
+    def compute(cls, params):
+        """Calculate the data budget and storage simulation with the models layer (any thread, no widget access)."""
+        simulation = simulate_data_budget(params, cls.SIMULATION_DAYS)
+        days = np.arange(1, simulation.fill_gb.size + 1) * simulation.step_s * simulation.record_every / DataBudgetCalculator.SECONDS_PER_DAY
+        curves = {
+            "fill": (days, simulation.fill_gb),
+            "capacity": ([0, cls.SIMULATION_DAYS], [params.storage_capacity_gb] * 2)
+        }
+        return params, DataBudgetCalculator.calculate_cached(params), curves
+    
+    @staticmethod
+    def format_results(params, results):
+        """Result rows for the results panel."""
+        rows = [
+            ("Daily Data Generation", f"{results.daily_data_gb:.2f} GB/day"),
+            ("Daily Downlink Capacity", f"{results.daily_downlink_capacity_gb:.2f} GB/day"),
+            ("Storage Usage", f"{results.storage_usage_gb:.2f} GB "
+                              f"({results.storage_usage_gb / params.storage_capacity_gb:.1%})"),
+            ("Backlog", f"{results.backlog_gb:.2f} GB/day")
+        ]
+        if results.days_until_full is not None:
+            rows.append(("Days Until Storage Full", f"{results.days_until_full:.1f} days"))
+        return rows
+    
+    def show_results(self, result, explicit=False):
+        """Display a finished calculation (GUI thread); warning dialogs only answer an explicit Calculate."""
+        params, results, curves = result
+        self.display_results(self.format_results(params, results))
+        for name, series in curves.items():
+            self.storage_plot.set_series(name, *series)
         
         # Show warnings if needed
-        if storage_margin < 0:
+        if not explicit:
+            return
+        if results.daily_data_gb > params.storage_capacity_gb:
             QMessageBox.warning(self, "Storage Warning",
-                              f"Warning: Storage capacity insufficient by {abs(storage_margin):.1f} MB/day")
-        elif transmission_margin < 0:
+                              f"Warning: Storage capacity insufficient by "
+                              f"{results.daily_data_gb - params.storage_capacity_gb:.2f} GB/day")
+        elif results.storage_exceeded:
             QMessageBox.warning(self, "Transmission Warning",
-                              f"Warning: Cannot downlink all daily data. Deficit: {abs(transmission_margin):.1f} MB/day")
+                              f"Warning: Cannot downlink all daily data. Deficit: {results.backlog_gb:.2f} GB/day")
+    
+    def show_error(self, message, explicit=False):
+        """Report a failed calculation, with a dialog only for an explicit Calculate."""
+        self.display_results([("Error", message)])
+        if explicit:
+            QMessageBox.critical(self, "Error", f"Failed to calculate the data budget: {message}")
+    
+    def settings(self):
+        """Current widget values, by attribute name."""
+        return {name: widget.value() for name, widget in vars(self).items()
+                if isinstance(widget, QDoubleSpinBox)}
+    
+    def get_data(self):
+        """Inputs and results for saving and reports."""
+        params = self.collect_inputs()
+        results = DataBudgetCalculator.calculate_cached(params)
+        return {
+            "settings": self.settings(),
+            "daily_data_gb": results.daily_data_gb,
+            "daily_downlink_capacity_gb": results.daily_downlink_capacity_gb,
+            "storage_usage_gb": results.storage_usage_gb,
+            "backlog_gb": results.backlog_gb,
+            "storage_exceeded": results.storage_exceeded,
+            "days_until_full": results.days_until_full
+        }
+    
+    def set_data(self, data):
+        """Restore inputs saved by get_data."""
+        for name, value in data.get("settings", {}).items():
+            widget = getattr(self, name, None)
+            if isinstance(widget, QDoubleSpinBox):
+                widget.setValue(value)
+    
+    def clear_inputs(self):
+        """Reset every input to its default."""
+        self.set_data({"settings": self.defaults})
+        self.display_results([])
     
     def display_results(self, results):
         """Display the calculation results."""
+        # Live updates only change the values
+        if [label for label, _ in results] == self.result_labels:
+            for value_label, (_, value) in zip(self.result_values, results):
+                value_label.setText(value)
+            return
+
         # Clear previous results
         while self.results_layout.count():
             item = self.results_layout.takeAt(0)
@@ -246,6 +337,8 @@ class DataBudgetTab(QWidget):
                 item.widget().deleteLater()
         
         # Add new results
+        self.result_labels = [label for label, _ in results]
+        self.result_values = []
         for label_text, value in results:
             container = QWidget()
             container.setStyleSheet("QWidget { background-color: #1e1e1e; border-radius: 4px; }")
@@ -266,6 +359,7 @@ class DataBudgetTab(QWidget):
                 }
             """)
             layout.addWidget(value_label)
+            self.result_values.append(value_label)
             
             self.results_layout.addRow(container)
     
@@ -4,6 +4,13 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                            QLabel, QPushButton, QGroupBox, QComboBox,
                            QDoubleSpinBox, QMessageBox, QFileDialog)
 from PyQt6.QtCore import Qt
+from ..plots import BlitPlot
+from ..workers import LiveCalculator
+from models.link_budget import (LinkBudgetCalculator, LinkBudgetParams,
+                                ModulationScheme, PropagationModel)
+from models.pass_profile import elevation_sweep
+from dataclasses import fields
+import numpy as np
 import math
 
 class ParameterGroup(QGroupBox):
@@ -31,14 +38,19 @@ class LinkBudgetTab(QWidget):
     """Tab for Link Budget Analysis calculations."""
     
     # Constants
-    BOLTZMANN = 1.38e-23  # Boltzmann's constant
-    SPEED_OF_LIGHT = 3e8  # Speed of light in m/s
-    DEFAULT_ORBIT_HEIGHT = 500000  # Default LEO satellite height in meters
+    DEFAULT_ORBIT_HEIGHT_KM = 500  # Default LEO satellite height, used when no path loss is entered
+    PLOT_ELEVATIONS_DEG = np.linspace(0, 90, 901)
+    PLOT_EBN0_DB = np.linspace(-5, 40, 451)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.init_ui()
+        self.defaults = self.settings()
+        self.live = LiveCalculator(self.collect_inputs, self.compute, self)
+        self.live.result_ready.connect(self.show_results)
+        self.live.error.connect(self.show_error)
+        self.connect_live_inputs()
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -55,6 +67,7 @@ class LinkBudgetTab(QWidget):
         top_section.addWidget(params_widget, stretch=2)
         top_section.addWidget(results_group, stretch=1)
         main_layout.addLayout(top_section)
+        main_layout.addWidget(self.create_plots_section())
         
         # Buttons section
         main_layout.addStretch()
@@ -109,11 +122,19 @@ class LinkBudgetTab(QWidget):
         
         self.fspl = self.create_spin_box(0, 200, 0, " dB", "Free space path loss")
         self.atm_loss = self.create_spin_box(-50, 0, -0.5, " dB", "Atmospheric loss")
-        self.prop_model = self.create_combo_box(["AWGN"], "Select propagation model")
+        self.modulation = self.create_combo_box([m.value for m in ModulationScheme], "Select modulation scheme")
+        self.prop_model = self.create_combo_box([m.value for m in PropagationModel], "Select propagation model")
+        self.prop_model.currentTextChanged.connect(self.on_prop_model_changed)
+        self.rician_k = self.create_spin_box(-10, 30, 10, " dB", "Rician K-factor (direct to scattered power)")
+        self.shadowing_sigma = self.create_spin_box(0, 20, 4, " dB", "Log-normal shadowing standard deviation")
         
         channel_layout.addRow("Free Space Path Loss:", self.fspl)
         channel_layout.addRow("Atmospheric Loss:", self.atm_loss)
+        channel_layout.addRow("Modulation:", self.modulation)
         channel_layout.addRow("Propagation Model:", self.prop_model)
+        channel_layout.addRow("Rician K-Factor:", self.rician_k)
+        channel_layout.addRow("Shadowing Sigma:", self.shadowing_sigma)
+        self.on_prop_model_changed(self.prop_model.currentText())
         channel_group.setLayout(channel_layout)
         params_layout.addWidget(channel_group)
         
@@ -145,12 +166,34 @@ class LinkBudgetTab(QWidget):
         self.results_widget = QWidget()
         self.results_layout = QFormLayout(self.results_widget)
         self.results_layout.setSpacing(15)
+        self.result_labels = []  # Labels and value widgets currently shown, reused while the labels stay the same
+        self.result_values = []
         results_layout.addWidget(self.results_widget)
         results_layout.addStretch()
         results_group.setLayout(results_layout)
         
         return results_group
     
+    def create_plots_section(self):
+        """Create the margin and BER plots."""
+        plots_widget = QWidget()
+        plots_layout = QHBoxLayout(plots_widget)
+        plots_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.margin_plot = BlitPlot(f"Link Margin vs Elevation ({self.DEFAULT_ORBIT_HEIGHT_KM} km orbit)",
+                                    "Elevation (deg)", "Margin (dB)", xlim=(0, 90))
+        self.margin_plot.axes.axhline(0, color="#f44336", linewidth=1)
+        self.margin_plot.add_line("margin", color="#4CAF50")
+        
+        self.ber_plot = BlitPlot("BER vs Eb/N0", "Eb/N0 (dB)", "BER", logy=True,
+                                 xlim=(self.PLOT_EBN0_DB[0], self.PLOT_EBN0_DB[-1]), ylim=(1e-12, 1))
+        self.ber_plot.add_line("curve", color="#2196F3")
+        self.ber_plot.add_line("operating", color="#4CAF50", marker="o", linestyle="none")
+        
+        plots_layout.addWidget(self.margin_plot)
+        plots_layout.addWidget(self.ber_plot)
+        return plots_widget
+    
     def create_buttons_section(self):
         """Create the buttons section."""
         buttons_widget = QWidget()
@@ -251,41 +294,94 @@ class LinkBudgetTab(QWidget):
         """)
         return combo
     
+    def connect_live_inputs(self):
+        """Recalculate in the background whenever an input changes."""
+        for spin_box in self.findChildren(QDoubleSpinBox):
+            spin_box.valueChanged.connect(self.live.request)
+        for combo in self.findChildren(QComboBox):
+            combo.currentTextChanged.connect(self.live.request)
+    
     def calculate_link_budget(self):
-        """Calculate the link budget using actual input parameters."""
-        # Convert power to dBW
+        """Calculate the link budget now and warn about a low margin."""
+        self.live.run_now(explicit=True)
+    
+    def collect_inputs(self):
+        """Read the input widgets into model parameters (GUI thread)."""
         tx_power_val = self.tx_power.value()
-        tx_power_dbw = (10 * math.log10(tx_power_val) if self.tx_power_unit.currentText() == "W" 
-                       else tx_power_val - 30)
-        
-        # Calculate EIRP
-        eirp = tx_power_dbw + self.tx_gain.value()
-        
-        # Calculate path loss
-        freq_hz = self.get_frequency_hz()
-        fspl = (self.calculate_fspl(freq_hz) if self.fspl.value() == 0 
-               else self.fspl.value())
-        total_path_loss = fspl + self.atm_loss.value()
-        
-        # Calculate received power and noise
-        received_power = eirp - total_path_loss + self.rx_gain.value()
-        noise_factor = 10 * math.log10(self.BOLTZMANN * self.sys_temp.value())
-        
-        # Calculate C/N0 and Eb/N0
-        cn0 = received_power - noise_factor
-        ebn0 = cn0 - 10 * math.log10(self.bandwidth.value())
-        link_margin = ebn0 - self.required_ebn0.value()
-        
-        # Display results
-        self.display_results([
-            ("EIRP", f"{eirp:.1f} dBW"),
-            ("Path Loss", f"{total_path_loss:.1f} dB"),
-            ("Received Power", f"{received_power:.1f} dBW"),
-            ("C/N0", f"{cn0:.1f} dB-Hz"),
-            ("Link Margin", f"{link_margin:.1f} dB")
-        ])
+        if self.tx_power_unit.currentText() == "W" and tx_power_val <= 0:
+            raise ValueError("Transmit power must be positive")
+        tx_power_dbm = (10 * math.log10(tx_power_val * 1000) if self.tx_power_unit.currentText() == "W"
+                       else tx_power_val)
+        freq_ghz = self.get_frequency_hz() / 1e9
+        if freq_ghz <= 0:
+            raise ValueError("Frequency must be positive")
+        path_loss_db = (LinkBudgetCalculator.calculate_fspl(self.DEFAULT_ORBIT_HEIGHT_KM, freq_ghz)
+                        if self.fspl.value() == 0 else self.fspl.value())
+        
+        params = LinkBudgetParams(
+            tx_power_dbm=tx_power_dbm,
+            tx_gain_dbi=self.tx_gain.value(),
+            rx_gain_dbi=self.rx_gain.value(),
+            path_loss_db=float(path_loss_db),
+            atm_loss_db=abs(self.atm_loss.value()),  # Entered as a negative gain
+            sys_temp_k=self.sys_temp.value(),
+            bandwidth_hz=self.bandwidth.value(),
+            freq_ghz=freq_ghz,
+            modulation=ModulationScheme(self.modulation.currentText()),
+            propagation=PropagationModel(self.prop_model.currentText()),
+            required_ebn0_db=self.required_ebn0.value(),
+            rician_k_db=self.rician_k.value(),
+            shadowing_sigma_db=self.shadowing_sigma.value()
+        )
+        for field in fields(params):
+            value = getattr(params, field.name)
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ValueError(f"Invalid {field.name.replace('_', ' ')}: {value}")
+        return params
+    
+    @classmethod
+    def compute(cls, params):
+        """Calculate the link budget and plot data with the models layer (any thread, no widget access)."""
+        results = LinkBudgetCalculator.calculate_cached(params)
+        curves = {
+            "margin": (cls.PLOT_ELEVATIONS_DEG, elevation_sweep(
+                params, cls.DEFAULT_ORBIT_HEIGHT_KM, cls.PLOT_ELEVATIONS_DEG).link_margin_db),
+            "curve": (cls.PLOT_EBN0_DB, LinkBudgetCalculator.average_ber(
+                params.modulation, params.propagation, cls.PLOT_EBN0_DB,
+                params.rician_k_db, params.shadowing_sigma_db)),
+            "operating": ([results.link_margin_db + params.required_ebn0_db], [results.ber])
+        }
+        return params, results, curves
+    
+    @staticmethod
+    def format_results(params, results):
+        """Result rows for the results panel."""
+        eirp_dbm = params.tx_power_dbm + params.tx_gain_dbi
+        rows = [
+            ("EIRP", f"{eirp_dbm:.1f} dBm"),
+            ("Path Loss", f"{params.path_loss_db + params.atm_loss_db:.1f} dB"),
+            ("Received Power", f"{results.received_power_dbm:.1f} dBm"),
+            ("C/N0", f"{results.cnr_db + 10 * math.log10(params.bandwidth_hz):.1f} dB-Hz"),
+            ("C/N", f"{results.cnr_db:.1f} dB"),
+            ("Bit Error Rate", f"{results.ber:.2e}"),
+            ("Link Margin", f"{results.link_margin_db:.1f} dB")
+        ]
+        if params.propagation != PropagationModel.AWGN:
+            rows.append(("Outage Probability", f"{results.outage_probability:.2%}"))
+        return rows
+    
+    def show_results(self, result, explicit=False):
+        """Display a finished calculation (GUI thread); warning dialogs only answer an explicit Calculate."""
+        params, results, curves = result
+        self.display_results(self.format_results(params, results))
+        self.margin_plot.set_series("margin", *curves["margin"])
+        self.ber_plot.set_series("curve", *curves["curve"])
+        self.ber_plot.set_series("operating", *curves["operating"])
         
         # Show warnings if needed
+        if not explicit:
+            return
+        link_margin = results.link_margin_db
         if link_margin < 0:
             QMessageBox.warning(self, "Link Margin Warning",
                               f"Warning: Negative link margin ({link_margin:.1f} dB)")
@@ -293,14 +389,66 @@ class LinkBudgetTab(QWidget):
             QMessageBox.warning(self, "Link Margin Caution",
                               f"Caution: Low link margin ({link_margin:.1f} dB)")
     
-    def calculate_fspl(self, freq_hz):
-        """Calculate Free Space Path Loss."""
-        return (20 * math.log10(self.DEFAULT_ORBIT_HEIGHT) + 
-                20 * math.log10(freq_hz) + 
-                20 * math.log10(4 * math.pi / self.SPEED_OF_LIGHT))
+    def show_error(self, message, explicit=False):
+        """Report a failed calculation, with a dialog only for an explicit Calculate."""
+        self.display_results([("Error", message)])
+        if explicit:
+            QMessageBox.critical(self, "Error", f"Failed to calculate the link budget: {message}")
+    
+    def settings(self):
+        """Current widget values, by attribute name."""
+        values = {}
+        for name, widget in vars(self).items():
+            if isinstance(widget, QComboBox):
+                values[name] = widget.currentText()
+            elif isinstance(widget, QDoubleSpinBox):
+                values[name] = widget.value()
+        return values
+    
+    def get_data(self):
+        """Inputs and, when they are valid, results for saving and reports."""
+        data = {"settings": self.settings()}
+        try:
+            params, results, _ = self.compute(self.collect_inputs())
+        except (ValueError, ZeroDivisionError) as e:
+            data["error"] = str(e)  # Lets reports refuse invalid inputs explicitly
+            return data
+        data.update(
+            received_power_dbm=results.received_power_dbm,
+            cnr_db=results.cnr_db,
+            ber=results.ber,
+            link_margin_db=results.link_margin_db,
+            outage_probability=results.outage_probability,
+            warnings=list(results.warnings)
+        )
+        return data
+    
+    def set_data(self, data):
+        """Restore inputs saved by get_data."""
+        settings = data.get("settings", {})
+        # Units first, so the values are not converted after they are set
+        for name, value in settings.items():
+            widget = getattr(self, name, None)
+            if isinstance(widget, QComboBox):
+                widget.setCurrentText(value)
+        for name, value in settings.items():
+            widget = getattr(self, name, None)
+            if isinstance(widget, QDoubleSpinBox):
+                widget.setValue(value)
+    
+    def clear_inputs(self):
+        """Reset every input to its default."""
+        self.set_data({"settings": self.defaults})
+        self.display_results([])
     
     def display_results(self, results):
         """Display the calculation results."""
+        # Live updates only change the values
+        if [label for label, _ in results] == self.result_labels:
+            for value_label, (_, value) in zip(self.result_values, results):
+                value_label.setText(value)
+            return
+
         # Clear previous results
         while self.results_layout.count():
             item = self.results_layout.takeAt(0)
@@ -308,6 +456,8 @@ class LinkBudgetTab(QWidget):
                 item.widget().deleteLater()
         
         # Add new results
+        self.result_labels = [label for label, _ in results]
+        self.result_values = []
         for label_text, value in results:
             container = QWidget()
             container.setStyleSheet("QWidget { background-color: #1e1e1e; border-radius: 4px; }")
@@ -328,6 +478,7 @@ class LinkBudgetTab(QWidget):
                 }
             """)
             layout.addWidget(value_label)
+            self.result_values.append(value_label)
             
             self.results_layout.addRow(container)
     
@@ -345,6 +496,11 @@ class LinkBudgetTab(QWidget):
             self.tx_power.setValue(10 * math.log10(current_value * 1000))
         self.tx_power.setSuffix(f" {unit}")
     
+    def on_prop_model_changed(self, model):
+        """Enable the fading parameters the selected propagation model uses."""
+        self.rician_k.setEnabled(model == PropagationModel.RICIAN.value)
+        self.shadowing_sigma.setEnabled(model == PropagationModel.LOGNORMAL.value)
+    
     def on_freq_unit_changed(self, unit):
         """Handle frequency unit change between MHz and GHz."""
         current_value = self.freq_value.value()
@@ -398,6 +554,7 @@ class LinkBudgetTab(QWidget):
                     "Operating Frequency": f"{self.freq_value.value()} {self.freq_unit.currentText()}",
                     "Free Space Path Loss": f"{self.fspl.value()} dB",
                     "Atmospheric Loss": f"{self.atm_loss.value()} dB",
+                    "Modulation": self.modulation.currentText(),
                     "Propagation Model": self.prop_model.currentText()
                 },
                 "Receiver Parameters": {
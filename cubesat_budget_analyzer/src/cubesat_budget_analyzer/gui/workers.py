@@ -0,0 +1,98 @@
+"""Background calculation workers for live recalculation in the budget tabs."""
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+class WorkerSignals(QObject):
+    """Signals a CalculationWorker sends back to the GUI thread."""
+
+    finished = pyqtSignal(int, object)  # Generation, result
+    failed = pyqtSignal(int, str)  # Generation, error message
+    done = pyqtSignal(object)  # Sent last, whether the worker computed or was skipped; carries the signals
+
+class CalculationWorker(QRunnable):
+    """Runs one calculation on a thread pool thread."""
+
+    def __init__(self, generation, compute, inputs, is_current):
+        super().__init__()
+        self.generation = generation
+        self.compute = compute
+        self.inputs = inputs
+        self.is_current = is_current
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Compute unless a newer request has superseded this one while it was queued."""
+        try:
+            if not self.is_current(self.generation):
+                return
+            result = self.compute(self.inputs)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, result)
+        finally:
+            self.signals.done.emit(self.signals)
+
+class LiveCalculator(QObject):
+    """Debounced, off-thread recalculation with stale results discarded.
+
+    collect() runs on the GUI thread and returns plain inputs; compute(inputs) runs on a
+    QThreadPool thread and must not touch widgets. Every request bumps a generation
+    counter, so queued work for an older generation is skipped and results that arrive
+    after a newer request are dropped. Results and errors carry whether they answer an
+    explicit run_now(explicit=True), so a superseded explicit run never marks a later one."""
+
+    result_ready = pyqtSignal(object, bool)  # Result, explicit
+    error = pyqtSignal(str, bool)  # Error message, explicit
+
+    DEBOUNCE_MS = 150
+
+    def __init__(self, collect, compute, parent=None, pool=None):
+        super().__init__(parent)
+        self.collect = collect
+        self.compute = compute
+        self.pool = pool or QThreadPool.globalInstance()
+        self.generation = 0
+        self.explicit_generation = None  # Generation of the last explicit run_now
+        self.pending = set()  # Signals of started workers, kept alive until they report
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.run_now)
+
+    def request(self, *args):
+        """Schedule a recalculation once the inputs stop changing for DEBOUNCE_MS."""
+        self.generation += 1
+        self.timer.start()
+
+    def run_now(self, explicit=False):
+        """Collect the inputs and start the calculation immediately; explicit marks a user-requested run."""
+        self.timer.stop()
+        self.generation += 1
+        self.explicit_generation = self.generation if explicit else None
+        try:
+            inputs = self.collect()
+        except Exception as e:
+            self.error.emit(str(e), explicit)
+            return
+        worker = CalculationWorker(self.generation, self.compute, inputs, self.is_current)
+        worker.signals.finished.connect(self.on_finished)
+        worker.signals.failed.connect(self.on_failed)
+        worker.signals.done.connect(self.pending.discard)
+        self.pending.add(worker.signals)
+        self.pool.start(worker)
+
+    def is_current(self, generation):
+        """Whether generation is the latest request (read from worker threads)."""
+        return generation == self.generation
+
+    def on_finished(self, generation, result):
+        """Deliver a result unless a newer request has been made since."""
+        if self.is_current(generation):
+            self.result_ready.emit(result, generation == self.explicit_generation)
+
+    def on_failed(self, generation, message):
+        """Deliver an error unless a newer request has been made since."""
+        if self.is_current(generation):
+            self.error.emit(message, generation == self.explicit_generation)
+
@@ -0,0 +1,160 @@
+"""Adaptive coding and modulation (ACM) over satellite passes.
+
+Instead of one fixed ModulationScheme, the downlink switches at every ephemeris step to
+the most efficient mode whose Es/N0 threshold the link clears. Mode thresholds are sorted
+once, so the choice for every step of the mission is a single searchsorted over the
+time-resolved C/N0 of pass_profiles. With several stations, steps where passes overlap are
+merged first, keeping the station with the best C/N0, since one radio downlinks only once.
+Delivered volumes follow per contact window and per day, and the mean daily volume replaces
+the constant-rate downlink of DataBudgetCalculator:
+
+    profiles = [pass_profiles(params, ephemeris, station, station_passes(ephemeris, station), data_rate_mbps=9.6)
+                for station in stations]
+    downlink = acm_downlink(profiles, ephemeris, symbol_rate_baud=5e6)
+    DataBudgetCalculator.calculate(downlink.data_budget_params(data_rate_mbps=2.0, storage_capacity_gb=32))
+"""
+from dataclasses import dataclass, field
+import math
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .data_budget import DataBudgetCalculator, DataBudgetParams
+from .link_budget import ModulationScheme
+from .orbit import SECONDS_PER_DAY, Ephemeris
+from .pass_profile import PassProfiles
+
+@dataclass(frozen=True)
+class Modcod:
+    name: str
+    modulation: ModulationScheme
+    code_rate: float
+    spectral_efficiency: float  # Information bits per symbol
+    required_esn0_db: float  # Es/N0 threshold for quasi-error-free operation
+
+# DVB-S2 normal-frame modes with their ideal quasi-error-free thresholds; 16APSK is carried
+# as the 16-ary scheme of ModulationScheme
+DVB_S2_MODCODS: Tuple[Modcod, ...] = (
+    Modcod("QPSK 1/4", ModulationScheme.QPSK, 1 / 4, 0.490243, -2.35),
+    Modcod("QPSK 1/3", ModulationScheme.QPSK, 1 / 3, 0.656448, -1.24),
+    Modcod("QPSK 2/5", ModulationScheme.QPSK, 2 / 5, 0.789412, -0.30),
+    Modcod("QPSK 1/2", ModulationScheme.QPSK, 1 / 2, 0.988858, 1.00),
+    Modcod("QPSK 3/5", ModulationScheme.QPSK, 3 / 5, 1.188304, 2.23),
+    Modcod("QPSK 2/3", ModulationScheme.QPSK, 2 / 3, 1.322253, 3.10),
+    Modcod("QPSK 3/4", ModulationScheme.QPSK, 3 / 4, 1.487473, 4.03),
+    Modcod("QPSK 4/5", ModulationScheme.QPSK, 4 / 5, 1.587196, 4.68),
+    Modcod("QPSK 5/6", ModulationScheme.QPSK, 5 / 6, 1.654663, 5.18),
+    Modcod("QPSK 8/9", ModulationScheme.QPSK, 8 / 9, 1.766451, 6.20),
+    Modcod("QPSK 9/10", ModulationScheme.QPSK, 9 / 10, 1.788612, 6.42),
+    Modcod("16APSK 2/3", ModulationScheme.QAM16, 2 / 3, 2.637201, 8.97),
+    Modcod("16APSK 3/4", ModulationScheme.QAM16, 3 / 4, 2.966728, 10.21),
+    Modcod("16APSK 4/5", ModulationScheme.QAM16, 4 / 5, 3.165623, 11.03),
+    Modcod("16APSK 5/6", ModulationScheme.QAM16, 5 / 6, 3.300184, 11.61),
+    Modcod("16APSK 8/9", ModulationScheme.QAM16, 8 / 9, 3.523143, 12.89),
+    Modcod("16APSK 9/10", ModulationScheme.QAM16, 9 / 10, 3.567342, 13.13),
+)
+
+@dataclass
+class AcmDownlink:
+    modcods: Tuple[Modcod, ...]  # Usable modes, by increasing threshold and efficiency
+    times_s: np.ndarray = field(repr=False)  # Contact steps, ascending, overlapping passes merged
+    mode_index: np.ndarray = field(repr=False)  # Per contact step, index into modcods; -1 where no mode closes
+    rate_mbps: np.ndarray = field(repr=False)  # Per contact step
+    pass_volume_gb: np.ndarray  # Per contact window: a pass, or overlapping passes merged
+    pass_time_s: np.ndarray  # Per contact window
+    daily_volume_gb: np.ndarray  # Per day of the ephemeris
+    mode_time_s: np.ndarray  # Time spent in each mode
+
+    @property
+    def mean_daily_volume_gb(self) -> float:
+        return float(self.daily_volume_gb.mean()) if self.daily_volume_gb.size else 0.0
+
+    def data_budget_params(self, data_rate_mbps: float, storage_capacity_gb: float) -> DataBudgetParams:
+        """DataBudgetParams whose downlink capacity is the mean daily ACM volume.
+
+        passes_per_day and pass_duration_min describe the contact windows and downlink_rate_mbps
+        is the mean ACM rate over them, so a storage simulation can place the volume in time."""
+        days = max(self.daily_volume_gb.size, 1)
+        contact_s = float(self.pass_time_s.sum())
+        bits_per_gb = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+        return DataBudgetParams(
+            data_rate_mbps=data_rate_mbps,
+            storage_capacity_gb=storage_capacity_gb,
+            downlink_rate_mbps=float(self.pass_volume_gb.sum()) * bits_per_gb / contact_s / 1e6 if contact_s else 0.0,
+            pass_duration_min=float(self.pass_time_s.mean()) / 60 if self.pass_time_s.size else 0.0,
+            passes_per_day=int(round(self.pass_time_s.size / days)),
+            daily_downlink_gb=self.mean_daily_volume_gb,
+        )
+
+def efficient_modcods(modcods: Sequence[Modcod]) -> Tuple[Modcod, ...]:
+    """Sort modes by threshold and drop every mode that a lower-threshold mode outperforms."""
+    kept = []
+    for modcod in sorted(modcods, key=lambda m: (m.required_esn0_db, -m.spectral_efficiency)):
+        if not kept or modcod.spectral_efficiency > kept[-1].spectral_efficiency:
+            kept.append(modcod)
+    return tuple(kept)
+
+def select_modes(esn0_db: ArrayLike, modcods: Sequence[Modcod]) -> np.ndarray:
+    """Index of the best mode closing at each Es/N0, for modcods ordered by efficient_modcods; -1 where none does."""
+    thresholds = np.array([m.required_esn0_db for m in modcods])
+    return np.searchsorted(thresholds, esn0_db, side="right") - 1
+
+def merge_contacts(profiles: Sequence[PassProfiles], step_s: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(times_s, cn0_dbhz, offsets) of the pass steps of several stations on one ephemeris.
+
+    A time step covered by several passes is kept once, with the best C/N0. Runs of consecutive
+    steps form contact windows; window k is rows offsets[k]:offsets[k + 1]."""
+    times_s = np.concatenate([p.times_s for p in profiles])
+    cn0_dbhz = np.concatenate([p.cn0_dbhz for p in profiles])
+    order = np.lexsort((-cn0_dbhz, times_s))  # By time, best C/N0 first within a step
+    times_s, cn0_dbhz = times_s[order], cn0_dbhz[order]
+    first = np.concatenate(([True], times_s[1:] != times_s[:-1]))
+    times_s, cn0_dbhz = times_s[first], cn0_dbhz[first]
+    breaks = np.flatnonzero(np.diff(times_s) > 1.5 * step_s) + 1
+    offsets = np.concatenate(([0], breaks, [times_s.size])) if times_s.size else np.zeros(1, dtype=np.int64)
+    return times_s, cn0_dbhz, offsets
+
+def acm_downlink(profiles: Union[PassProfiles, Sequence[PassProfiles]], ephemeris: Ephemeris, symbol_rate_baud: float,
+                 modcods: Sequence[Modcod] = DVB_S2_MODCODS, margin_db: float = 0.0) -> AcmDownlink:
+    """Pick the best mode at each contact step and integrate the delivered volume.
+
+    profiles are the pass profiles of one station, or of several stations on the same
+    ephemeris, combined by merge_contacts. Es/N0 is the step's C/N0 less
+    10 log10(symbol_rate_baud), and a mode is usable when Es/N0 is at least its threshold
+    plus margin_db. Each step carries its mode's rate for one ephemeris step."""
+    if symbol_rate_baud <= 0:
+        raise ValueError("symbol_rate_baud must be positive")
+    modcods = efficient_modcods(modcods)
+    if not modcods:
+        raise ValueError("At least one mode is needed")
+
+    if isinstance(profiles, PassProfiles):
+        profiles = [profiles]
+    times_s, cn0_dbhz, offsets = merge_contacts(profiles, ephemeris.step_s)
+    esn0_db = cn0_dbhz - 10 * np.log10(symbol_rate_baud) - margin_db
+    mode_index = select_modes(esn0_db, modcods)
+    efficiency = np.array([0.0] + [m.spectral_efficiency for m in modcods])  # Slot 0 for "no mode"
+    rate_mbps = symbol_rate_baud * efficiency[mode_index + 1] / 1e6
+
+    bits_per_gb = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+    step_volume_gb = rate_mbps * 1e6 * ephemeris.step_s / bits_per_gb
+    cumulative = np.concatenate(([0.0], np.cumsum(step_volume_gb)))
+    pass_volume_gb = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+    # A closing sample exactly on a day boundary belongs to the last day
+    days = max(math.ceil(float(ephemeris.times_s[-1]) / SECONDS_PER_DAY), 1)
+    day = np.minimum(times_s // SECONDS_PER_DAY, days - 1).astype(np.int64)
+    daily_volume_gb = np.bincount(day, weights=step_volume_gb, minlength=days)
+    mode_steps = np.bincount(mode_index[mode_index >= 0], minlength=len(modcods))
+
+    return AcmDownlink(
+        modcods=modcods,
+        times_s=times_s,
+        mode_index=mode_index,
+        rate_mbps=rate_mbps,
+        pass_volume_gb=pass_volume_gb,
+        pass_time_s=np.diff(offsets) * ephemeris.step_s,
+        daily_volume_gb=daily_volume_gb,
+        mode_time_s=mode_steps * ephemeris.step_s
+    )
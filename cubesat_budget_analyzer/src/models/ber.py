@@ -0,0 +1,112 @@
+"""Tabulated BER curves per modulation and coding scheme.
+
+Each (modulation, coding) curve is evaluated once on a dense Eb/N0 grid and kept as
+log10(BER), computed in the log domain so it stays accurate and strictly decreasing far
+below 1e-300. After that, forward lookups (BER at an Eb/N0) and inverse lookups (Eb/N0
+needed for a BER) are plain interpolations, so optimisations that ask for a required
+Eb/N0 thousands of times never evaluate a special function again. Tables are cached in
+the process and, when a cache directory is given, on disk.
+
+    required_ebn0_db(ModulationScheme.BPSK, 1e-6)                                  # ~10.5 dB
+    ber(ModulationScheme.BPSK, np.linspace(0, 10, 101), CodingScheme.CONV_K7_R12)
+"""
+from dataclasses import dataclass
+from enum import Enum
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import log_ndtr, logsumexp
+
+from .cache import MemoCache
+from .link_budget import LinkBudgetCalculator, ModulationScheme
+
+TABLE_VERSION = 1  # Bump when the curves change, so stale disk caches are rebuilt
+EBN0_GRID_DB = np.round(np.arange(-10.0, 30.0 + 1e-9, 0.01), 2)
+EBN0_GRID_DB.flags.writeable = False
+_TABLES = MemoCache("ber_tables", maxsize=64)
+
+class CodingScheme(Enum):
+    UNCODED = "Uncoded"
+    CONV_K7_R12 = "Conv. K=7 r=1/2"  # CCSDS (171, 133) code, soft-decision Viterbi decoding
+
+# Rate and leading bit-error weights (free distance, weight) of the convolutional codes,
+# used in the union bound Pb <= sum_d w_d * P2(d)
+_CONVOLUTIONAL_CODES = {
+    CodingScheme.CONV_K7_R12: (0.5, ((10, 36), (12, 211), (14, 1404), (16, 11633), (18, 77433), (20, 502690))),
+}
+
+def _log10_uncoded_ber(modulation: ModulationScheme, ebn0: np.ndarray) -> np.ndarray:
+    """log10 of LinkBudgetCalculator's a * erfc(sqrt(Eb/N0 / d)) for linear Eb/N0 values."""
+    scale, divisor = LinkBudgetCalculator.BER_COEFFICIENTS[modulation]
+    # erfc(y) = 2 Q(y sqrt(2)) and log Q(x) = log_ndtr(-x)
+    return (np.log(2 * scale) + log_ndtr(-np.sqrt(2 * ebn0 / divisor))) / np.log(10)
+
+def _build_curve(modulation: ModulationScheme, coding: CodingScheme) -> np.ndarray:
+    """log10(BER) on EBN0_GRID_DB."""
+    ebn0 = 10 ** (EBN0_GRID_DB / 10)
+    if coding == CodingScheme.UNCODED:
+        return _log10_uncoded_ber(modulation, ebn0)
+    rate, spectrum = _CONVOLUTIONAL_CODES[coding]
+    # Pairwise error probability of a path at distance d: the channel BER at R * d * Eb/N0
+    # (exact for BPSK/QPSK, an approximation for the QAM schemes)
+    terms = [np.log(weight) + _log10_uncoded_ber(modulation, rate * distance * ebn0) * np.log(10)
+             for distance, weight in spectrum]
+    log10_bound = logsumexp(np.vstack(terms), axis=0) / np.log(10)
+    return np.minimum(log10_bound, np.log10(0.5))  # The bound is meaningless above 0.5
+
+@dataclass(frozen=True)
+class BerTable:
+    modulation: ModulationScheme
+    coding: CodingScheme
+    ebn0_db: np.ndarray  # Ascending grid
+    log10_ber: np.ndarray  # Decreasing
+
+    def ber(self, ebn0_db: ArrayLike) -> np.ndarray:
+        """BER at each Eb/N0 (dB), interpolated in log10; clamped to the ends of the grid."""
+        return 10 ** np.interp(ebn0_db, self.ebn0_db, self.log10_ber)
+
+    def required_ebn0_db(self, target_ber: ArrayLike) -> np.ndarray:
+        """Eb/N0 (dB) at which the BER falls to each target; clamped to the ends of the grid.
+
+        Targets must lie in (0, 0.5): the coded curves are held flat at 0.5, so no Eb/N0 answers 0.5 or above."""
+        target_ber = np.asarray(target_ber, dtype=float)
+        if not np.all((target_ber > 0) & (target_ber < 0.5)):
+            raise ValueError("target_ber must be between 0 and 0.5")
+        return np.interp(np.log10(target_ber), self.log10_ber[::-1], self.ebn0_db[::-1])
+
+    def curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(Eb/N0 dB, BER) points of the whole table, e.g. for plotting."""
+        return self.ebn0_db, 10 ** self.log10_ber
+
+def _cache_path(cache_dir: str, modulation: ModulationScheme, coding: CodingScheme) -> str:
+    return os.path.join(cache_dir, f"ber_v{TABLE_VERSION}_{modulation.name}_{coding.name}.npz")
+
+@_TABLES.memoize
+def get_table(modulation: ModulationScheme, coding: CodingScheme = CodingScheme.UNCODED,
+              cache_dir: Optional[str] = None) -> BerTable:
+    """The BER table of a scheme, built once per process and read from or written to cache_dir if given."""
+    log10_ber = None
+    if cache_dir is not None:
+        path = _cache_path(cache_dir, modulation, coding)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if np.array_equal(data["ebn0_db"], EBN0_GRID_DB):
+                    log10_ber = data["log10_ber"]
+    if log10_ber is None:
+        log10_ber = _build_curve(modulation, coding)
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez(_cache_path(cache_dir, modulation, coding), ebn0_db=EBN0_GRID_DB, log10_ber=log10_ber)
+    log10_ber.flags.writeable = False  # Shared through the cache
+    return BerTable(modulation, coding, EBN0_GRID_DB, log10_ber)
+
+def ber(modulation: ModulationScheme, ebn0_db: ArrayLike, coding: CodingScheme = CodingScheme.UNCODED) -> np.ndarray:
+    """BER of a scheme at each Eb/N0 (dB)."""
+    return get_table(modulation, coding).ber(ebn0_db)
+
+def required_ebn0_db(modulation: ModulationScheme, target_ber: ArrayLike,
+                     coding: CodingScheme = CodingScheme.UNCODED) -> np.ndarray:
+    """Eb/N0 (dB) a scheme needs to reach each target BER."""
+    return get_table(modulation, coding).required_ebn0_db(target_ber)
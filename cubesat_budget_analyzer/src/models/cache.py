@@ -0,0 +1,134 @@
+"""Shared memoisation with bounded LRU eviction and hit/miss statistics.
+
+Every MemoCache registers under a name, so the GUI, reports and batch tools all see the
+same caches and cache_stats() reports on all of them. Keys are built from the arguments,
+which must be hashable; parameter and result dataclasses are frozen for this reason.
+Lists, tuples and dicts in the arguments are frozen into tuples; anything still unhashable
+(e.g. numpy arrays) is computed without caching.
+
+    _PASSES = MemoCache("passes", maxsize=32)
+
+    @_PASSES.memoize
+    def find_passes(elements, stations, start, duration_s, step_s): ...
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_REGISTRY: Dict[str, "MemoCache"] = {}
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def _freeze(value: Any) -> Hashable:
+    """Turn containers into tuples so they can be part of a key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+class MemoCache:
+    """A thread-safe LRU mapping from keys to computed values, registered under a unique name.
+
+    With maxbytes, sizeof(value) is also counted and old entries are evicted to keep the total
+    under it; a value larger than maxbytes on its own is returned without being stored."""
+
+    def __init__(self, name: str, maxsize: int = 256, maxbytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if (maxbytes is None) != (sizeof is None):
+            raise ValueError("maxbytes and sizeof go together")
+        self.name = name
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name in _REGISTRY:
+            raise ValueError(f"A cache named {name!r} already exists")
+        _REGISTRY[name] = self
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value of key, computing and storing it on a miss.
+
+        compute runs outside the lock, so two threads missing the same key may both compute it."""
+        try:
+            hash(key)
+        except TypeError:
+            with self._lock:
+                self.misses += 1
+            return compute()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return value
+        with self._lock:
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes):
+                evicted, _ = self._entries.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+        return value
+
+    def memoize(self, function: Callable[..., T]) -> Callable[..., T]:
+        """Decorator caching function by its (frozen) arguments."""
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (function.__qualname__, _freeze(args), _freeze(kwargs))
+            return self.get_or_compute(key, lambda: function(*args, **kwargs))
+        wrapper.cache = self
+        return wrapper
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def cache_stats() -> Dict[str, CacheStats]:
+    """Statistics of every registered cache, by name."""
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+def clear_caches() -> None:
+    """Empty every registered cache."""
+    for cache in _REGISTRY.values():
+        cache.clear()
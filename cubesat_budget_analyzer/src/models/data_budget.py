@@ -1,15 +1,21 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Optional, Sequence
 
-@dataclass
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .cache import MemoCache
+
+@dataclass(frozen=True)
 class DataBudgetParams:
     data_rate_mbps: float  # Payload data generation rate in Mbps
     storage_capacity_gb: float  # Storage capacity in GB
     downlink_rate_mbps: float  # Downlink transmission rate in Mbps
     pass_duration_min: float  # Ground station pass duration in minutes
     passes_per_day: int  # Number of passes per day
+    daily_downlink_gb: Optional[float] = None  # Delivered volume per day (e.g. from ACM); replaces rate * pass time
 
-@dataclass
+@dataclass(frozen=True)
 class DataBudgetResults:
     daily_data_gb: float  # Total data generated per day in GB
     daily_downlink_capacity_gb: float  # Available downlink capacity per day in GB
@@ -18,6 +24,33 @@ class DataBudgetResults:
     storage_exceeded: bool  # Whether storage capacity will be exceeded
     days_until_full: Optional[float]  # Days until storage is full (if applicable)
 
+@dataclass
+class DataBudgetBatchParams:
+    """Column-oriented DataBudgetParams: each field is a scalar or an array, broadcast together."""
+    data_rate_mbps: ArrayLike
+    storage_capacity_gb: ArrayLike
+    downlink_rate_mbps: ArrayLike
+    pass_duration_min: ArrayLike
+    passes_per_day: ArrayLike
+    daily_downlink_gb: ArrayLike = np.nan  # NaN where calculate would get None
+
+    @classmethod
+    def from_params(cls, params: Sequence[DataBudgetParams]) -> "DataBudgetBatchParams":
+        """Stack a sequence of single parameter sets into columns."""
+        return cls(**{field.name: np.array([getattr(p, field.name) for p in params], dtype=float)
+                      for field in fields(DataBudgetParams)})
+
+@dataclass
+class DataBudgetBatchResults:
+    daily_data_gb: np.ndarray
+    daily_downlink_capacity_gb: np.ndarray
+    storage_usage_gb: np.ndarray
+    backlog_gb: np.ndarray
+    storage_exceeded: np.ndarray  # Boolean mask
+    days_until_full: np.ndarray  # NaN where storage never fills
+
+_RESULTS = MemoCache("data_budget", maxsize=1024)
+
 class DataBudgetCalculator:
     BITS_TO_BYTES = 8
     BYTES_TO_GB = 1e9
@@ -30,9 +63,12 @@ class DataBudgetCalculator:
         daily_data_gb = bits_per_day / (DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB)
         
         # Calculate daily downlink capacity in GB
-        total_pass_seconds = params.pass_duration_min * 60 * params.passes_per_day
-        total_downlink_bits = params.downlink_rate_mbps * 1e6 * total_pass_seconds
-        daily_downlink_capacity_gb = total_downlink_bits / (DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB)
+        if params.daily_downlink_gb is not None:
+            daily_downlink_capacity_gb = params.daily_downlink_gb
+        else:
+            total_pass_seconds = params.pass_duration_min * 60 * params.passes_per_day
+            total_downlink_bits = params.downlink_rate_mbps * 1e6 * total_pass_seconds
+            daily_downlink_capacity_gb = total_downlink_bits / (DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB)
         
         # Calculate storage usage and backlog
         daily_deficit = daily_data_gb - daily_downlink_capacity_gb
@@ -60,4 +96,42 @@ class DataBudgetCalculator:
             backlog_gb=backlog_gb,
             storage_exceeded=storage_exceeded,
             days_until_full=days_until_full
-        ) 
\ No newline at end of file
+        ) 
+
+    @staticmethod
+    def calculate_cached(params: DataBudgetParams) -> DataBudgetResults:
+        """calculate, answered from the shared cache for parameters seen before."""
+        return _RESULTS.get_or_compute(params, lambda: DataBudgetCalculator.calculate(params))
+
+    @staticmethod
+    def calculate_batch(params: DataBudgetBatchParams) -> DataBudgetBatchResults:
+        """Vectorized calculate: every field of params broadcasts to one result shape.
+
+        The deficit branch becomes a mask, and days_until_full is NaN where calculate returns None."""
+        gb = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+        (data_rate_mbps, storage_capacity_gb, downlink_rate_mbps, pass_duration_min, passes_per_day,
+         daily_downlink_gb) = np.broadcast_arrays(
+            *(np.asarray(getattr(params, field.name), dtype=float) for field in fields(DataBudgetBatchParams))
+        )
+
+        daily_data_gb = data_rate_mbps * 1e6 * DataBudgetCalculator.SECONDS_PER_DAY / gb
+        total_pass_seconds = pass_duration_min * 60 * passes_per_day
+        daily_downlink_capacity_gb = np.where(np.isnan(daily_downlink_gb),
+                                              downlink_rate_mbps * 1e6 * total_pass_seconds / gb, daily_downlink_gb)
+
+        daily_deficit = daily_data_gb - daily_downlink_capacity_gb
+        storage_exceeded = daily_deficit > 0
+        storage_usage_gb = np.where(storage_exceeded, storage_capacity_gb,
+                                    np.minimum(daily_data_gb, storage_capacity_gb))
+        backlog_gb = np.where(storage_exceeded, daily_deficit, 0.0)
+        days_until_full = np.full(daily_deficit.shape, np.nan)
+        np.divide(storage_capacity_gb, daily_deficit, out=days_until_full, where=storage_exceeded)
+
+        return DataBudgetBatchResults(
+            daily_data_gb=daily_data_gb,
+            daily_downlink_capacity_gb=daily_downlink_capacity_gb,
+            storage_usage_gb=storage_usage_gb,
+            backlog_gb=backlog_gb,
+            storage_exceeded=storage_exceeded,
+            days_until_full=days_until_full
+        )
@@ -1,7 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import math
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import erfc
+
+from . import fading
+from .cache import MemoCache
 
 class ModulationScheme(Enum):
     BPSK = "BPSK"
@@ -15,7 +22,7 @@ class PropagationModel(Enum):
     RICIAN = "Rician"
     LOGNORMAL = "Log-normal"
 
-@dataclass
+@dataclass(frozen=True)
 class LinkBudgetParams:
     tx_power_dbm: float
     tx_gain_dbi: float
@@ -28,29 +35,74 @@ class LinkBudgetParams:
     modulation: ModulationScheme
     propagation: PropagationModel
     required_ebn0_db: float
+    rician_k_db: float = 10.0  # Direct-to-scattered power ratio, used by the Rician model
+    shadowing_sigma_db: float = 4.0  # Standard deviation of the shadowing, used by the log-normal model
 
-@dataclass
+@dataclass(frozen=True)
 class LinkBudgetResults:
     received_power_dbm: float
     cnr_db: float
-    ber: float
-    link_margin_db: float
-    warnings: list[str]
+    ber: float  # Average BER over the fading for the non-AWGN models
+    link_margin_db: float  # Mean Eb/N0 minus the required Eb/N0
+    outage_probability: float  # P(instantaneous Eb/N0 < required); 0 or 1 for AWGN
+    warnings: Tuple[str, ...]
+
+@dataclass
+class LinkBudgetBatchParams:
+    """Column-oriented LinkBudgetParams: each field is a scalar or an array, broadcast together."""
+    tx_power_dbm: ArrayLike
+    tx_gain_dbi: ArrayLike
+    rx_gain_dbi: ArrayLike
+    path_loss_db: ArrayLike
+    atm_loss_db: ArrayLike
+    sys_temp_k: ArrayLike
+    bandwidth_hz: ArrayLike
+    freq_ghz: ArrayLike
+    modulation: Union[ModulationScheme, ArrayLike]  # One scheme, or an array of schemes
+    propagation: Union[PropagationModel, ArrayLike]
+    required_ebn0_db: ArrayLike
+    rician_k_db: ArrayLike = 10.0
+    shadowing_sigma_db: ArrayLike = 4.0
+
+    @classmethod
+    def from_params(cls, params: Sequence[LinkBudgetParams]) -> "LinkBudgetBatchParams":
+        """Stack a sequence of single parameter sets into columns."""
+        columns = {}
+        for field in fields(LinkBudgetParams):
+            values = [getattr(p, field.name) for p in params]
+            if field.name in ("modulation", "propagation"):
+                columns[field.name] = np.array(values, dtype=object)
+            else:
+                columns[field.name] = np.array(values, dtype=float)
+        return cls(**columns)
+
+@dataclass
+class LinkBudgetBatchResults:
+    received_power_dbm: np.ndarray
+    cnr_db: np.ndarray
+    ber: np.ndarray
+    link_margin_db: np.ndarray
+    outage_probability: np.ndarray
+    negative_margin: np.ndarray  # Mask of rows warned about a negative link margin
+    low_margin: np.ndarray  # Mask of rows warned about a margin below 3 dB (but not negative)
+
+_RESULTS = MemoCache("link_budget", maxsize=1024)
 
 class LinkBudgetCalculator:
     # Boltzmann constant in dBm/K/Hz
     BOLTZMANN_CONSTANT = -198.6
 
+    # BER = a * erfc(sqrt(Eb/N0 / d)), the same approximations as _calculate_ber
+    BER_COEFFICIENTS = {
+        ModulationScheme.BPSK: (0.5, 1.0),
+        ModulationScheme.QPSK: (0.5, 2.0),
+        ModulationScheme.QAM16: (0.75, 10.0),
+        ModulationScheme.QAM64: (0.75, 42.0),
+    }
+
     @staticmethod
     def calculate(params: LinkBudgetParams) -> LinkBudgetResults:
         warnings = []
-        
-        # Check propagation model
-        if params.propagation != PropagationModel.AWGN:
-            raise ValueError(
-                f"The selected propagation model ({params.propagation.value}) is not yet implemented. "
-                "Please select AWGN or check back in a future update."
-            )
 
         # Calculate received power
         received_power_dbm = (
@@ -74,12 +126,19 @@ class LinkBudgetCalculator:
         # Calculate Eb/N0
         ebn0_db = cnr_db - 10 * math.log10(params.bandwidth_hz / (params.bandwidth_hz / 2))  # Assuming Nyquist rate
 
-        # Calculate BER based on modulation scheme
-        ber = LinkBudgetCalculator._calculate_ber(params.modulation, ebn0_db)
-
         # Calculate link margin
         link_margin_db = ebn0_db - params.required_ebn0_db
 
+        # Calculate BER based on modulation scheme, averaged over the fading
+        if params.propagation == PropagationModel.AWGN:
+            ber = LinkBudgetCalculator._calculate_ber(params.modulation, ebn0_db)
+            outage_probability = float(link_margin_db < 0)
+        else:
+            ber, outage_probability = LinkBudgetCalculator._fading_ber_and_outage(
+                params.propagation, params.modulation, ebn0_db, link_margin_db,
+                params.rician_k_db, params.shadowing_sigma_db)
+            ber, outage_probability = float(ber), float(outage_probability)
+
         # Check link margin
         if link_margin_db < 0:
             warnings.append("Warning: Negative link margin! The connection will be unstable.")
@@ -91,9 +150,15 @@ class LinkBudgetCalculator:
             cnr_db=cnr_db,
             ber=ber,
             link_margin_db=link_margin_db,
-            warnings=warnings
+            outage_probability=outage_probability,
+            warnings=tuple(warnings)
         )
 
+    @staticmethod
+    def calculate_cached(params: LinkBudgetParams) -> LinkBudgetResults:
+        """calculate, answered from the shared cache for parameters seen before."""
+        return _RESULTS.get_or_compute(params, lambda: LinkBudgetCalculator.calculate(params))
+
     @staticmethod
     def _calculate_ber(modulation: ModulationScheme, ebn0_db: float) -> float:
         """Calculate Bit Error Rate based on modulation scheme and Eb/N0."""
@@ -119,9 +184,105 @@ class LinkBudgetCalculator:
             raise ValueError(f"Unsupported modulation scheme: {modulation}")
 
     @staticmethod
-    def calculate_fspl(distance_km: float, freq_ghz: float) -> float:
-        """Calculate Free Space Path Loss in dB."""
-        return 92.45 + 20 * math.log10(freq_ghz) + 20 * math.log10(distance_km)
+    def calculate_batch(params: LinkBudgetBatchParams) -> LinkBudgetBatchResults:
+        """Vectorized calculate: every field of params broadcasts to one result shape.
+
+        Warnings come back as boolean masks instead of per-row messages."""
+        received_power_dbm = (
+            np.asarray(params.tx_power_dbm, dtype=float) +
+            params.tx_gain_dbi +
+            params.rx_gain_dbi -
+            params.path_loss_db -
+            params.atm_loss_db
+        )
+        noise_power_dbm = (
+            LinkBudgetCalculator.BOLTZMANN_CONSTANT +
+            10 * np.log10(params.sys_temp_k) +
+            10 * np.log10(params.bandwidth_hz)
+        )
+        cnr_db = received_power_dbm - noise_power_dbm
+        ebn0_db = cnr_db - 10 * math.log10(2)  # Assuming Nyquist rate, as in calculate
+        link_margin_db = ebn0_db - params.required_ebn0_db
+
+        ber, outage_probability = LinkBudgetCalculator._fading_ber_and_outage(
+            params.propagation, params.modulation, ebn0_db, link_margin_db,
+            params.rician_k_db, params.shadowing_sigma_db)
+
+        shape = np.broadcast_shapes(np.shape(link_margin_db), np.shape(ber))
+        link_margin_db = np.broadcast_to(link_margin_db, shape)
+        return LinkBudgetBatchResults(
+            received_power_dbm=np.broadcast_to(received_power_dbm, shape),
+            cnr_db=np.broadcast_to(cnr_db, shape),
+            ber=np.broadcast_to(ber, shape),
+            link_margin_db=link_margin_db,
+            outage_probability=np.broadcast_to(outage_probability, shape),
+            negative_margin=link_margin_db < 0,
+            low_margin=(link_margin_db >= 0) & (link_margin_db < 3)
+        )
+
+    @staticmethod
+    def average_ber(modulation: ModulationScheme, propagation: PropagationModel, ebn0_db: ArrayLike,
+                    rician_k_db: ArrayLike = 10.0, shadowing_sigma_db: ArrayLike = 4.0) -> np.ndarray:
+        """BER at each mean Eb/N0 (dB), averaged over the fading of propagation (e.g. for BER curves)."""
+        ebn0_db = np.asarray(ebn0_db, dtype=float)
+        ber, _ = LinkBudgetCalculator._fading_ber_and_outage(
+            propagation, modulation, ebn0_db, np.zeros_like(ebn0_db), rician_k_db, shadowing_sigma_db)
+        return ber
+
+    @staticmethod
+    def _fading_ber_and_outage(propagation, modulation, ebn0_db: ArrayLike, link_margin_db: ArrayLike,
+                               rician_k_db: ArrayLike, shadowing_sigma_db: ArrayLike) -> tuple:
+        """Return the average BER and outage probability for one model or an array of models."""
+        scale, divisor = LinkBudgetCalculator._ber_coefficients(modulation)
+        propagation = np.asarray(propagation, dtype=object)
+        scale, divisor, ebn0_db, link_margin_db, rician_k_db, shadowing_sigma_db, propagation = np.broadcast_arrays(
+            scale, divisor, ebn0_db, link_margin_db, rician_k_db, shadowing_sigma_db, propagation)
+        ber = np.full(ebn0_db.shape, np.nan)
+        outage = np.full(ebn0_db.shape, np.nan)
+        matched = np.zeros(ebn0_db.shape, dtype=bool)
+        for model in PropagationModel:
+            rows = propagation == model
+            if not rows.any():
+                continue
+            matched |= rows
+            a, d, ebn0, margin = scale[rows], divisor[rows], ebn0_db[rows], link_margin_db[rows]
+            if model == PropagationModel.AWGN:
+                ber[rows] = a * erfc(np.sqrt(10 ** (ebn0 / 10) / d))
+                outage[rows] = margin < 0
+            elif model == PropagationModel.RAYLEIGH:
+                ber[rows] = fading.rayleigh_ber(a, d, ebn0)
+                outage[rows] = fading.rayleigh_outage(margin)
+            elif model == PropagationModel.RICIAN:
+                ber[rows] = fading.rician_ber(a, d, ebn0, rician_k_db[rows])
+                outage[rows] = fading.rician_outage(margin, rician_k_db[rows])
+            elif model == PropagationModel.LOGNORMAL:
+                ber[rows] = fading.lognormal_ber(a, d, ebn0, shadowing_sigma_db[rows])
+                outage[rows] = fading.lognormal_outage(margin, shadowing_sigma_db[rows])
+        if not matched.all():
+            unknown = propagation[~matched].flat[0]
+            raise ValueError(f"Unsupported propagation model: {unknown}")
+        return ber, outage
+
+    @staticmethod
+    def _ber_coefficients(modulation) -> tuple:
+        """Return the (scale, divisor) BER coefficients for one scheme or an array of schemes."""
+        if isinstance(modulation, ModulationScheme):
+            return LinkBudgetCalculator.BER_COEFFICIENTS[modulation]
+        schemes = np.asarray(modulation, dtype=object)
+        scale = np.full(schemes.shape, np.nan)
+        divisor = np.full(schemes.shape, np.nan)
+        for scheme, (a, d) in LinkBudgetCalculator.BER_COEFFICIENTS.items():
+            mask = schemes == scheme
+            scale[mask], divisor[mask] = a, d
+        if np.isnan(scale).any():
+            unknown = schemes[np.isnan(scale)].flat[0]
+            raise ValueError(f"Unsupported modulation scheme: {unknown}")
+        return scale, divisor
+
+    @staticmethod
+    def calculate_fspl(distance_km: ArrayLike, freq_ghz: ArrayLike) -> ArrayLike:
+        """Calculate Free Space Path Loss in dB (element-wise for arrays)."""
+        return 92.45 + 20 * np.log10(freq_ghz) + 20 * np.log10(distance_km)
 
     @staticmethod
     def dbm_to_watts(power_dbm: float) -> float:
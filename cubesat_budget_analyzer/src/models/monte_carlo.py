@@ -0,0 +1,203 @@
+"""Monte Carlo link-margin uncertainty analysis on top of LinkBudgetCalculator.
+
+Parameters with a tolerance are drawn around their nominal LinkBudgetParams value and the
+margin is evaluated with the vectorized calculate_batch, one chunk of samples at a time.
+Each chunk gets its own random stream spawned from one SeedSequence, so a seed gives the
+same answer whatever the number of worker processes. Chunks are reduced to streaming
+statistics (count, mean, variance, extremes, a fine fixed-bin histogram for percentiles)
+and merged, so no sample is kept.
+
+    results = run_monte_carlo(params, {"tx_power_dbm": Tolerance("normal", 0.5),
+                                       "sys_temp_k": Tolerance("uniform", 50)},
+                              samples=5_000_000, seed=42)
+    results.probability_negative_margin, results.percentiles[5.0]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+import os
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .cache import MemoCache
+from .link_budget import LinkBudgetBatchParams, LinkBudgetCalculator, LinkBudgetParams
+
+# Parameters that may carry a tolerance (everything numeric in LinkBudgetParams)
+UNCERTAIN_FIELDS = [f.name for f in fields(LinkBudgetParams) if f.name not in ("modulation", "propagation")]
+# Parameters that must stay positive however far a draw lands
+_POSITIVE_FIELDS = ("sys_temp_k", "bandwidth_hz", "freq_ghz", "shadowing_sigma_db")
+_RESULTS = MemoCache("monte_carlo", maxsize=32)
+
+@dataclass(frozen=True)
+class Tolerance:
+    distribution: str  # "normal" (spread = standard deviation), "uniform" or "triangular" (spread = half-width)
+    spread: float
+
+    def draw(self, rng: np.random.Generator, nominal: float, size: int) -> np.ndarray:
+        """Draw size values around nominal."""
+        if self.distribution == "normal":
+            return rng.normal(nominal, self.spread, size)
+        if self.distribution == "uniform":
+            return rng.uniform(nominal - self.spread, nominal + self.spread, size)
+        if self.distribution == "triangular":
+            return rng.triangular(nominal - self.spread, nominal, nominal + self.spread, size)
+        raise ValueError(f"Unsupported distribution: {self.distribution}")
+
+class MarginStatistics:
+    """Streaming margin statistics that merge across chunks without keeping samples."""
+
+    def __init__(self, center_db: float, half_width_db: float = 50.0, resolution_db: float = 0.01):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.negative = 0  # Samples with margin < 0
+        self.edges = center_db + np.arange(-half_width_db, half_width_db + resolution_db / 2, resolution_db)
+        self.counts = np.zeros(self.edges.size + 1, dtype=np.int64)  # Plus under- and overflow bins
+
+    def add(self, margins: np.ndarray) -> None:
+        """Fold a chunk of margins into the statistics."""
+        if margins.size == 0:
+            return
+        mean = float(margins.mean())
+        self._merge_moments(margins.size, mean, float(((margins - mean) ** 2).sum()))
+        self.minimum = min(self.minimum, float(margins.min()))
+        self.maximum = max(self.maximum, float(margins.max()))
+        self.negative += int(np.count_nonzero(margins < 0))
+        self.counts += np.bincount(np.searchsorted(self.edges, margins, side="right"), minlength=self.counts.size)
+
+    def merge(self, other: "MarginStatistics") -> None:
+        """Combine statistics gathered over the same histogram bins."""
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.negative += other.negative
+        self.counts += other.counts
+
+    def _merge_moments(self, count: int, mean: float, m2: float) -> None:
+        """Pairwise mean/variance update (Chan et al.), stable for very large counts."""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile by interpolating inside the histogram bin that holds it."""
+        target = q / 100 * self.count
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, target, side="left"))
+        if index == 0:
+            return self.minimum  # Below the histogram range
+        if index >= self.edges.size:
+            return self.maximum  # Above the histogram range
+        below = cumulative[index - 1]
+        fraction = (target - below) / self.counts[index] if self.counts[index] else 0.0
+        lower, upper = self.edges[index - 1], self.edges[index]
+        return float(np.clip(lower + fraction * (upper - lower), self.minimum, self.maximum))
+
+@dataclass(frozen=True)
+class MonteCarloResults:
+    samples: int
+    nominal_margin_db: float
+    mean_margin_db: float
+    std_margin_db: float
+    min_margin_db: float
+    max_margin_db: float
+    percentiles: Mapping[float, float]  # Percentile -> margin in dB, read-only (shared through the cache)
+    probability_negative_margin: float  # P(margin < 0)
+    histogram_edges_db: np.ndarray = field(repr=False)
+    histogram_counts: np.ndarray = field(repr=False)  # counts[i] is between edges[i-1] and edges[i]
+
+    @property
+    def probability_link_closes(self) -> float:
+        return 1.0 - self.probability_negative_margin
+
+def _simulate_chunk(params: LinkBudgetParams, tolerances: Mapping[str, Tolerance], seed: np.random.SeedSequence,
+                    size: int, center_db: float, half_width_db: float, resolution_db: float) -> MarginStatistics:
+    """Draw one chunk of samples from its own stream and reduce it to statistics.
+
+    The statistics are built here, in the worker, so only the filled histogram crosses processes."""
+    statistics = MarginStatistics(center_db, half_width_db, resolution_db)
+    rng = np.random.default_rng(seed)
+    columns = {f.name: getattr(params, f.name) for f in fields(LinkBudgetParams)}
+    for name, tolerance in tolerances.items():
+        columns[name] = tolerance.draw(rng, getattr(params, name), size)
+        if name in _POSITIVE_FIELDS:
+            columns[name] = np.maximum(columns[name], np.finfo(float).tiny)
+    margins = LinkBudgetCalculator.calculate_batch(LinkBudgetBatchParams(**columns)).link_margin_db
+    statistics.add(np.broadcast_to(margins, (size,)))
+    return statistics
+
+def run_monte_carlo(params: LinkBudgetParams, tolerances: Mapping[str, Tolerance], samples: int = 1_000_000,
+                    seed: Optional[int] = None, chunk_size: int = 250_000, workers: Optional[int] = None,
+                    percentiles: Sequence[float] = (1.0, 5.0, 50.0, 95.0, 99.0),
+                    histogram_half_width_db: float = 50.0, histogram_resolution_db: float = 0.01) -> MonteCarloResults:
+    """Estimate the link-margin distribution under parameter tolerances.
+
+    workers=1 runs in this process, None uses one process per CPU. Percentiles are read from
+    a histogram of histogram_resolution_db bins within histogram_half_width_db of the nominal margin.
+    With a seed the answer is reproducible, so it is cached: the worker count does not change it."""
+    unknown = set(tolerances) - set(UNCERTAIN_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot apply tolerances to: {sorted(unknown)}")
+    if samples <= 0:
+        raise ValueError("samples must be positive")
+
+    def run() -> MonteCarloResults:
+        return _run_monte_carlo(params, tolerances, samples, seed, chunk_size, workers, percentiles,
+                                histogram_half_width_db, histogram_resolution_db)
+    if seed is None:
+        return run()
+    key = (params, tuple(sorted(tolerances.items())), samples, seed, chunk_size, tuple(percentiles),
+           histogram_half_width_db, histogram_resolution_db)
+    return _RESULTS.get_or_compute(key, run)
+
+def _run_monte_carlo(params: LinkBudgetParams, tolerances: Mapping[str, Tolerance], samples: int,
+                     seed: Optional[int], chunk_size: int, workers: Optional[int], percentiles: Sequence[float],
+                     histogram_half_width_db: float, histogram_resolution_db: float) -> MonteCarloResults:
+    """The uncached simulation behind run_monte_carlo."""
+    nominal = LinkBudgetCalculator.calculate(params).link_margin_db
+    total = MarginStatistics(nominal, histogram_half_width_db, histogram_resolution_db)
+    root = np.random.SeedSequence(seed)
+
+    def chunks():
+        """(stream, size) of each chunk; streams are spawned one by one, in the same order as spawn(n)."""
+        for start in range(0, samples, chunk_size):
+            yield root.spawn(1)[0], min(chunk_size, samples - start)
+
+    histogram = (nominal, histogram_half_width_db, histogram_resolution_db)
+    if workers == 1:
+        for stream, size in chunks():
+            total.merge(_simulate_chunk(params, tolerances, stream, size, *histogram))
+    else:
+        # Keep only a few chunks in flight, so huge runs neither queue every chunk nor hold their results
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: List = []
+            for stream, size in chunks():
+                pending.append(pool.submit(_simulate_chunk, params, tolerances, stream, size, *histogram))
+                if len(pending) >= max_in_flight:
+                    total.merge(pending.pop(0).result())
+            for future in pending:
+                total.merge(future.result())
+
+    total.edges.flags.writeable = False
+    total.counts.flags.writeable = False  # Shared through the cache
+    return MonteCarloResults(
+        samples=total.count,
+        nominal_margin_db=nominal,
+        mean_margin_db=total.mean,
+        std_margin_db=float(np.sqrt(total.m2 / (total.count - 1))) if total.count > 1 else 0.0,
+        min_margin_db=total.minimum,
+        max_margin_db=total.maximum,
+        percentiles=MappingProxyType({q: total.percentile(q) for q in percentiles}),
+        probability_negative_margin=total.negative / total.count,
+        histogram_edges_db=total.edges,
+        histogram_counts=total.counts
+    )
@@ -0,0 +1,256 @@
+"""Orbit propagation and ground-station pass prediction.
+
+Orbits are propagated analytically from mean Keplerian elements with the secular J2
+drift of the node, perigee and mean anomaly, vectorized over a uniform time grid.
+Positions are rotated into the Earth-fixed frame with GMST and turned into azimuth,
+elevation and range from each ground station. Passes are the stretches where the
+elevation clears the station's mask, with their edges interpolated between grid points.
+
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=97.4, epoch=epoch)
+    stations = [GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=10)]
+    passes = find_passes(elements, stations, epoch, days=365)
+    data_params = data_budget_params_from_passes(passes, 365, data_rate_mbps=1.0,
+                                                 storage_capacity_gb=32, downlink_rate_mbps=10)
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cache import MemoCache
+from .data_budget import DataBudgetCalculator, DataBudgetParams
+
+EARTH_MU_KM3_S2 = 398600.4418  # Gravitational parameter
+EARTH_RADIUS_KM = 6378.137  # WGS-84 equatorial radius
+EARTH_J2 = 1.08262668e-3
+EARTH_FLATTENING = 1 / 298.257223563
+SECONDS_PER_DAY = 86400
+
+@dataclass(frozen=True)
+class OrbitalElements:
+    semi_major_axis_km: float
+    eccentricity: float
+    inclination_deg: float
+    raan_deg: float  # Right ascension of the ascending node
+    arg_perigee_deg: float
+    mean_anomaly_deg: float
+    epoch: datetime  # UTC
+
+    @classmethod
+    def circular(cls, altitude_km: float, inclination_deg: float, epoch: datetime,
+                 raan_deg: float = 0.0, mean_anomaly_deg: float = 0.0) -> "OrbitalElements":
+        """Elements of a circular orbit at altitude_km above the equatorial radius."""
+        return cls(EARTH_RADIUS_KM + altitude_km, 0.0, inclination_deg, raan_deg, 0.0, mean_anomaly_deg, epoch)
+
+    @property
+    def period_s(self) -> float:
+        return 2 * np.pi * np.sqrt(self.semi_major_axis_km ** 3 / EARTH_MU_KM3_S2)
+
+@dataclass(frozen=True)
+class GroundStation:
+    name: str
+    latitude_deg: float
+    longitude_deg: float
+    altitude_m: float = 0.0
+    min_elevation_deg: float = 5.0
+    # Optional horizon mask as (azimuth_deg, elevation_deg) points, interpolated around the circle;
+    # the station sees the satellite above the higher of the mask and min_elevation_deg
+    elevation_mask: Tuple[Tuple[float, float], ...] = ()
+
+    def mask_elevation_deg(self, azimuth_deg: np.ndarray) -> np.ndarray:
+        """Minimum usable elevation at each azimuth."""
+        if not self.elevation_mask:
+            return np.full(np.shape(azimuth_deg), self.min_elevation_deg)
+        points = sorted(self.elevation_mask)
+        azimuths = np.array([a for a, _ in points], dtype=float)
+        elevations = np.array([e for _, e in points], dtype=float)
+        mask = np.interp(np.mod(azimuth_deg, 360), azimuths, elevations, period=360)
+        return np.maximum(mask, self.min_elevation_deg)
+
+    def ecef_km(self) -> np.ndarray:
+        """Station position in the Earth-fixed frame (WGS-84)."""
+        lat, lon = np.radians(self.latitude_deg), np.radians(self.longitude_deg)
+        e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+        n = EARTH_RADIUS_KM / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+        h = self.altitude_m / 1000
+        return np.array([(n + h) * np.cos(lat) * np.cos(lon),
+                         (n + h) * np.cos(lat) * np.sin(lon),
+                         (n * (1 - e2) + h) * np.sin(lat)])
+
+@dataclass(frozen=True)
+class Ephemeris:
+    start: datetime
+    step_s: float
+    times_s: np.ndarray  # Seconds since start, read-only
+    ecef_km: np.ndarray  # (len(times_s), 3) Earth-fixed positions, read-only
+
+@dataclass(frozen=True)
+class LookAngles:
+    azimuth_deg: np.ndarray
+    elevation_deg: np.ndarray
+    range_km: np.ndarray
+
+@dataclass(frozen=True)
+class Pass:
+    station: str
+    start: datetime  # Acquisition of signal
+    end: datetime  # Loss of signal
+    max_elevation_deg: float
+    start_index: int  # Ephemeris grid points start_index..end_index-1 lie inside the pass
+    end_index: int
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end - self.start).total_seconds()
+
+def _utc(moment: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+def gmst_rad(moments_unix_s: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal angle for UNIX times (UT1 taken as UTC)."""
+    days_since_j2000 = moments_unix_s / SECONDS_PER_DAY + 2440587.5 - 2451545.0
+    return np.radians(np.mod(280.46061837 + 360.98564736629 * days_since_j2000, 360))
+
+def propagate_eci_km(elements: OrbitalElements, start: datetime, times_s: np.ndarray) -> np.ndarray:
+    """Inertial positions at times_s seconds after start, shape (len(times_s), 3)."""
+    a, e = elements.semi_major_axis_km, elements.eccentricity
+    inclination = np.radians(elements.inclination_deg)
+    dt = (_utc(start) - _utc(elements.epoch)).total_seconds() + np.asarray(times_s, dtype=float)
+
+    # Secular J2 drift of the node, perigee and mean anomaly
+    n = np.sqrt(EARTH_MU_KM3_S2 / a ** 3)
+    factor = 0.75 * n * EARTH_J2 * (EARTH_RADIUS_KM / (a * (1 - e * e))) ** 2
+    cos_i = np.cos(inclination)
+    raan = np.radians(elements.raan_deg) - 2 * factor * cos_i * dt
+    arg_perigee = np.radians(elements.arg_perigee_deg) + factor * (5 * cos_i ** 2 - 1) * dt
+    mean_anomaly = np.radians(elements.mean_anomaly_deg) + (n + factor * np.sqrt(1 - e * e) * (3 * cos_i ** 2 - 1)) * dt
+
+    # Kepler's equation by Newton iteration (converges in a few steps for CubeSat orbits)
+    mean_anomaly = np.mod(mean_anomaly, 2 * np.pi)
+    eccentric = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(6):
+        eccentric -= (eccentric - e * np.sin(eccentric) - mean_anomaly) / (1 - e * np.cos(eccentric))
+    x_p = a * (np.cos(eccentric) - e)
+    y_p = a * np.sqrt(1 - e * e) * np.sin(eccentric)
+
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(arg_perigee), np.sin(arg_perigee)
+    sin_i = np.sin(inclination)
+    return np.column_stack((
+        (cos_o * cos_w - sin_o * sin_w * cos_i) * x_p + (-cos_o * sin_w - sin_o * cos_w * cos_i) * y_p,
+        (sin_o * cos_w + cos_o * sin_w * cos_i) * x_p + (-sin_o * sin_w + cos_o * cos_w * cos_i) * y_p,
+        sin_w * sin_i * x_p + cos_w * sin_i * y_p,
+    ))
+
+# A one-year ephemeris at 10 s steps takes about 100 MB, so the cache is bounded by size too
+_EPHEMERIDES = MemoCache("ephemerides", maxsize=16, maxbytes=256 * 2 ** 20,
+                         sizeof=lambda ephemeris: ephemeris.times_s.nbytes + ephemeris.ecef_km.nbytes)
+_PASSES = MemoCache("passes", maxsize=32)
+
+@_EPHEMERIDES.memoize
+def propagate_ephemeris(elements: OrbitalElements, start: datetime, duration_s: float,
+                        step_s: float = 10.0) -> Ephemeris:
+    """Earth-fixed positions every step_s seconds over duration_s from start.
+
+    Cached by (elements, start, duration_s, step_s), so several stations, and repeated
+    analyses of the same orbit, share one propagation."""
+    times_s = np.arange(0.0, duration_s + step_s / 2, step_s)
+    eci = propagate_eci_km(elements, start, times_s)
+    theta = gmst_rad(_utc(start).timestamp() + times_s)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    ecef = np.column_stack((cos_t * eci[:, 0] + sin_t * eci[:, 1],
+                            -sin_t * eci[:, 0] + cos_t * eci[:, 1],
+                            eci[:, 2]))
+    times_s.flags.writeable = False
+    ecef.flags.writeable = False  # Shared through the cache
+    return Ephemeris(start, step_s, times_s, ecef)
+
+def look_angles(ephemeris: Ephemeris, station: GroundStation,
+                index: Optional[Union[slice, np.ndarray]] = None) -> LookAngles:
+    """Azimuth, elevation and range from station to every ephemeris point, or to the points in index."""
+    positions = ephemeris.ecef_km if index is None else ephemeris.ecef_km[index]
+    lat, lon = np.radians(station.latitude_deg), np.radians(station.longitude_deg)
+    rho = positions - station.ecef_km()
+    east = -np.sin(lon) * rho[:, 0] + np.cos(lon) * rho[:, 1]
+    north = (-np.sin(lat) * np.cos(lon) * rho[:, 0] - np.sin(lat) * np.sin(lon) * rho[:, 1]
+             + np.cos(lat) * rho[:, 2])
+    up = np.cos(lat) * np.cos(lon) * rho[:, 0] + np.cos(lat) * np.sin(lon) * rho[:, 1] + np.sin(lat) * rho[:, 2]
+    range_km = np.sqrt(east ** 2 + north ** 2 + up ** 2)
+    return LookAngles(azimuth_deg=np.mod(np.degrees(np.arctan2(east, north)), 360),
+                      elevation_deg=np.degrees(np.arcsin(up / range_km)),
+                      range_km=range_km)
+
+def station_passes(ephemeris: Ephemeris, station: GroundStation) -> List[Pass]:
+    """Passes over one station, with start and end interpolated where elevation crosses the mask."""
+    angles = look_angles(ephemeris, station)
+    clearance = angles.elevation_deg - station.mask_elevation_deg(angles.azimuth_deg)
+    visible = clearance >= 0
+    edges = np.flatnonzero(np.diff(visible.astype(np.int8)))
+    starts = edges[~visible[edges]] + 1  # First visible point of each pass
+    ends = edges[visible[edges]] + 1  # First point after each pass
+    if visible[0]:
+        starts = np.concatenate(([0], starts))
+    if visible[-1]:
+        ends = np.concatenate((ends, [visible.size]))
+
+    def crossing(before: int, after: int) -> float:
+        """Time at which clearance crosses zero between two grid points."""
+        c0, c1 = clearance[before], clearance[after]
+        return ephemeris.times_s[before] + ephemeris.step_s * (c0 / (c0 - c1) if c0 != c1 else 0.0)
+
+    start_time = _utc(ephemeris.start)
+    passes = []
+    for first, stop in zip(starts, ends):
+        aos = crossing(first - 1, first) if first > 0 else ephemeris.times_s[0]
+        los = crossing(stop - 1, stop) if stop < visible.size else ephemeris.times_s[-1]
+        passes.append(Pass(
+            station=station.name,
+            start=start_time + timedelta(seconds=float(aos)),
+            end=start_time + timedelta(seconds=float(los)),
+            max_elevation_deg=float(angles.elevation_deg[first:stop].max()),
+            start_index=int(first),
+            end_index=int(stop),
+        ))
+    return passes
+
+def find_passes(elements: OrbitalElements, stations: Sequence[GroundStation], start: datetime,
+                days: float, step_s: float = 10.0) -> List[Pass]:
+    """Passes over every station during days from start, sorted by start time (cached by the arguments)."""
+    def predict() -> Tuple[Pass, ...]:
+        ephemeris = propagate_ephemeris(elements, start, days * SECONDS_PER_DAY, step_s)
+        passes = [p for station in stations for p in station_passes(ephemeris, station)]
+        return tuple(sorted(passes, key=lambda p: p.start))
+    return list(_PASSES.get_or_compute((elements, tuple(stations), start, days, step_s), predict))
+
+def contact_windows(passes: Sequence[Pass]) -> List[Tuple[datetime, datetime]]:
+    """Merge passes that overlap in time (e.g. at different stations) into contact windows, sorted by start.
+
+    One radio can only downlink once, so overlapping passes add no capacity."""
+    windows: List[Tuple[datetime, datetime]] = []
+    for p in sorted(passes, key=lambda p: p.start):
+        if windows and p.start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], p.end))
+        else:
+            windows.append((p.start, p.end))
+    return windows
+
+def data_budget_params_from_passes(passes: Sequence[Pass], days: float, data_rate_mbps: float,
+                                   storage_capacity_gb: float, downlink_rate_mbps: float) -> DataBudgetParams:
+    """DataBudgetParams with the contact time of predicted passes, overlapping passes merged.
+
+    passes_per_day is the rounded number of contact windows per day and pass_duration_min their
+    mean length; daily_downlink_gb carries the exact mean daily volume over the contact time."""
+    if days <= 0:
+        raise ValueError("days must be positive")
+    durations = [(end - start).total_seconds() for start, end in contact_windows(passes)]
+    gb = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+    return DataBudgetParams(
+        data_rate_mbps=data_rate_mbps,
+        storage_capacity_gb=storage_capacity_gb,
+        downlink_rate_mbps=downlink_rate_mbps,
+        pass_duration_min=float(np.mean(durations)) / 60 if durations else 0.0,
+        passes_per_day=int(round(len(durations) / days)),
+        daily_downlink_gb=downlink_rate_mbps * 1e6 * sum(durations) / days / gb,
+    )
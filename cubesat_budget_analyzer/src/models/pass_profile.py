@@ -0,0 +1,114 @@
+"""Time-resolved link budget over satellite passes.
+
+The single-point LinkBudgetCalculator is evaluated at zenith distance, the best case of a
+pass. Here every ephemeris step inside each pass gets its own slant range, free-space
+loss and elevation-dependent atmospheric loss, and the margin is computed for all steps of
+all passes in one calculate_batch call. The steps whose margin clears a threshold are
+integrated into the data volume each pass can deliver at a given rate.
+
+    ephemeris = propagate_ephemeris(elements, start, days * SECONDS_PER_DAY, step_s)
+    passes = station_passes(ephemeris, station)
+    profiles = pass_profiles(params, ephemeris, station, passes, data_rate_mbps=9.6)
+    profiles.data_volume_gb.sum()
+"""
+from dataclasses import dataclass, fields
+from typing import Sequence
+
+import numpy as np
+
+from .data_budget import DataBudgetCalculator
+from .link_budget import LinkBudgetBatchParams, LinkBudgetBatchResults, LinkBudgetCalculator, LinkBudgetParams
+from .orbit import EARTH_RADIUS_KM, Ephemeris, GroundStation, Pass, look_angles
+
+# Below this elevation the cosecant law overstates the atmospheric loss, so it is held constant
+MIN_COSECANT_ELEVATION_DEG = 5.0
+
+@dataclass
+class PassProfiles:
+    """Per-step link budget of several passes, stored back to back.
+
+    The steps of pass k are rows offsets[k]:offsets[k + 1] of every per-step array."""
+    offsets: np.ndarray
+    times_s: np.ndarray  # Seconds since the ephemeris start
+    elevation_deg: np.ndarray
+    slant_range_km: np.ndarray
+    fspl_db: np.ndarray
+    atm_loss_db: np.ndarray
+    received_power_dbm: np.ndarray
+    cn0_dbhz: np.ndarray
+    cnr_db: np.ndarray
+    ber: np.ndarray
+    link_margin_db: np.ndarray
+    usable: np.ndarray  # Steps whose margin clears the threshold
+    usable_time_s: np.ndarray  # Per pass
+    data_volume_gb: np.ndarray  # Per pass
+
+    def pass_slice(self, k: int) -> slice:
+        """Rows of the per-step arrays that belong to pass k."""
+        return slice(int(self.offsets[k]), int(self.offsets[k + 1]))
+
+def slant_range_km(altitude_km: float, elevation_deg: np.ndarray) -> np.ndarray:
+    """Distance to a satellite at altitude_km seen at elevation_deg from a station on a spherical Earth."""
+    elevation = np.radians(elevation_deg)
+    orbit_radius = EARTH_RADIUS_KM + altitude_km
+    return np.sqrt(orbit_radius ** 2 - (EARTH_RADIUS_KM * np.cos(elevation)) ** 2) - EARTH_RADIUS_KM * np.sin(elevation)
+
+def _elevation_columns(params: LinkBudgetParams, range_km: np.ndarray, elevation_deg: np.ndarray) -> dict:
+    """params as batch columns, with the free-space and cosecant atmospheric losses of each step."""
+    sine = np.sin(np.radians(np.maximum(elevation_deg, MIN_COSECANT_ELEVATION_DEG)))
+    columns = {f.name: getattr(params, f.name) for f in fields(LinkBudgetParams)}
+    columns.update(path_loss_db=LinkBudgetCalculator.calculate_fspl(range_km, params.freq_ghz),
+                   atm_loss_db=params.atm_loss_db / sine)
+    return columns
+
+def elevation_sweep(params: LinkBudgetParams, altitude_km: float, elevation_deg: np.ndarray) -> LinkBudgetBatchResults:
+    """The link at each elevation of a circular orbit at altitude_km, with the losses of pass_profiles."""
+    elevation_deg = np.asarray(elevation_deg, dtype=float)
+    columns = _elevation_columns(params, slant_range_km(altitude_km, elevation_deg), elevation_deg)
+    return LinkBudgetCalculator.calculate_batch(LinkBudgetBatchParams(**columns))
+
+def pass_profiles(params: LinkBudgetParams, ephemeris: Ephemeris, station: GroundStation, passes: Sequence[Pass],
+                  data_rate_mbps: float, margin_threshold_db: float = 0.0) -> PassProfiles:
+    """Evaluate the link at every ephemeris step of each pass over station.
+
+    params.path_loss_db is replaced by the free-space loss of the slant range at each step,
+    and params.atm_loss_db is taken as the zenith loss and scaled by the cosecant of the
+    elevation. A step is usable when its margin is at least margin_threshold_db; each
+    usable step carries data_rate_mbps for one ephemeris step."""
+    if any(p.station != station.name for p in passes):
+        raise ValueError(f"All passes must be over station {station.name!r}")
+
+    # Row numbers of every step of every pass, concatenated without a Python loop over steps
+    lengths = np.array([p.end_index - p.start_index for p in passes], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    starts = np.array([p.start_index for p in passes], dtype=np.int64)
+    index = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+    angles = look_angles(ephemeris, station, index)
+    columns = _elevation_columns(params, angles.range_km, angles.elevation_deg)
+    fspl_db, atm_loss_db = columns["path_loss_db"], columns["atm_loss_db"]
+    results = LinkBudgetCalculator.calculate_batch(LinkBudgetBatchParams(**columns))
+    cn0_dbhz = results.cnr_db + 10 * np.log10(params.bandwidth_hz)
+
+    usable = results.link_margin_db >= margin_threshold_db
+    usable_steps = np.concatenate(([0], np.cumsum(usable)))
+    usable_time_s = (usable_steps[offsets[1:]] - usable_steps[offsets[:-1]]) * ephemeris.step_s
+    bits_per_gb = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+    data_volume_gb = data_rate_mbps * 1e6 * usable_time_s / bits_per_gb
+
+    return PassProfiles(
+        offsets=offsets,
+        times_s=ephemeris.times_s[index],
+        elevation_deg=angles.elevation_deg,
+        slant_range_km=angles.range_km,
+        fspl_db=fspl_db,
+        atm_loss_db=atm_loss_db,
+        received_power_dbm=results.received_power_dbm,
+        cn0_dbhz=cn0_dbhz,
+        cnr_db=results.cnr_db,
+        ber=results.ber,
+        link_margin_db=results.link_margin_db,
+        usable=usable,
+        usable_time_s=usable_time_s,
+        data_volume_gb=data_volume_gb
+    )
@@ -0,0 +1,213 @@
+"""Time-stepped simulation of onboard storage fill, drain and backlog.
+
+DataBudgetCalculator answers with a steady daily deficit. Here storage follows the
+mission timeline step by step:
+
+    fill[t] = min(max(fill[t-1] + generated[t] - downlink[t], 0), capacity)
+
+Each step is the function x -> min(max(x + a, lo), hi), and such clamp-shift functions
+compose into another of the same form, so the whole recurrence is an associative scan.
+It is evaluated one block at a time with a vectorized Hillis-Steele prefix scan (log2 of
+the block length array passes), which handles a year at one-second resolution with no
+per-step Python loop. Dropped data, unused downlink time and the FIFO latency of every
+downlinked bit follow from the fill level with cumulative sums and searchsorted.
+
+    generated = duty_cycle_profile(steps, step_s, rate_mbps=2.0, period_s=5700, on_s=1200)
+    downlink = window_profile(steps, step_s, rate_mbps=9.6, windows=windows_from_passes(passes, start))
+    results = simulate_storage(generated, downlink, step_s, capacity_gb=32)
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .cache import MemoCache
+from .data_budget import DataBudgetCalculator, DataBudgetParams
+from .orbit import contact_windows
+
+_BITS_PER_GB = DataBudgetCalculator.BITS_TO_BYTES * DataBudgetCalculator.BYTES_TO_GB
+_SIMULATIONS = MemoCache("storage_simulations", maxsize=16)
+
+@dataclass
+class StorageSimulationResults:
+    step_s: float
+    record_every: int  # fill_gb and dropped_gb hold every record_every-th step
+    fill_gb: np.ndarray = field(repr=False)  # Storage level at the end of each recorded step
+    dropped_gb: np.ndarray = field(repr=False)  # Cumulative data dropped on a full storage, per recorded step
+    total_generated_gb: float
+    total_downlinked_gb: float
+    total_dropped_gb: float
+    unused_downlink_gb: float  # Downlink capacity left idle because storage was empty
+    final_fill_gb: float
+    max_fill_gb: float
+    first_full_s: float  # Time the storage first filled up; NaN if it never did
+    mean_latency_s: float  # Volume-weighted FIFO delay between generation and downlink; NaN if nothing was sent
+    p95_latency_s: float
+    max_latency_s: float
+
+def duty_cycle_profile(steps: int, step_s: float, rate_mbps: float, period_s: float, on_s: float,
+                       phase_s: float = 0.0) -> np.ndarray:
+    """Per-step data rate of a payload that runs on_s seconds out of every period_s."""
+    times = np.arange(steps) * step_s + phase_s
+    return np.where(np.mod(times, period_s) < on_s, rate_mbps, 0.0)
+
+def window_profile(steps: int, step_s: float, rate_mbps: float, windows: Iterable[Tuple[float, float]]) -> np.ndarray:
+    """Per-step data rate that is rate_mbps during the (start_s, end_s) windows, counting partial steps."""
+    coverage = np.zeros(steps + 1)
+    for start_s, end_s in windows:
+        # Add the covered fraction of each step with a difference array, then integrate it
+        for edge_s, sign in ((start_s, 1.0), (end_s, -1.0)):
+            position = min(max(edge_s / step_s, 0.0), steps)
+            index = int(position)
+            if index < steps:
+                coverage[index] += sign * (1 - (position - index))
+                coverage[index + 1] += sign * (position - index)
+    return rate_mbps * np.cumsum(coverage[:steps])
+
+def windows_from_passes(passes: Sequence, start: datetime) -> List[Tuple[float, float]]:
+    """(start_s, end_s) downlink windows, in seconds after start, of orbit.Pass objects.
+
+    Passes that overlap (at different stations) are merged, so their time is not counted twice."""
+    return [((aos - start).total_seconds(), (los - start).total_seconds()) for aos, los in contact_windows(passes)]
+
+def _clamp_shift_scan(shift: np.ndarray, capacity: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Inclusive prefix composition of the steps x -> clip(x + shift[i], 0, capacity).
+
+    Returns (a, lo, hi) such that the level after step i, starting from x, is clip(x + a[i], lo[i], hi[i]).
+    Composing (a1, lo1, hi1) then (a2, lo2, hi2) gives (a1 + a2, clip(lo1 + a2, lo2, hi2), clip(hi1 + a2, lo2, hi2))."""
+    a = shift.copy()
+    lo = np.zeros_like(a)
+    hi = np.full_like(a, capacity)
+    distance = 1
+    while distance < a.size:
+        a2, lo2, hi2 = a[distance:], lo[distance:], hi[distance:]
+        new_lo = np.clip(lo[:-distance] + a2, lo2, hi2)
+        new_hi = np.clip(hi[:-distance] + a2, lo2, hi2)
+        a[distance:] = a[:-distance] + a2
+        lo[distance:] = new_lo
+        hi[distance:] = new_hi
+        distance *= 2
+    return a, lo, hi
+
+def simulate_storage(generated_mbps: ArrayLike, downlink_mbps: ArrayLike, step_s: float, capacity_gb: float,
+                     initial_fill_gb: float = 0.0, record_every: int = 1, block_steps: int = 1 << 16) -> StorageSimulationResults:
+    """Simulate storage over len(generated_mbps) steps of step_s seconds.
+
+    generated_mbps and downlink_mbps are per-step rates (scalars broadcast). Data that does
+    not fit is dropped as it arrives; stored data is downlinked oldest first."""
+    generated_mbps, downlink_mbps = np.broadcast_arrays(np.asarray(generated_mbps, dtype=float),
+                                                        np.asarray(downlink_mbps, dtype=float))
+    steps = generated_mbps.size
+    if steps == 0:
+        raise ValueError("The simulation needs at least one step")
+    gb_per_mbps_step = 1e6 * step_s / _BITS_PER_GB
+
+    fill_records, dropped_records = [], []
+    accepted_total = np.empty(steps)  # Cumulative accepted data, for the FIFO latency lookup
+    latencies, weights = [], []
+    level, accepted_carry, downlinked_carry, dropped_carry, unused_total = initial_fill_gb, 0.0, 0.0, 0.0, 0.0
+    first_full = np.nan
+    max_fill = initial_fill_gb
+
+    for start in range(0, steps, block_steps):
+        stop = min(start + block_steps, steps)
+        generated = generated_mbps[start:stop] * gb_per_mbps_step
+        downlink = downlink_mbps[start:stop] * gb_per_mbps_step
+
+        a, lo, hi = _clamp_shift_scan(generated - downlink, capacity_gb)
+        fill = np.clip(level + a, lo, hi)
+        previous = np.concatenate(([level], fill[:-1]))
+        unclipped = previous + generated - downlink
+        dropped = np.maximum(unclipped - capacity_gb, 0.0)
+        unused = np.maximum(-unclipped, 0.0)
+        downlinked = downlink - unused
+
+        accepted_cumulative = accepted_carry + np.cumsum(generated - dropped)
+        accepted_total[start:stop] = accepted_cumulative
+        dropped_cumulative = dropped_carry + np.cumsum(dropped)
+
+        # FIFO: the data sent in step t sits at cumulative positions (D[t-1], D[t]] of the accepted
+        # stream; its midpoint was generated at the first step where the accepted total reached it
+        downlinked_cumulative = downlinked_carry + np.cumsum(downlinked)
+        sending = np.flatnonzero(downlinked > 0)
+        if sending.size:
+            # Data present at the start counts as generated at step 0
+            middle = downlinked_cumulative[sending] - downlinked[sending] / 2 - initial_fill_gb
+            origin = np.searchsorted(accepted_total[:stop], middle, side="left")
+            origin = np.minimum(origin, start + sending)
+            latencies.append((start + sending - origin) * step_s)
+            weights.append(downlinked[sending])
+
+        full = np.flatnonzero(fill >= capacity_gb)
+        if np.isnan(first_full) and full.size:
+            first_full = float((start + full[0] + 1) * step_s)
+        max_fill = max(max_fill, float(fill.max()))
+
+        record = np.arange(start, stop)
+        record = record[record % record_every == 0] - start
+        fill_records.append(fill[record])
+        dropped_records.append(dropped_cumulative[record])
+
+        level = float(fill[-1])
+        accepted_carry = float(accepted_cumulative[-1])
+        downlinked_carry = float(downlinked_cumulative[-1])
+        dropped_carry = float(dropped_cumulative[-1])
+        unused_total += float(unused.sum())
+
+    if latencies:
+        latency = np.concatenate(latencies)
+        weight = np.concatenate(weights)
+        order = np.argsort(latency, kind="stable")
+        share = np.cumsum(weight[order]) / weight.sum()
+        mean_latency = float(np.average(latency, weights=weight))
+        p95_latency = float(latency[order][min(np.searchsorted(share, 0.95), order.size - 1)])
+        max_latency = float(latency.max())
+    else:
+        mean_latency = p95_latency = max_latency = np.nan
+
+    return StorageSimulationResults(
+        step_s=step_s,
+        record_every=record_every,
+        fill_gb=np.concatenate(fill_records),
+        dropped_gb=np.concatenate(dropped_records),
+        total_generated_gb=float(generated_mbps.sum() * gb_per_mbps_step),
+        total_downlinked_gb=downlinked_carry,
+        total_dropped_gb=dropped_carry,
+        unused_downlink_gb=unused_total,
+        final_fill_gb=level,
+        max_fill_gb=max_fill,
+        first_full_s=first_full,
+        mean_latency_s=mean_latency,
+        p95_latency_s=p95_latency,
+        max_latency_s=max_latency
+    )
+
+@_SIMULATIONS.memoize
+def simulate_data_budget(params: DataBudgetParams, days: float, step_s: float = 1.0) -> StorageSimulationResults:
+    """Simulate a DataBudgetParams mission: constant generation, passes evenly spaced over each day.
+
+    When daily_downlink_gb is set it is spread evenly over the passes, in place of
+    downlink_rate_mbps, as DataBudgetCalculator counts it; params with a daily volume but no
+    pass time are rejected. Cached by its arguments, so repeated views of the same budget
+    share one simulation."""
+    steps = int(round(days * DataBudgetCalculator.SECONDS_PER_DAY / step_s))
+    passes = int(round(params.passes_per_day * days))
+    spacing_s = DataBudgetCalculator.SECONDS_PER_DAY / params.passes_per_day if params.passes_per_day else 0.0
+    duration_s = params.pass_duration_min * 60
+    downlink_rate_mbps = params.downlink_rate_mbps
+    if params.daily_downlink_gb is not None:
+        daily_pass_s = params.passes_per_day * duration_s
+        if daily_pass_s > 0:
+            downlink_rate_mbps = params.daily_downlink_gb * _BITS_PER_GB / daily_pass_s / 1e6
+        elif params.daily_downlink_gb > 0:
+            raise ValueError("daily_downlink_gb needs passes_per_day and pass_duration_min to place the downlink")
+        else:
+            downlink_rate_mbps = 0.0
+    windows = [(k * spacing_s, k * spacing_s + duration_s) for k in range(passes)]
+    downlink = window_profile(steps, step_s, downlink_rate_mbps, windows)
+    results = simulate_storage(params.data_rate_mbps, downlink, step_s, params.storage_capacity_gb)
+    results.fill_gb.flags.writeable = False
+    results.dropped_gb.flags.writeable = False  # Shared through the cache
+    return results
@@ -0,0 +1,180 @@
+"""Parameter sweeps over the link and data budget models.
+
+A TradeStudy takes fixed values and swept values (lists, ranges or arrays) for any
+LinkBudgetParams / DataBudgetParams fields. The Cartesian product of the swept values is
+never built: each chunk of row numbers is turned into parameter columns with
+np.unravel_index, evaluated with the vectorized calculators and filtered before it
+leaves the worker, so only qualifying rows are ever collected.
+
+    study = TradeStudy(
+        fixed={"tx_gain_dbi": 5, "rx_gain_dbi": 20, ...},
+        sweep={"tx_power_dbm": range(20, 41), "path_loss_db": np.linspace(150, 170, 201), ...},
+        filters=["link_margin_db >= 3"],
+    )
+    frame = study.run()                 # pandas DataFrame
+    study.to_parquet("study.parquet")   # streamed to disk; needs pyarrow
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import MISSING, fields
+from enum import Enum
+import operator
+import os
+import re
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_budget import DataBudgetBatchParams, DataBudgetCalculator, DataBudgetParams
+from .link_budget import LinkBudgetBatchParams, LinkBudgetCalculator, LinkBudgetParams
+
+LINK_FIELDS = [field.name for field in fields(LinkBudgetParams)]
+DATA_FIELDS = [field.name for field in fields(DataBudgetParams)]
+# Fields without a default, which a study must give to run that model
+LINK_REQUIRED = [field.name for field in fields(LinkBudgetParams) if field.default is MISSING]
+DATA_REQUIRED = [field.name for field in fields(DataBudgetParams) if field.default is MISSING]
+
+_FILTER_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$")
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def parse_filter(text: str) -> Tuple[str, Any, float]:
+    """Parse a filter such as "link_margin_db >= 3" into (column, comparison, value)."""
+    match = _FILTER_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid filter: {text!r} (expected e.g. 'link_margin_db >= 3')")
+    column, symbol, value = match.groups()
+    return column, _OPERATORS[symbol], float(value)
+
+
+class TradeStudy:
+    def __init__(self, fixed: Mapping[str, Any], sweep: Mapping[str, Sequence], filters: Sequence[str] = (),
+                 chunk_size: int = 100_000, workers: Optional[int] = None):
+        """Set up a study; workers=1 evaluates in this process, None uses one process per CPU."""
+        overlap = set(fixed) & set(sweep)
+        if overlap:
+            raise ValueError(f"Parameters both fixed and swept: {sorted(overlap)}")
+        unknown = (set(fixed) | set(sweep)) - set(LINK_FIELDS) - set(DATA_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+
+        self.fixed = dict(fixed)
+        self.sweep_names = list(sweep)
+        self.sweep_values = [np.asarray(list(values) if isinstance(values, range) else values)
+                             for values in sweep.values()]
+        if any(values.ndim != 1 or values.size == 0 for values in self.sweep_values):
+            raise ValueError("Each swept parameter needs a non-empty one-dimensional list of values")
+        self.shape = tuple(values.size for values in self.sweep_values)
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+        given = set(fixed) | set(sweep)
+        self.run_link = given.issuperset(LINK_REQUIRED)
+        self.run_data = given.issuperset(DATA_REQUIRED)
+        if not (self.run_link or self.run_data):
+            raise ValueError("Give every required LinkBudgetParams field, every required DataBudgetParams field, or both")
+
+        self.filters = [parse_filter(text) for text in filters]
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def chunks(self) -> Iterator[Tuple[int, int]]:
+        """Yield (start, stop) row ranges covering the whole grid."""
+        for start in range(0, self.size, self.chunk_size):
+            yield start, min(start + self.chunk_size, self.size)
+
+    def evaluate_chunk(self, start: int, stop: int) -> pd.DataFrame:
+        """Evaluate grid rows start..stop-1 and return the ones passing every filter."""
+        indices = np.unravel_index(np.arange(start, stop), self.shape)
+        columns: Dict[str, np.ndarray] = {"row": np.arange(start, stop)}
+        for name, values, index in zip(self.sweep_names, self.sweep_values, indices):
+            columns[name] = values[index]
+        inputs = {**self.fixed, **{name: columns[name] for name in self.sweep_names}}
+
+        if self.run_link:
+            results = LinkBudgetCalculator.calculate_batch(
+                LinkBudgetBatchParams(**{name: inputs[name] for name in LINK_FIELDS if name in inputs}))
+            columns.update(self._result_columns(results, stop - start))
+        if self.run_data:
+            results = DataBudgetCalculator.calculate_batch(
+                DataBudgetBatchParams(**{name: inputs[name] for name in DATA_FIELDS if name in inputs}))
+            columns.update(self._result_columns(results, stop - start))
+
+        keep = np.ones(stop - start, dtype=bool)
+        for column, compare, value in self.filters:
+            if column not in columns:
+                raise ValueError(f"Cannot filter on {column!r}: not a swept parameter or result")
+            keep &= compare(columns[column], value)
+        return pd.DataFrame({name: self._plain(values[keep]) for name, values in columns.items()})
+
+    @staticmethod
+    def _result_columns(results, rows: int) -> Dict[str, np.ndarray]:
+        """Return every field of a batch results object as a column of length rows."""
+        return {field.name: np.broadcast_to(getattr(results, field.name), (rows,))
+                for field in fields(results)}
+
+    @staticmethod
+    def _plain(values: np.ndarray) -> np.ndarray:
+        """Store enum columns (modulation, propagation) by their display value."""
+        if values.dtype == object and values.size and isinstance(values[0], Enum):
+            return np.array([value.value for value in values])
+        return values
+
+    def iter_results(self) -> Iterator[pd.DataFrame]:
+        """Yield the filtered rows of each chunk in grid order, keeping only a few chunks in flight."""
+        if self.workers == 1:
+            for start, stop in self.chunks():
+                yield self.evaluate_chunk(start, stop)
+            return
+
+        workers = self.workers or os.cpu_count() or 1
+        max_in_flight = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: List = []
+            for start, stop in self.chunks():
+                pending.append(pool.submit(self.evaluate_chunk, start, stop))
+                if len(pending) >= max_in_flight:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+
+    def run(self) -> pd.DataFrame:
+        """Evaluate the whole grid and return the qualifying rows as one DataFrame."""
+        frames = [frame for frame in self.iter_results() if len(frame)]
+        if not frames:
+            return self.evaluate_chunk(0, 0)  # Empty, but with the right columns
+        return pd.concat(frames, ignore_index=True)
+
+    def to_parquet(self, path: str) -> int:
+        """Stream the qualifying rows into a Parquet file chunk by chunk; return the number of rows.
+
+        Needs the optional pyarrow dependency (pip install cubesat_budget_analyzer[trade])."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Writing Parquet files requires pyarrow: pip install pyarrow") from error
+
+        writer = None
+        rows = 0
+        try:
+            for frame in self.iter_results():
+                if not len(frame):
+                    continue  # Empty chunks carry no column types to build the schema from
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(frame)
+            if writer is None:
+                pq.write_table(pa.Table.from_pandas(self.evaluate_chunk(0, 0), preserve_index=False), path)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
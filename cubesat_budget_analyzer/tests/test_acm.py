@@ -0,0 +1,78 @@
+"""ACM mode selection and the volumes it integrates over one or several stations."""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from models.acm import DVB_S2_MODCODS, Modcod, acm_downlink, efficient_modcods, select_modes
+from models.link_budget import LinkBudgetParams, ModulationScheme, PropagationModel
+from models.orbit import SECONDS_PER_DAY, GroundStation, OrbitalElements, propagate_ephemeris, station_passes
+from models.pass_profile import pass_profiles
+from models.storage_sim import simulate_data_budget
+
+EPOCH = datetime(2024, 3, 20, tzinfo=timezone.utc)
+LINK = LinkBudgetParams(
+    tx_power_dbm=33.0, tx_gain_dbi=6.0, rx_gain_dbi=35.0, path_loss_db=0.0, atm_loss_db=1.5, sys_temp_k=500.0,
+    bandwidth_hz=5e6, freq_ghz=8.2, modulation=ModulationScheme.QPSK, propagation=PropagationModel.AWGN,
+    required_ebn0_db=9.6)
+
+def station_profiles(ephemeris, *stations):
+    return [pass_profiles(LINK, ephemeris, station, station_passes(ephemeris, station), data_rate_mbps=1.0)
+            for station in stations]
+
+@pytest.fixture(scope="module")
+def ephemeris():
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=97.4, epoch=EPOCH)
+    return propagate_ephemeris(elements, EPOCH, 2 * SECONDS_PER_DAY, 10.0)
+
+def test_efficient_modcods_drop_dominated_modes():
+    modes = efficient_modcods(DVB_S2_MODCODS)
+    assert modes == tuple(sorted(DVB_S2_MODCODS, key=lambda m: m.required_esn0_db))
+    dominated = Modcod("QPSK 1/2 slow", ModulationScheme.QPSK, 1 / 2, 0.9, 1.5)
+    tie = Modcod("QPSK 1/2 fast", ModulationScheme.QPSK, 1 / 2, 1.0, 1.0)
+    assert efficient_modcods([dominated, tie, DVB_S2_MODCODS[3]]) == (tie,)
+
+def test_select_modes_picks_the_best_closing_mode():
+    modes = efficient_modcods(DVB_S2_MODCODS)
+    thresholds = [m.required_esn0_db for m in modes]
+    esn0 = np.array([thresholds[0] - 0.01, thresholds[0], thresholds[3] + 0.5, thresholds[-1] + 10])
+    np.testing.assert_array_equal(select_modes(esn0, modes), [-1, 0, 3, len(modes) - 1])
+
+def test_pass_and_daily_volumes_integrate_the_step_rates(ephemeris):
+    (profiles,) = station_profiles(ephemeris, GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=5))
+    downlink = acm_downlink(profiles, ephemeris, symbol_rate_baud=5e6)
+    step_volume_gb = downlink.rate_mbps * 1e6 * ephemeris.step_s / 8e9
+    assert 0 < (downlink.mode_index >= 0).sum() < downlink.mode_index.size
+    for k in range(profiles.offsets.size - 1):
+        assert downlink.pass_volume_gb[k] == pytest.approx(step_volume_gb[profiles.pass_slice(k)].sum())
+    assert downlink.daily_volume_gb.size == 2
+    for day in range(2):
+        on_day = np.minimum(downlink.times_s // SECONDS_PER_DAY, 1) == day  # The final sample belongs to day 1
+        assert downlink.daily_volume_gb[day] == pytest.approx(step_volume_gb[on_day].sum())
+    assert downlink.daily_volume_gb.sum() == pytest.approx(downlink.pass_volume_gb.sum())
+
+def test_overlapping_passes_are_merged_at_the_best_step(ephemeris):
+    toulouse = GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=5)
+    aussaguel = GroundStation("Aussaguel", 43.4, 1.5, min_elevation_deg=5)
+    profiles = station_profiles(ephemeris, toulouse, aussaguel)
+    single = [acm_downlink(p, ephemeris, symbol_rate_baud=5e6) for p in profiles]
+    merged = acm_downlink(profiles, ephemeris, symbol_rate_baud=5e6)
+
+    # The same station twice adds nothing
+    assert acm_downlink([profiles[0]] * 2, ephemeris, 5e6).pass_volume_gb.tolist() == single[0].pass_volume_gb.tolist()
+
+    # Nearby stations see the same passes: one contact window each, never the sum of both
+    assert merged.pass_volume_gb.size == single[0].pass_volume_gb.size
+    assert np.all(np.diff(merged.times_s) > 0)
+    best = max(s.daily_volume_gb.sum() for s in single)
+    assert best <= merged.daily_volume_gb.sum() < sum(s.daily_volume_gb.sum() for s in single)
+    for s in single:
+        position = np.searchsorted(merged.times_s, s.times_s)
+        assert np.all(merged.rate_mbps[position] >= s.rate_mbps)
+
+def test_data_budget_params_place_the_daily_volume_in_passes(ephemeris):
+    (profiles,) = station_profiles(ephemeris, GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=5))
+    params = acm_downlink(profiles, ephemeris, symbol_rate_baud=5e6).data_budget_params(0.5, 32.0)
+    assert params.passes_per_day > 0 and params.pass_duration_min > 0
+    results = simulate_data_budget(params, 2, step_s=10.0)
+    assert results.total_downlinked_gb + results.unused_downlink_gb == pytest.approx(2 * params.daily_downlink_gb)
@@ -0,0 +1,28 @@
+"""The tabulated BER curves against the closed forms of LinkBudgetCalculator."""
+import numpy as np
+import pytest
+
+from models.ber import CodingScheme, ber, required_ebn0_db
+from models.link_budget import LinkBudgetCalculator, ModulationScheme
+
+@pytest.mark.parametrize("modulation", list(ModulationScheme))
+def test_forward_table_matches_calculate_ber(modulation):
+    ebn0_db = np.linspace(-10, 16, 521) + 0.003  # Mostly between grid points
+    expected = np.array([LinkBudgetCalculator._calculate_ber(modulation, x) for x in ebn0_db])
+    np.testing.assert_allclose(ber(modulation, ebn0_db), expected, rtol=1e-3)
+
+def test_required_ebn0_bpsk():
+    assert float(required_ebn0_db(ModulationScheme.BPSK, 1e-6)) == pytest.approx(10.53, abs=0.01)
+
+@pytest.mark.parametrize("coding", list(CodingScheme))
+def test_required_ebn0_inverts_ber(coding):
+    targets = np.array([1e-3, 1e-6, 1e-9])
+    np.testing.assert_allclose(ber(ModulationScheme.QPSK, required_ebn0_db(ModulationScheme.QPSK, targets, coding),
+                                   coding), targets, rtol=1e-6)
+
+@pytest.mark.parametrize("target", [0.5, 0.7, 0.0, -1e-3])
+def test_required_ebn0_rejects_unreachable_targets(target):
+    with pytest.raises(ValueError):
+        required_ebn0_db(ModulationScheme.BPSK, target, CodingScheme.CONV_K7_R12)
+    with pytest.raises(ValueError):
+        required_ebn0_db(ModulationScheme.BPSK, [1e-6, target])
@@ -0,0 +1,39 @@
+"""DataBudgetCalculator.calculate_batch must agree with calculate row by row."""
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from models.data_budget import DataBudgetBatchParams, DataBudgetCalculator, DataBudgetParams
+
+def data_grid():
+    for data_rate_mbps, downlink_rate_mbps, passes_per_day, daily_downlink_gb in itertools.product(
+            (0.5, 2.0, 10.0), (1.0, 9.6), (0, 4, 8), (None, 5.0)):
+        yield DataBudgetParams(
+            data_rate_mbps=data_rate_mbps, storage_capacity_gb=32.0, downlink_rate_mbps=downlink_rate_mbps,
+            pass_duration_min=10.0, passes_per_day=passes_per_day, daily_downlink_gb=daily_downlink_gb)
+
+def test_data_batch_matches_calculate():
+    params = list(data_grid())
+    batch = DataBudgetCalculator.calculate_batch(DataBudgetBatchParams.from_params(params))
+    assert np.isnan(batch.days_until_full).any() and np.isfinite(batch.days_until_full).any()
+    for i, p in enumerate(params):
+        single = DataBudgetCalculator.calculate(p)
+        assert batch.daily_data_gb[i] == pytest.approx(single.daily_data_gb)
+        assert batch.daily_downlink_capacity_gb[i] == pytest.approx(single.daily_downlink_capacity_gb)
+        assert batch.storage_usage_gb[i] == pytest.approx(single.storage_usage_gb)
+        assert batch.backlog_gb[i] == pytest.approx(single.backlog_gb)
+        assert batch.storage_exceeded[i] == single.storage_exceeded
+        if single.days_until_full is None:
+            assert math.isnan(batch.days_until_full[i])
+        else:
+            assert batch.days_until_full[i] == pytest.approx(single.days_until_full)
+
+def test_data_batch_broadcasts_columns():
+    batch = DataBudgetCalculator.calculate_batch(DataBudgetBatchParams(
+        data_rate_mbps=np.array([[0.5], [5.0]]), storage_capacity_gb=32.0, downlink_rate_mbps=9.6,
+        pass_duration_min=10.0, passes_per_day=np.array([2, 6])))
+    assert batch.days_until_full.shape == (2, 2)
+    single = DataBudgetCalculator.calculate(DataBudgetParams(5.0, 32.0, 9.6, 10.0, 2))
+    assert batch.days_until_full[1, 0] == pytest.approx(single.days_until_full)
@@ -0,0 +1,63 @@
+"""Fading averages against direct numerical integration over the fade distributions."""
+import numpy as np
+import pytest
+from scipy import integrate
+from scipy.special import erfc, i0e
+
+from models import fading
+
+SCHEMES = [(0.5, 1.0), (0.5, 2.0), (0.75, 10.0)]  # BPSK, QPSK, 16-QAM coefficients
+MEAN_EBN0_DB = [0.0, 10.0, 20.0, 30.0]
+
+def awgn_ber(scale, divisor, ebn0):
+    return scale * erfc(np.sqrt(ebn0 / divisor))
+
+def integrate_over_snr(pdf, scale, divisor, mean):
+    """Average BER over the instantaneous Eb/N0 density pdf, split at the mean to help quad."""
+    integrand = lambda g: awgn_ber(scale, divisor, g) * pdf(g)
+    head, _ = integrate.quad(integrand, 0, mean, limit=200, epsabs=0, epsrel=1e-10)
+    tail, _ = integrate.quad(integrand, mean, np.inf, limit=200, epsabs=0, epsrel=1e-10)
+    return head + tail
+
+@pytest.mark.parametrize("scale, divisor", SCHEMES)
+@pytest.mark.parametrize("ebn0_db", MEAN_EBN0_DB)
+def test_rayleigh(scale, divisor, ebn0_db):
+    mean = 10 ** (ebn0_db / 10)
+    expected = integrate_over_snr(lambda g: np.exp(-g / mean) / mean, scale, divisor, mean)
+    assert fading.rayleigh_ber(scale, divisor, ebn0_db) == pytest.approx(expected, rel=1e-6)
+
+@pytest.mark.parametrize("scale, divisor", SCHEMES)
+@pytest.mark.parametrize("ebn0_db", MEAN_EBN0_DB)
+@pytest.mark.parametrize("k_db", [0.0, 7.0, 15.0])
+def test_rician(scale, divisor, ebn0_db, k_db):
+    mean, k = 10 ** (ebn0_db / 10), 10 ** (k_db / 10)
+    def pdf(g):
+        z = 2 * np.sqrt(k * (1 + k) * g / mean)
+        return (1 + k) / mean * i0e(z) * np.exp(z - k - (1 + k) * g / mean)
+    expected = integrate_over_snr(pdf, scale, divisor, mean)
+    assert fading.rician_ber(scale, divisor, ebn0_db, k_db) == pytest.approx(expected, rel=1e-3)
+
+@pytest.mark.parametrize("scale, divisor", SCHEMES)
+@pytest.mark.parametrize("ebn0_db", MEAN_EBN0_DB)
+@pytest.mark.parametrize("sigma_db", [1.0, 4.0, 8.0])
+def test_lognormal(scale, divisor, ebn0_db, sigma_db):
+    density = lambda x: np.exp(-(x - ebn0_db) ** 2 / (2 * sigma_db ** 2)) / (sigma_db * np.sqrt(2 * np.pi))
+    expected, _ = integrate.quad(lambda x: awgn_ber(scale, divisor, 10 ** (x / 10)) * density(x),
+                                 ebn0_db - 12 * sigma_db, ebn0_db + 12 * sigma_db,
+                                 points=[ebn0_db], limit=200, epsabs=0, epsrel=1e-10)
+    assert fading.lognormal_ber(scale, divisor, ebn0_db, sigma_db) == pytest.approx(expected, rel=1e-3)
+
+def test_outages_match_monte_carlo():
+    rng = np.random.default_rng(7)
+    n, margin_db, k_db, sigma_db = 400_000, 3.0, 6.0, 4.0
+    threshold = 10 ** (-margin_db / 10)  # Required Eb/N0 relative to the mean
+    k = 10 ** (k_db / 10)
+    rayleigh = rng.exponential(1.0, n)
+    direct = np.sqrt(k / (k + 1))
+    scattered = (rng.normal(size=n) + 1j * rng.normal(size=n)) * np.sqrt(1 / (2 * (k + 1)))
+    rician = np.abs(direct + scattered) ** 2
+    lognormal = 10 ** (rng.normal(0, sigma_db, n) / 10)
+    tolerance = 4 / np.sqrt(n)
+    assert fading.rayleigh_outage(margin_db) == pytest.approx(np.mean(rayleigh < threshold), abs=tolerance)
+    assert fading.rician_outage(margin_db, k_db) == pytest.approx(np.mean(rician < threshold), abs=tolerance)
+    assert fading.lognormal_outage(margin_db, sigma_db) == pytest.approx(np.mean(lognormal < threshold), abs=tolerance)
@@ -0,0 +1,29 @@
+"""LinkBudgetCalculator.calculate_batch must agree with calculate row by row."""
+import itertools
+
+import pytest
+
+from models.link_budget import (LinkBudgetBatchParams, LinkBudgetCalculator, LinkBudgetParams,
+                                ModulationScheme, PropagationModel)
+
+def link_grid():
+    for tx_power_dbm, path_loss_db, modulation, propagation in itertools.product(
+            (20.0, 33.0), (150.0, 165.0, 180.0), ModulationScheme, PropagationModel):
+        yield LinkBudgetParams(
+            tx_power_dbm=tx_power_dbm, tx_gain_dbi=6.0, rx_gain_dbi=20.0, path_loss_db=path_loss_db,
+            atm_loss_db=1.5, sys_temp_k=500.0, bandwidth_hz=1e6, freq_ghz=2.4,
+            modulation=modulation, propagation=propagation, required_ebn0_db=9.6,
+            rician_k_db=7.0, shadowing_sigma_db=3.0)
+
+def test_link_batch_matches_calculate():
+    params = list(link_grid())
+    batch = LinkBudgetCalculator.calculate_batch(LinkBudgetBatchParams.from_params(params))
+    for i, p in enumerate(params):
+        single = LinkBudgetCalculator.calculate(p)
+        assert batch.received_power_dbm[i] == pytest.approx(single.received_power_dbm)
+        assert batch.cnr_db[i] == pytest.approx(single.cnr_db)
+        assert batch.link_margin_db[i] == pytest.approx(single.link_margin_db)
+        assert batch.ber[i] == pytest.approx(single.ber, rel=1e-9, abs=1e-300)
+        assert batch.outage_probability[i] == pytest.approx(single.outage_probability, rel=1e-9, abs=1e-300)
+        assert batch.negative_margin[i] == any("Negative" in w for w in single.warnings)
+        assert batch.low_margin[i] == any("below 3 dB" in w for w in single.warnings)
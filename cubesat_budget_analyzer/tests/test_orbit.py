@@ -0,0 +1,50 @@
+"""Pass prediction against closed-form orbit facts."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from models.orbit import (GroundStation, OrbitalElements, Pass, contact_windows, find_passes, look_angles,
+                          propagate_eci_km, propagate_ephemeris)
+
+EPOCH = datetime(2024, 3, 20, tzinfo=timezone.utc)
+
+def raan_deg(elements, seconds):
+    """Right ascension of the node from the orbit normal, r(t) x r(t + 1 s)."""
+    positions = propagate_eci_km(elements, EPOCH, np.array([seconds, seconds + 1.0]))
+    normal = np.cross(positions[0], positions[1])
+    return np.degrees(np.arctan2(normal[0], -normal[1]))
+
+def test_sun_synchronous_node_follows_the_sun():
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=97.4, epoch=EPOCH)
+    drift_deg_per_day = (raan_deg(elements, 10 * 86400) - raan_deg(elements, 0)) / 10
+    assert drift_deg_per_day == pytest.approx(360 / 365.2422, abs=0.005)
+
+def test_equatorial_orbit_passes_overhead():
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=0, epoch=EPOCH)
+    passes = find_passes(elements, [GroundStation("Equator", 0.0, 0.0, min_elevation_deg=10)], EPOCH,
+                         days=1, step_s=1.0)
+    assert passes
+    assert all(p.max_elevation_deg == pytest.approx(90, abs=0.5) for p in passes)
+
+def test_pass_edges_sit_on_the_mask():
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=97.4, epoch=EPOCH)
+    station = GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=10)
+    passes = find_passes(elements, [station], EPOCH, days=2)
+    assert passes
+    window = (EPOCH, EPOCH + timedelta(days=2))
+    for p in passes:
+        for edge in (p.start, p.end):
+            if edge in window:
+                continue  # A pass cut by the prediction window ends on the window edge
+            elevation = look_angles(propagate_ephemeris(elements, edge, 0.0), station).elevation_deg[0]
+            assert elevation == pytest.approx(station.min_elevation_deg, abs=0.02)
+
+def test_contact_windows_merge_overlapping_passes():
+    def at(minutes):
+        return EPOCH + timedelta(minutes=minutes)
+
+    passes = [Pass("B", at(5), at(15), 40.0, 0, 1), Pass("A", at(0), at(10), 30.0, 0, 1),
+              Pass("C", at(7), at(9), 20.0, 0, 1), Pass("A", at(20), at(25), 50.0, 0, 1),
+              Pass("B", at(25), at(30), 10.0, 0, 1)]
+    assert contact_windows(passes) == [(at(0), at(15)), (at(20), at(30))]
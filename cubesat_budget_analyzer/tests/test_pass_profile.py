@@ -0,0 +1,36 @@
+"""Per-step pass link budgets against closed-form geometry and volumes."""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from models.link_budget import LinkBudgetParams, ModulationScheme, PropagationModel
+from models.orbit import (EARTH_RADIUS_KM, SECONDS_PER_DAY, GroundStation, OrbitalElements, propagate_ephemeris,
+                          station_passes)
+from models.pass_profile import pass_profiles, slant_range_km
+
+EPOCH = datetime(2024, 3, 20, tzinfo=timezone.utc)
+
+def test_slant_range_closed_form():
+    assert slant_range_km(500.0, 90.0) == pytest.approx(500.0)
+    horizon = np.sqrt((EARTH_RADIUS_KM + 500.0) ** 2 - EARTH_RADIUS_KM ** 2)
+    assert slant_range_km(500.0, 0.0) == pytest.approx(horizon)
+    ranges = slant_range_km(500.0, np.linspace(0, 90, 19))
+    assert np.all(np.diff(ranges) < 0)
+
+def test_pass_volume_is_rate_times_usable_time():
+    elements = OrbitalElements.circular(altitude_km=500, inclination_deg=97.4, epoch=EPOCH)
+    station = GroundStation("Toulouse", 43.6, 1.44, min_elevation_deg=5)
+    ephemeris = propagate_ephemeris(elements, EPOCH, 2 * SECONDS_PER_DAY, 10.0)
+    passes = station_passes(ephemeris, station)
+    params = LinkBudgetParams(
+        tx_power_dbm=40.0, tx_gain_dbi=6.0, rx_gain_dbi=20.0, path_loss_db=0.0, atm_loss_db=1.5,
+        sys_temp_k=500.0, bandwidth_hz=1e6, freq_ghz=2.4, modulation=ModulationScheme.QPSK,
+        propagation=PropagationModel.AWGN, required_ebn0_db=9.6)
+    profiles = pass_profiles(params, ephemeris, station, passes, data_rate_mbps=9.6, margin_threshold_db=3.0)
+
+    assert 0 < profiles.usable.sum() < profiles.usable.size  # The threshold cuts the low-elevation steps
+    for k in range(len(passes)):
+        usable_time_s = profiles.usable[profiles.pass_slice(k)].sum() * ephemeris.step_s
+        assert profiles.usable_time_s[k] == pytest.approx(usable_time_s)
+        assert profiles.data_volume_gb[k] == pytest.approx(9.6e6 * usable_time_s / 8e9)
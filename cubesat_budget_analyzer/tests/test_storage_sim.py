@@ -0,0 +1,72 @@
+"""The clamp-shift scan of simulate_storage must follow the plain step-by-step recurrence, and
+simulate_data_budget must downlink the volume DataBudgetCalculator counts."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from models.data_budget import DataBudgetParams
+from models.orbit import Pass, data_budget_params_from_passes
+from models.storage_sim import simulate_data_budget, simulate_storage
+
+EPOCH = datetime(2024, 3, 20, tzinfo=timezone.utc)
+
+def reference_fill(generated_mbps, downlink_mbps, step_s, capacity_gb, initial_fill_gb):
+    """fill[t] = min(max(fill[t-1] + generated[t] - downlink[t], 0), capacity), with dropped and unused data."""
+    gb_per_mbps_step = 1e6 * step_s / 8e9
+    level, dropped, unused = initial_fill_gb, 0.0, 0.0
+    fill = []
+    for generated, downlink in zip(generated_mbps, downlink_mbps):
+        unclipped = level + (generated - downlink) * gb_per_mbps_step
+        dropped += max(unclipped - capacity_gb, 0.0)
+        unused += max(-unclipped, 0.0)
+        level = min(max(unclipped, 0.0), capacity_gb)
+        fill.append(level)
+    return np.array(fill), dropped, unused
+
+@pytest.mark.parametrize("block_steps", [1, 7, 64, 1 << 16])
+def test_scan_matches_loop(block_steps):
+    rng = np.random.default_rng(1)
+    steps = 3000
+    generated = rng.uniform(0, 4, steps) * (rng.random(steps) < 0.6)
+    downlink = rng.uniform(0, 12, steps) * (rng.random(steps) < 0.3)
+    fill, dropped, unused = reference_fill(generated, downlink, 10.0, 0.02, 0.01)
+
+    results = simulate_storage(generated, downlink, 10.0, capacity_gb=0.02, initial_fill_gb=0.01,
+                               block_steps=block_steps)
+    np.testing.assert_allclose(results.fill_gb, fill, rtol=1e-9, atol=1e-12)
+    assert results.total_dropped_gb == pytest.approx(dropped, rel=1e-9)
+    assert results.unused_downlink_gb == pytest.approx(unused, rel=1e-9)
+    assert results.final_fill_gb == pytest.approx(fill[-1], abs=1e-12)
+    assert results.max_fill_gb == pytest.approx(max(fill.max(), 0.01))
+    assert 0 < results.total_dropped_gb and 0 < results.unused_downlink_gb  # Both clamps were exercised
+
+def test_recording_and_first_full():
+    generated = np.full(100, 8.0)  # 1 MB per 1 s step
+    results = simulate_storage(generated, 0.0, 1.0, capacity_gb=0.0105, record_every=10)
+    assert results.fill_gb.size == 10
+    assert results.first_full_s == 11.0
+    assert results.total_dropped_gb == pytest.approx(0.1 - 0.0105)
+
+def test_daily_downlink_volume_is_spread_over_the_passes():
+    params = DataBudgetParams(1.0, 32.0, 0.0, 10.0, 4, daily_downlink_gb=20.0)
+    results = simulate_data_budget(params, 2, step_s=10.0)
+    assert results.total_downlinked_gb + results.unused_downlink_gb == pytest.approx(40.0)
+    assert results.total_downlinked_gb == pytest.approx(results.total_generated_gb - results.final_fill_gb)
+
+def test_params_from_passes_keep_their_daily_volume():
+    def at(minutes):
+        return EPOCH + timedelta(minutes=minutes)
+
+    # Two stations with overlapping passes; 7 contact windows in 2 days do not round to a whole number a day
+    passes = [Pass(station, at(day * 1440 + k * 480 + shift), at(day * 1440 + k * 480 + shift + 8), 45.0, 0, 1)
+              for day in range(2) for k in range(3) for station, shift in (("A", 0), ("B", 4))]
+    passes.append(Pass("A", at(1300), at(1305), 20.0, 0, 1))
+    params = data_budget_params_from_passes(passes, 2, data_rate_mbps=1.0, storage_capacity_gb=32.0,
+                                            downlink_rate_mbps=10.0)
+    results = simulate_data_budget(params, 2, step_s=10.0)
+    assert results.total_downlinked_gb + results.unused_downlink_gb == pytest.approx(2 * params.daily_downlink_gb)
+
+def test_daily_downlink_volume_without_pass_time_is_rejected():
+    with pytest.raises(ValueError):
+        simulate_data_budget(DataBudgetParams(1.0, 32.0, 0.0, 0.0, 0, daily_downlink_gb=20.0), 1, step_s=10.0)